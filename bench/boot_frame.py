@@ -0,0 +1,89 @@
+"""
+Time from process start to first pixels, with and without the saved boot frame.
+
+Saves a dashboard frame the way hwmonitor does (dimmed, labelled), then starts
+fresh interpreters on a FakeDisplay:
+- fast path: lcd.fastboot streams the saved file, nothing else imported,
+- full path: the imports of hwmonitor (PIL, psutil, influxdb, ...) and the
+  first composed dashboard frame.
+Both report the process age at the moment the frame was sent, including the
+simulated 40 MHz SPI transfer. A preview of the saved frame goes to the given
+directory.
+
+Usage (from the repository root):
+    python -m bench.boot_frame [screenshot dir]
+"""
+
+import os
+import sys
+import tempfile
+import subprocess
+from PIL import Image
+from bench.fakes import FakeDisplay
+from bench.jitter import SNAPSHOT
+from lcd import fastboot
+from ui.dashboard import DashboardRenderer
+from ui.framebuffer import unpack_rgb565
+from ui.native import Rgb565Frames
+
+RUNS = 5
+
+FAST = '''
+import sys
+from bench.fakes import FakeDisplay
+from lcd import fastboot
+fastboot.show_saved_frame(sys.argv[1], display=FakeDisplay)
+print(fastboot.first_pixels, len(sys.modules))
+'''
+
+FULL = '''
+import sys
+import psutil, socket, logging, json, signal
+from PIL import Image
+from lcd import fastboot
+from bench.fakes import FakeDisplay
+from db.InfluxDBConnection import InfluxDBConnectionHandler
+from ui.dashboard import DashboardRenderer
+from ui.native import Rgb565Frames
+from bench.jitter import SNAPSHOT
+disp = FakeDisplay()
+disp.Init()
+frames = Rgb565Frames()
+DashboardRenderer().compose(frames, Image.open('./img/lcdbg.png').convert("RGBA"), SNAPSHOT, 0, True)
+disp.ShowBuffer(frames.convert())
+print(fastboot.process_age(), len(sys.modules))
+'''
+
+
+def measure(code, *args):
+    results = []
+    for _ in range(RUNS):
+        out = subprocess.run([sys.executable, '-c', code, *args], capture_output=True, text=True, check=True).stdout
+        age, modules = out.split()
+        results.append((float(age), int(modules)))
+    return min(age for age, _ in results), results[0][1]
+
+
+def main():
+    out = sys.argv[1] if len(sys.argv) > 1 else None
+    frames = Rgb565Frames()
+    DashboardRenderer().compose(frames, Image.open('./img/lcdbg.png').convert("RGBA"), SNAPSHOT, 0, True)
+    frames.convert()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'frame.rgb565')
+        fastboot.save_frame(frames.rgb565, path)
+        print(f"saved frame: {os.path.getsize(path)} B")
+        if out:
+            loaded = fastboot.load_frame(path, FakeDisplay.width, FakeDisplay.height)
+            unpack_rgb565(loaded).save(f'{out}/boot_frame.png')
+
+        fast, fast_modules = measure(FAST, path)
+        full, full_modules = measure(FULL)
+    print(f"fast path: first pixels {fast * 1000:6.0f} ms after start, {fast_modules} modules loaded")
+    print(f"full path: first pixels {full * 1000:6.0f} ms after start, {full_modules} modules loaded")
+    print(f"(best of {RUNS} runs, the process age has the resolution of one clock tick)")
+
+
+if __name__ == '__main__':
+    main()
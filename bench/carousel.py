@@ -0,0 +1,136 @@
+"""
+Page carousel: transition frame cost and rate, fade accuracy, paused inactive pages.
+
+- Times slide and fade frames between two real pages (RGB565 words only) and
+  checks the fade against a per-channel float blend.
+- Runs transitions on a FakeDisplay (40 MHz SPI timing) the way the render
+  loop does and reports the achieved frame rate, which must reach 30 FPS.
+- Runs a carousel of dashboard, processes and load pages with a short page
+  time and counts the scans and samples of each source per page slot: a
+  source only works while its page is on screen or next in line.
+
+Usage (from the repository root):
+    python -m bench.carousel [screenshot dir]
+"""
+
+import sys
+import time
+import numpy as np
+from PIL import Image
+from bench.fakes import FakeDisplay
+from bench.jitter import SNAPSHOT
+from monitor.load import LoadSampler
+from monitor.processes import ProcessTable
+from ui.carousel import Carousel, Transition, StillFrame, FADE_STEPS
+from ui.dashboard import DashboardRenderer
+from ui.framebuffer import unpack_rgb565
+from ui.load import LoadPage
+from ui.native import Rgb565Frames
+from ui.processes import ProcessesPage
+
+TRANSITION_FPS = 30
+
+
+def channels(rgb565):
+    word = rgb565.astype(np.int32)
+    return np.stack([word >> 11, (word >> 5) & 0x3F, word & 0x1F])
+
+
+def frame_cost(transition, source, target, kind):
+    out = np.zeros_like(source)
+    transition.begin(source, target, kind, 1.0, 0.0)
+    start = time.perf_counter()
+    steps = 200
+    for i in range(steps):
+        transition.frame(i / steps * 0.99, out)
+    return (time.perf_counter() - start) / steps * 1000
+
+
+def run_transitions(source, target, kind, count):
+    disp = FakeDisplay()
+    transition = Transition()
+    output = StillFrame()
+    shown = 0
+    start = time.perf_counter()
+    for _ in range(count):
+        transition.begin(source, target, kind, 0.5, time.monotonic())
+        while transition.active:
+            loop_start = time.perf_counter()
+            transition.frame(time.monotonic(), output.rgb565)
+            disp.ShowBuffer(output.convert())
+            shown += 1
+            time.sleep(max(0, 1 / TRANSITION_FPS - (time.perf_counter() - loop_start)))
+    return shown / (time.perf_counter() - start)
+
+
+def main():
+    directory = sys.argv[1] if len(sys.argv) > 1 else None
+    frames = Rgb565Frames()
+    DashboardRenderer().compose(frames, Image.open('./img/lcdbg.png').convert("RGBA"), SNAPSHOT, 0, True)
+    dashboard = frames.convert().copy()
+
+    table = ProcessTable(interval=0.5)
+    sampler = LoadSampler(interval=0.5)
+    table.scan()
+    pages = {'processes': ProcessesPage(table), 'load': LoadPage(sampler)}
+    carousel = Carousel(pages, ['dashboard', 'processes', 'load'], 4, prepare=1.5)
+    carousel.prepare_page('processes')
+    processes_frame = carousel.frame('processes')[1]
+
+    transition = Transition()
+    failed = False
+    for kind in ('slide', 'fade'):
+        print(f"{kind:<5} transition frame {frame_cost(transition, dashboard, processes_frame, kind):.2f} ms")
+
+    # Fade accuracy: every channel within one step of the exact blend
+    out = np.zeros_like(dashboard)
+    worst = 0
+    for weight in range(FADE_STEPS + 1):
+        transition.begin(dashboard, processes_frame, 'fade', 1.0, 0.0)
+        transition.fade(weight, out)
+        exact = (channels(dashboard) * (FADE_STEPS - weight) + channels(processes_frame) * weight) / FADE_STEPS
+        worst = max(worst, np.abs(channels(out) - exact).max())
+    print(f"fade: max channel error {worst:.2f} steps")
+    failed |= worst > 1
+
+    for kind in ('slide', 'fade'):
+        fps = run_transitions(dashboard, processes_frame, kind, 4)
+        print(f"{kind:<5} transitions on the panel: {fps:.1f} FPS")
+        failed |= fps < TRANSITION_FPS * 0.95
+
+    if directory:
+        transition.begin(dashboard, processes_frame, 'slide', 1.0, 0.0)
+        mid = np.zeros_like(dashboard)
+        transition.slide(120, mid)
+        unpack_rgb565(mid).save(f'{directory}/carousel_slide.png')
+        transition.begin(dashboard, processes_frame, 'fade', 1.0, 0.0)
+        transition.fade(FADE_STEPS // 2, mid)
+        unpack_rgb565(mid).save(f'{directory}/carousel_fade.png')
+
+    # Sources follow the schedule: align to a slot boundary, then count the work per slot.
+    # A source may work while its page is shown or next, it may finish one round after that.
+    table.start()
+    sampler.start()
+    carousel.start()
+    time.sleep(carousel.seconds - time.monotonic() % carousel.seconds + 0.3)
+    for _ in range(len(carousel.order)):
+        page = carousel.scheduled(time.monotonic())
+        scans, samples, renders = table.scans, sampler.sample.version if sampler.sample else 0, carousel.renders
+        time.sleep(carousel.seconds - 0.3)
+        scans = table.scans - scans
+        samples = (sampler.sample.version if sampler.sample else 0) - samples
+        print(f"slot {page:<10} processes scans {scans:2d}  load samples {samples:2d}  "
+              f"page renders {carousel.renders - renders}")
+        failed |= page == 'dashboard' and samples > 1
+        failed |= page == 'load' and scans > 1
+        time.sleep(0.3)
+    carousel.stop()
+    table.stop()
+    sampler.stop()
+    print("FAIL" if failed else "OK")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+"""
+A hung collector against the 10 FPS render loop: sampling inline vs. in the collector pool.
+
+The disk collector hangs for HANG seconds once, the way psutil.disk_usage()
+blocks on a dead /mnt/storage mount. The dashboard is composed at 10 FPS:
+- inline, the loop samples itself like the old *_frequency_tasks(),
+- pooled, a CollectorPool samples and the loop only reads the values.
+The time of every frame (sampling and composing) is measured, after one
+untimed frame that builds the renderer's glyph and layer caches. Fails if a
+pooled frame takes longer than the frame budget of 1 / FPS, the CPU reading
+gets older than 2 s meanwhile or the hang is not counted as one timeout.
+
+Usage (from the repository root):
+    python -m bench.collectors [SECONDS]
+"""
+
+import sys
+import time
+import numpy as np
+import psutil
+from PIL import Image
+from bench.jitter import SNAPSHOT
+from monitor.collectors import Collector, CollectorPool
+from ui.dashboard import DashboardRenderer
+from ui.native import Rgb565Frames
+
+FPS = 10
+HANG = 3  # Seconds the disk collector blocks
+MAX_FRAME_MS = 1000 / FPS
+MAX_CPU_AGE = 2
+
+
+class HangingDisk:
+    """disk_usage() that blocks once, `hang_at` seconds after start"""
+
+    def __init__(self, hang_at):
+        self.hang_at = time.monotonic() + hang_at
+        self.hung = False
+
+    def __call__(self):
+        if not self.hung and time.monotonic() >= self.hang_at:
+            self.hung = True
+            time.sleep(HANG)
+        return psutil.disk_usage('/')
+
+
+def make_collectors(seconds):
+    return [Collector('cpu_percent', psutil.cpu_percent, interval=1, timeout=1),
+            Collector('memory', psutil.virtual_memory, interval=1, timeout=1),
+            Collector('disk', HangingDisk(seconds / 3), interval=1, timeout=1)]
+
+
+def render(seconds, values, sample=None):
+    """Frame times in ms; `sample` is called every second in the loop, like the old tasks"""
+    frames = Rgb565Frames()
+    renderer = DashboardRenderer()
+    background = Image.open('./img/lcdbg.png').convert("RGBA")
+    times = []
+    cpu_ages = []
+    # The first frame fills the caches, it is not what a running loop pays
+    renderer.compose(frames, background, SNAPSHOT, 0, True)
+    frames.convert()
+    tick = 0
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        loop_start = time.perf_counter()
+        refresh = tick % FPS == 0
+        if refresh and sample is not None:
+            sample()
+        cpu, memory, disk, cpu_age = values()
+        cpu_ages.append(cpu_age)
+        snap = SNAPSHOT._replace(cpu_percent=cpu, mem_percent=memory.percent if memory else 0,
+                                 disk_percent=disk.percent if disk else 0)
+        renderer.compose(frames, background, snap, tick, refresh)
+        frames.convert()
+        times.append((time.perf_counter() - loop_start) * 1000)
+        tick += 1
+        time.sleep(max(0, 1 / FPS - (time.perf_counter() - loop_start)))
+    return np.array(times), max(cpu_ages)
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 12
+
+    inline = {collector.name: collector for collector in make_collectors(seconds)}
+    latest = {}
+    sampled = {}
+
+    def sample_inline():
+        for name, collector in inline.items():
+            latest[name] = collector.collect()
+        sampled['time'] = time.monotonic()
+
+    def sampled_inline():
+        return (latest.get('cpu_percent', 0), latest.get('memory'), latest.get('disk'),
+                time.monotonic() - sampled.get('time', time.monotonic()))
+    inline_times, _ = render(seconds, sampled_inline, sample_inline)
+
+    pool = CollectorPool(make_collectors(seconds), workers=3, log_every=0)
+    pool.start()
+    pool.wait(1)
+
+    def pooled():
+        cpu = pool.collectors['cpu_percent'].reading
+        return (pool.value('cpu_percent', 0), pool.value('memory'), pool.value('disk'),
+                time.monotonic() - cpu.time)
+    pooled_times, cpu_age = render(seconds, pooled)
+    pool.stop()
+
+    for name, times in (('inline', inline_times), ('pooled', pooled_times)):
+        print(f"{name}: {len(times)} frames, p50 {np.percentile(times, 50):6.2f} ms, "
+              f"p99 {np.percentile(times, 99):7.2f} ms, max {times.max():7.1f} ms")
+    print(f"pooled: oldest CPU reading {cpu_age:.2f} s")
+    for name, collector in pool.collectors.items():
+        s = collector.stats()
+        print(f"  {name:<12} {s['runs']:3d} runs, mean {s['mean']:7.2f} ms, worst {s['worst']:7.1f} ms, "
+              f"{s['timeouts']} timeouts, {s['failures']} failures")
+
+    if pooled_times.max() > MAX_FRAME_MS or cpu_age > MAX_CPU_AGE or pool.collectors['disk'].timeouts != 1:
+        print("FAIL")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+Two panels: frame rate per panel with serial transfers and with a transmitter thread per panel.
+
+A render loop composes the dashboard as fast as it can and sends every frame
+to two FakeDisplays (40 MHz SPI timing). Serially the loop waits for both
+transfers one after the other; with lcd.panels.ThreadedDisplay the transfers
+run in one thread per panel, overlap each other and the composition of the
+next frame. The threaded frame rate of every panel must be at least 1.5 times
+the serial one.
+
+Usage (from the repository root):
+    python -m bench.dual_panel [SECONDS]
+"""
+
+import sys
+import time
+from PIL import Image
+from bench.fakes import FakeDisplay
+from bench.jitter import SNAPSHOT
+from lcd.panels import ThreadedDisplay
+from ui.dashboard import DashboardRenderer
+from ui.native import Rgb565Frames
+
+
+def run(displays, seconds):
+    """Returns: (loop frames per second, frames each display received per second)"""
+    renderer = DashboardRenderer()
+    frames = Rgb565Frames()
+    background = Image.open('./img/lcdbg.png').convert("RGBA")
+    tick = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        renderer.compose(frames, background, SNAPSHOT, tick, tick % 10 == 0)
+        for disp in displays:
+            disp.ShowBuffer(frames.convert())
+        tick += 1
+    for disp in displays:
+        if isinstance(disp, ThreadedDisplay):
+            disp.stop()
+    elapsed = time.perf_counter() - start
+    received = [(disp.disp if isinstance(disp, ThreadedDisplay) else disp).frames / elapsed for disp in displays]
+    return tick / elapsed, received
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+    serial_loop, serial = run([FakeDisplay(), FakeDisplay()], seconds)
+    print(f"serial:   loop {serial_loop:5.1f} FPS, panels " + ", ".join(f"{fps:5.1f}" for fps in serial) + " FPS")
+
+    threaded = [ThreadedDisplay(FakeDisplay(), f'Panel {index}', log_every=0) for index in range(2)]
+    for disp in threaded:
+        disp.start()
+    threaded_loop, received = run(threaded, seconds)
+    print(f"threaded: loop {threaded_loop:5.1f} FPS, panels " + ", ".join(f"{fps:5.1f}" for fps in received) + " FPS")
+    for disp in threaded:
+        s = disp.stats.summary()
+        print(f"  {disp.name}: {disp.sent} sent, {disp.replaced} replaced by a newer frame, "
+              f"interval p50 {s['p50']:.1f} ms, p99 {s['p99']:.1f} ms")
+
+    if min(received) < 1.5 * max(serial):
+        print("FAIL")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == '__main__':
+    main()
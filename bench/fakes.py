@@ -0,0 +1,51 @@
+"""
+Stand-ins for the hardware used by the benchmark scripts.
+"""
+
+import time
+
+SPI_HZ = 40000000
+
+
+class FakeDisplay:
+    """
+    Accepts the same calls as lcd.LCD_1inch69.LCD_1inch69 without GPIO or SPI.
+
+    Transfers sleep for the time the bytes would take on a 40 MHz SPI bus,
+    like spidev they release the GIL while "transmitting".
+    """
+
+    width = 240
+    height = 280
+
+    def __init__(self, *args, **kwargs):
+        self.frames = 0
+        self.bytes_sent = 0
+        self.duty = 0
+
+    def _transfer(self, size):
+        self.bytes_sent += size
+        time.sleep(size * 8 / SPI_HZ)
+
+    def Init(self):
+        pass
+
+    def clear(self):
+        self._transfer(self.width * self.height * 2)
+
+    def bl_DutyCycle(self, duty):
+        self.duty = duty
+
+    def ShowImage(self, image):
+        self.frames += 1
+        self._transfer(image.size[0] * image.size[1] * 2)
+
+    def ShowBuffer(self, buf, Ystart=0, Yend=None):
+        if Yend is None:
+            Yend = self.height
+        self.frames += 1
+        self._transfer((Yend - Ystart) * self.width * 2)
+
+    def __getattr__(self, name):
+        # Panel commands (SleepIn, IdleMode, DisplayOn, ...) are no-ops
+        return lambda *args, **kwargs: None
@@ -0,0 +1,69 @@
+"""
+Allocation check for the steady state dashboard frame.
+
+Runs the per-frame path of the dashboard loop (static layer refresh every 10th
+frame, animation, RGB565 conversion) on the frame buffers of both renderers,
+Rgb565Frames ('native', the default) and FramePool ('pil'), and measures the
+net memory allocated per frame with tracemalloc. No display or SPI is needed.
+
+Usage (from the repository root):
+    python -m bench.frame_alloc [frames]
+"""
+
+import sys
+import tracemalloc
+from PIL import Image
+from ui.dashboard import draw_dashboard_animation
+from ui.framebuffer import FramePool
+from ui.native import Rgb565Frames
+
+# Net bytes per frame that still count as "no allocation" (interpreter noise)
+MAX_BYTES_PER_FRAME = 64
+
+
+def run_frames(pool, background, start, count):
+    for tick in range(start, start + count):
+        if tick % 10 == 0:
+            pool.begin_static(background)
+        draw = pool.begin_frame()
+        draw_dashboard_animation(draw, tick)
+        pool.convert()
+
+
+def measure(name, pool, background, frames):
+    """Whether the net allocation per frame of `pool` stays within MAX_BYTES_PER_FRAME"""
+    # Warm up caches (ImageDraw, numpy ufunc loops) before measuring
+    run_frames(pool, background, 0, 100)
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    run_frames(pool, background, 100, frames)
+    after = tracemalloc.take_snapshot()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    stats = after.compare_to(before, 'lineno')
+    net = sum(stat.size_diff for stat in stats)
+    per_frame = net / frames
+    print(f"{name}: {frames} frames, net allocated: {net} B, per frame: {per_frame:.1f} B, peak traced: {peak} B")
+    for stat in stats[:5]:
+        print(f"  {stat}")
+    if per_frame > MAX_BYTES_PER_FRAME:
+        print(f"  more than {MAX_BYTES_PER_FRAME} B per frame")
+        return False
+    return True
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    background = Image.open('./img/lcdbg.png').convert("RGBA")
+    results = [measure(name, pool, background, frames)
+               for name, pool in (('Rgb565Frames', Rgb565Frames()), ('FramePool', FramePool()))]
+    if not all(results):
+        print("FAIL")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+CPU used by the dashboard at each governor fidelity level.
+
+Runs the render loop logic of each level (frame rate, animation on/off) for a
+few seconds on a FakeDisplay and reports the process CPU time as % of one
+core, the figure the governor compares with GOVERNOR_CPU_BUDGET. Then feeds a
+synthetic hot / busy / recovering sequence through a Governor and prints its
+decisions and counters.
+
+Usage (from the repository root):
+    python -m bench.governor_levels [seconds per level]
+"""
+
+import sys
+import time
+import logging
+from PIL import Image
+from bench.fakes import FakeDisplay
+from bench.jitter import SNAPSHOT
+from monitor.governor import Governor, LEVELS
+from ui.dashboard import DashboardRenderer
+from ui.native import Rgb565Frames
+
+
+def run_level(seconds, fps, animate):
+    disp = FakeDisplay()
+    frames = Rgb565Frames()
+    renderer = DashboardRenderer()
+    background = Image.open('./img/lcdbg.png').convert("RGBA")
+    interval = 1 / fps
+    next_refresh = 0
+    tick = 0
+    cpu_start, wall_start = time.process_time(), time.monotonic()
+    while time.monotonic() - wall_start < seconds:
+        loop_start = time.monotonic()
+        refresh = loop_start >= next_refresh
+        if refresh:
+            next_refresh = loop_start + 1
+        if refresh or animate:
+            renderer.compose(frames, background, SNAPSHOT, tick, refresh)
+            disp.ShowBuffer(frames.convert())
+        tick += 1
+        time.sleep(max(0, interval - (time.monotonic() - loop_start)))
+    return (time.process_time() - cpu_start) / (time.monotonic() - wall_start) * 100, disp.frames
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+    for name, fps, animate, scale in LEVELS:
+        cpu, sent = run_level(seconds, fps, animate)
+        print(f"{name:<8} {fps:2d} FPS  animation {'on ' if animate else 'off'}  sampling x{scale}  "
+              f"own CPU {cpu:5.1f}% of one core  frames sent {sent}")
+
+    logging.basicConfig(format='%(message)s', level=logging.INFO)
+    governor = Governor(throttled_path='/nonexistent', recover_after=5, settle=3)
+    t = time.monotonic()
+    timeline = [(30, 55)] * 5 + [(97, 70)] * 5 + [(40, 78)] * 5 + [(40, 83)] * 5 + [(20, 55)] * 20
+    for cpu_percent, cpu_temp in timeline:
+        t += 1
+        governor.update(cpu_percent, cpu_temp, now=t)
+    governor.log()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+"""
+History pages against a fake InfluxDB: points on the wire, queries per render, TTL alignment.
+
+The fake server answers the GROUP BY time() statements with one point per
+requested bucket. The check prepares the 1 h and 24 h pages of a carousel
+many times, the way its page thread does, and verifies that
+- no series ever carries more points than the display is wide,
+- rendering pages issues no queries (only cache expiry does),
+- cache expiry falls on bucket boundaries.
+A screenshot of both pages is saved to the given directory.
+
+Usage (from the repository root):
+    python -m bench.history_cache [screenshot dir]
+"""
+
+import re
+import sys
+import json
+import math
+import time
+import threading
+from urllib.parse import urlparse, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from db.history import HistoryCache, WIDTH, WINDOWS
+from db.InfluxDBConnection import InfluxDBConnectionHandler
+from ui.carousel import Carousel
+from ui.framebuffer import unpack_rgb565
+from ui.history import HistoryPage
+
+PORT = 18087
+STATEMENT = re.compile(r'SELECT (\w+)\("(\w+)"\) FROM "([^"]+)".*time >= (\d+)s AND time < (\d+)s GROUP BY time\((\d+)s\)')
+
+
+def synthetic(measurement, t):
+    if 'block' in measurement:
+        return 20000000 + t / 12
+    if 'peers' in measurement:
+        return 40 + 10 * math.sin(t / 3000)
+    return 100 if (t // 600) % 7 else 60
+
+
+class FakeInflux(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    points_max = 0
+    queries = 0
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.startswith('/ping'):
+            self.send_response(204)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        results = []
+        for i, statement in enumerate(parse_qs(urlparse(self.path).query)['q'][0].split(';')):
+            match = STATEMENT.search(statement)
+            if match is None:
+                # The status handler's LIMIT 1 queries
+                results.append({'statement_id': i})
+                continue
+            aggregate, field, measurement = match.group(1), match.group(2), match.group(3)
+            start, end, bucket = int(match.group(4)), int(match.group(5)), int(match.group(6))
+            # Leave a gap to show broken lines
+            values = [[t, synthetic(measurement, t)] for t in range(start, end, bucket) if not 40 <= (t - start) // bucket < 48]
+            FakeInflux.queries += i == 0
+            FakeInflux.points_max = max(FakeInflux.points_max, len(values))
+            results.append({'statement_id': i, 'series': [{'name': measurement, 'columns': ['time', aggregate],
+                                                           'values': values}]})
+        body = json.dumps({'results': results}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def main():
+    out = sys.argv[1] if len(sys.argv) > 1 else None
+    server = ThreadingHTTPServer(('127.0.0.1', PORT), FakeInflux)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    handler = InfluxDBConnectionHandler('127.0.0.1', PORT, 'geth', 'geth', 'ethonrpi', 1, 1, 1)
+    handler.start()
+    while handler.get_client() is None:
+        time.sleep(0.05)
+    cache = HistoryCache(handler, 'eop-1')
+    cache.start()
+    while any(cache.get(window) is None for window in WINDOWS):
+        time.sleep(0.05)
+
+    pages = {f'history_{window}': HistoryPage(cache, window) for window in WINDOWS}
+    carousel = Carousel(pages, list(pages), 10)
+    queries_before = FakeInflux.queries
+    start = time.perf_counter()
+    for _ in range(2000):
+        for name in pages:
+            carousel.prepare_page(name)
+    elapsed = (time.perf_counter() - start) * 1000
+    renders = carousel.renders
+    queries_during = FakeInflux.queries - queries_before
+
+    print(f"points per series (max): {FakeInflux.points_max} (display width {WIDTH})")
+    print(f"4000 page prepares: {renders} renders, {queries_during} queries, {elapsed / 4000:.3f} ms per prepare")
+    aligned = True
+    for window in WINDOWS:
+        data = cache.get(window)
+        expires = cache.expires[window]
+        aligned &= (expires - cache.grace) % data.bucket == 0
+        print(f"{window:>4}: bucket {data.bucket} s, expires in {expires - time.time():.0f} s, "
+              f"aligned {(expires - cache.grace) % data.bucket == 0}")
+
+    if out:
+        for name in pages:
+            unpack_rgb565(carousel.frame(name)[1]).save(f'{out}/{name}.png')
+
+    cache.stop()
+    handler.stop(1)
+    server.shutdown()
+    # Cache expiry can fall into the loop, allow one refresh per window
+    if FakeInflux.points_max > WIDTH or queries_during > len(WINDOWS) or not aligned:
+        print("FAIL")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == '__main__':
+    main()
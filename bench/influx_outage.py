@@ -0,0 +1,135 @@
+"""
+InfluxDBConnectionHandler against a local fake InfluxDB that goes down and comes back.
+
+Timeline (accelerated intervals): up, down long enough to open the circuit,
+up again. Checks that
+- the handler never starts more than its one supervisor thread,
+- statuses keep their last known good values during the outage (no zeroing),
+- the state walks connected -> backoff -> degraded -> connected,
+- requests reuse keep-alive connections (few TCP connections per request).
+
+Usage (from the repository root):
+    python -m bench.influx_outage
+"""
+
+import sys
+import json
+import time
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from db.InfluxDBConnection import InfluxDBConnectionHandler, CONNECTED, BACKOFF, DEGRADED
+
+PORT = 18086
+VALUES = {'status_exec': 90, 'status_node': 100, 'status_consensus': 35}
+
+
+class FakeInflux(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive
+    requests = 0
+    connections = 0
+    online = True
+
+    def setup(self):
+        super().setup()
+        FakeInflux.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if not FakeInflux.online:
+            # Kept-alive connections from before the outage are dropped without an answer
+            self.close_connection = True
+            return
+        FakeInflux.requests += 1
+        if self.path.startswith('/ping'):
+            self.send_response(204)
+            self.send_header('X-Influxdb-Version', '1.8.10')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        results = [{'statement_id': i, 'series': [{'name': name, 'columns': ['time', 'active_percent'],
+                                                   'values': [['2024-07-16T00:00:00Z', value]]}]}
+                   for i, (name, value) in enumerate(VALUES.items())]
+        body = json.dumps({'results': results}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_POST = do_GET
+
+
+class Server:
+    def __init__(self):
+        self.httpd = None
+
+    def up(self):
+        FakeInflux.online = True
+        ThreadingHTTPServer.allow_reuse_address = True
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', PORT), FakeInflux)
+        self.httpd.daemon_threads = True
+        threading.Thread(target=self.httpd.serve_forever, name='fake-influx', daemon=True).start()
+
+    def down(self):
+        FakeInflux.online = False
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def handler_threads():
+    return [t for t in threading.enumerate() if t.name == 'influxdb' or t.name.startswith('Thread-')
+            and 'process_request' not in t.name]
+
+
+def main():
+    server = Server()
+    server.up()
+    handler = InfluxDBConnectionHandler('127.0.0.1', PORT, 'geth', 'geth', 'ethonrpi', timeout=0.5,
+                                        retry_interval=0.1, fetch_interval=0.2, failure_threshold=4,
+                                        degraded_interval=1)
+    handler.start()
+
+    states = []
+    max_threads = 0
+    zeroed = False
+
+    def watch(seconds):
+        nonlocal max_threads, zeroed
+        end = time.monotonic() + seconds
+        while time.monotonic() < end:
+            if not states or states[-1] != handler.state:
+                states.append(handler.state)
+            max_threads = max(max_threads, len(handler_threads()))
+            statuses = (handler.get_exec_status()[0], handler.get_node_status()[0], handler.get_cons_status()[0])
+            if handler.updated is not None and statuses != (90, 100, 35):
+                zeroed = True
+            time.sleep(0.01)
+
+    watch(2)
+    requests_up = FakeInflux.requests
+    server.down()
+    watch(4)
+    age_in_outage = handler.get_age()
+    server.up()
+    watch(3)
+    handler.stop(2)
+    server.down()
+
+    print(f"states: {' -> '.join(states)}")
+    print(f"handler threads (max): {max_threads}")
+    print(f"statuses kept during outage: {not zeroed}, data age at the end of the outage {age_in_outage:.1f} s")
+    print(f"requests: {FakeInflux.requests} ({requests_up} while first up) over {FakeInflux.connections} connections")
+
+    expected = [CONNECTED, BACKOFF, DEGRADED, CONNECTED]
+    ok = states[-len(expected):] == expected and max_threads == 1 and not zeroed \
+        and FakeInflux.connections < FakeInflux.requests
+    if not ok:
+        print("FAIL")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+Adaptive status polling against fixed 30 s polling: query volume and time to display.
+
+A fake InfluxDB plays a 12 hour day (1000x faster): the consensus client
+syncs for an hour with its status moving every few minutes, then everything
+is synced, and at 6 h the execution client restarts (waiting for a minute,
+syncing for ten). The handler runs once with the old fixed interval, read by
+the dashboard every 30 s, and once adaptive, read every second. Each status
+change is timed until the dashboard has it. Adaptive polling must send fewer
+queries, deliver changes sooner on average and none later than its longest
+interval plus a read.
+
+Usage (from the repository root):
+    python -m bench.influx_polling
+"""
+
+import sys
+import time
+import numpy as np
+from bench.influx_outage import FakeInflux, Server, VALUES, PORT
+from db.InfluxDBConnection import InfluxDBConnectionHandler
+
+SCALE = 0.001  # Real seconds per simulated second
+HOURS = 12
+SLACK = 5  # Simulated seconds allowed for request and scheduling latency
+
+# (simulated seconds, measurement, active_percent)
+CHANGES = [(t, 'status_consensus', value) for t, value in
+           zip(range(0, 3600, 300), (40, 50, 55, 62, 70, 74, 60, 68, 72, 75, 76, 100))] + [
+    (6 * 3600, 'status_exec', 35),
+    (6 * 3600 + 60, 'status_exec', 60),
+    (6 * 3600 + 660, 'status_exec', 100),
+]
+NAMES = {'status_exec': 'exec', 'status_node': 'node', 'status_consensus': 'cons'}
+
+
+def run(fetch_interval, min_fetch_interval, syncing_fetch_interval, read_every):
+    VALUES.update({'status_exec': 100, 'status_node': 100, 'status_consensus': 30})
+    handler = InfluxDBConnectionHandler('127.0.0.1', PORT, 'geth', 'geth', 'ethonrpi', timeout=1,
+                                        retry_interval=0.1, fetch_interval=fetch_interval * SCALE,
+                                        min_fetch_interval=min_fetch_interval * SCALE,
+                                        syncing_fetch_interval=syncing_fetch_interval * SCALE)
+    handler.start()
+    while handler.get_cons_status()[1] is None:
+        time.sleep(0.001)
+    requests = FakeInflux.requests
+    start = time.monotonic()
+    delays = []
+    for t, measurement, value in CHANGES:
+        time.sleep(max(0, start + t * SCALE - time.monotonic()))
+        VALUES[measurement] = value
+        changed = time.monotonic()
+        status = getattr(handler, f'get_{NAMES[measurement]}_status')
+        # The dashboard only sees the value at its next read
+        read = start + (int((changed - start) / (read_every * SCALE)) + 1) * read_every * SCALE
+        while status()[0] != value:
+            time.sleep(0.0002)
+        while read < time.monotonic():
+            read += read_every * SCALE
+        delays.append((read - changed) / SCALE)
+    time.sleep(max(0, start + HOURS * 3600 * SCALE - time.monotonic()))
+    queries = FakeInflux.requests - requests
+    handler.stop(1)
+    return queries, delays
+
+
+def main():
+    # Headers and body are separate writes, without this every response waits for a delayed ACK
+    FakeInflux.disable_nagle_algorithm = True
+    server = Server()
+    server.up()
+    fixed_queries, fixed_delays = run(30, 30, 30, 30)
+    adaptive_queries, adaptive_delays = run(120, 5, 30, 1)
+    server.down()
+
+    for name, queries, delays in (('fixed 30 s', fixed_queries, fixed_delays),
+                                  ('adaptive 5-120 s', adaptive_queries, adaptive_delays)):
+        print(f"{name:<17} {queries:5d} queries in {HOURS} h ({queries / HOURS:5.1f} per hour), "
+              f"time to display mean {np.mean(delays):5.1f} s, max {np.max(delays):5.1f} s")
+    if (adaptive_queries >= fixed_queries or np.mean(adaptive_delays) >= np.mean(fixed_delays)
+            or np.max(adaptive_delays) > 120 + 1 + SLACK):
+        print("FAIL")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == '__main__':
+    main()
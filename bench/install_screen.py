@@ -0,0 +1,64 @@
+"""
+Install progress screen: cached layers against the PIL reference renderer.
+
+For every install stage with and without errors and address, renders a
+series of frames with DashboardRenderer.render_install() (PIL, the reference)
+and with compose() (InstallScreen), checks that both produce the same RGB565
+frames and compares the time per frame. The cached time includes building the
+base frame once per state.
+
+Usage (from the repository root):
+    python -m bench.install_screen
+"""
+
+import sys
+import time
+import numpy as np
+from monitor.snapshot import Snapshot
+from ui.dashboard import DashboardRenderer
+from ui.native import Rgb565Frames
+
+FRAMES = 20
+
+STATES = [(stage, errors, ip) for stage in (0, 1, 2) for errors in (0, 0b10001, 0b10110)
+          for ip in (None, '192.168.1.20')]
+
+
+def snapshot(stage, errors, ip):
+    return Snapshot(0, 0, 0, 0, 0, 0, 0, 0, 0, install_stage=stage, errors=errors, ip=ip, hostname='eop-1',
+                    status='Installing geth')
+
+
+def main():
+    reference, cached = Rgb565Frames(), Rgb565Frames()
+    mismatches = 0
+    reference_time = cached_time = 0.0
+    frames = builds = 0
+    for stage, errors, ip in STATES:
+        snap = snapshot(stage, errors, ip)
+        reference_renderer, cached_renderer = DashboardRenderer(), DashboardRenderer()
+        for i in range(FRAMES):
+            now = 1760000000 + i // 2  # 2 Hz, the clock changes every second frame
+            start = time.perf_counter()
+            reference.begin_frame(reference_renderer.render_install(snap, now))
+            reference_time += time.perf_counter() - start
+
+            start = time.perf_counter()
+            cached_renderer.compose(cached, None, snap, i, True, now=now)
+            cached_time += time.perf_counter() - start
+
+            mismatches += not np.array_equal(reference.convert(), cached.convert())
+            frames += 1
+        builds += cached_renderer.install.builds
+
+    print(f"{frames} frames in {len(STATES)} states, {mismatches} differ from the reference")
+    print(f"reference (PIL): {reference_time / frames * 1000:.2f} ms per frame")
+    print(f"cached layers:   {cached_time / frames * 1000:.2f} ms per frame, {builds} base frames built")
+    if mismatches:
+        print("FAIL")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""
+Frame interval jitter with and without the separate render process.
+
+A background thread imitates the collector side under stress (decoding large
+InfluxDB JSON responses back to back). The dashboard is rendered at 10 FPS on a
+FakeDisplay, first in the same process as the load, then in a RenderProcess
+while the load keeps running in the parent.
+
+Before that, a snapshot with a long non-ASCII hostname and status line goes
+through the shared memory block: the text must come back cut at a character
+boundary, never as replacement characters. Fails otherwise.
+
+Usage (from the repository root):
+    python -m bench.jitter [seconds]
+"""
+
+import sys
+import json
+import time
+import threading
+from PIL import Image
+from bench.fakes import FakeDisplay
+from monitor.snapshot import TEXT_SIZES, SharedSnapshot, Snapshot
+from ui.dashboard import DashboardRenderer
+from ui.framebuffer import FramePool
+from ui.framestats import FrameStats
+from ui.render_process import RenderProcess
+
+FPS = 10
+
+SNAPSHOT = Snapshot(cpu_percent=37.5, cpu_temp=61.2, mem_percent=48.0, swap_percent=3.0, disk_percent=71.0,
+                    disk_used_tb=1.42, exec=90, node=88, cons=35, install_stage=100, errors=0,
+                    ip='192.168.1.20', hostname='eop-1', status=None)
+
+# Roughly what a few InfluxDB query results with many points look like
+PAYLOAD = json.dumps({'results': [{'series': [{'name': 'status_exec', 'columns': ['time', 'active_percent'],
+                                               'values': [[f'2024-07-16T00:00:{i % 60:02d}Z', i % 100]
+                                                          for i in range(20000)]}]}]})
+
+
+def collector_load(stop):
+    while not stop.is_set():
+        json.loads(PAYLOAD)
+        time.sleep(0.001)
+
+
+def with_load(run, seconds):
+    stop = threading.Event()
+    thread = threading.Thread(target=collector_load, args=(stop,), daemon=True)
+    thread.start()
+    try:
+        return run(seconds)
+    finally:
+        stop.set()
+        thread.join()
+
+
+def run_in_process(seconds):
+    disp = FakeDisplay()
+    frames = FramePool()
+    renderer = DashboardRenderer()
+    background = Image.open('./img/lcdbg.png').convert("RGBA")
+    stats = FrameStats('In process', 1 / FPS)
+    tick = 0
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        loop_start = time.perf_counter()
+        stats.tick(loop_start)
+        renderer.compose(frames, background, SNAPSHOT, tick, tick % FPS == 0)
+        disp.ShowBuffer(frames.convert())
+        tick += 1
+        time.sleep(max(0, 1 / FPS - (time.perf_counter() - loop_start)))
+    return stats.summary()
+
+
+def run_render_process(seconds):
+    render = RenderProcess(fps=FPS, display='bench.fakes:FakeDisplay', opening=False)
+    render.start()
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        render.publish(SNAPSHOT)
+        time.sleep(1)
+    return render.stop()
+
+
+def text_fields():
+    """Whether long non-ASCII text survives the shared snapshot, cut but intact"""
+    sent = SNAPSHOT._replace(hostname='węzeł-ethereum-' * 6, status='Synchronizacja łańcucha… ' * 4)
+    shared = SharedSnapshot()
+    try:
+        shared.write(sent)
+        _, received = shared.read()
+    finally:
+        shared.close(unlink=True)
+    ok = True
+    for name in ('hostname', 'status'):
+        text = getattr(received, name)
+        size = len(text.encode('utf-8'))
+        intact = getattr(sent, name).startswith(text) and '\ufffd' not in text
+        print(f"{name}: {len(getattr(sent, name).encode('utf-8'))} bytes sent, {size} received "
+              f"(field {TEXT_SIZES[name]}), {'intact' if intact else 'CORRUPTED'}")
+        ok &= intact and TEXT_SIZES[name] - 4 < size <= TEXT_SIZES[name]
+    return ok
+
+
+def report(name, s):
+    print(f"{name:<16} {s['fps']:5.1f} FPS  p50 {s['p50']:6.1f} ms  p99 {s['p99']:6.1f} ms  "
+          f"max {s['max']:6.1f} ms  jitter {s['jitter']:5.1f} ms")
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 20
+    if not text_fields():
+        print("FAIL")
+        sys.exit(1)
+    report('in process', with_load(run_in_process, seconds))
+    report('render process', with_load(run_render_process, seconds))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""
+Render loop frame time with the HTTP mirror idle and with 10 MJPEG viewers.
+
+The dashboard is rendered at 10 FPS on a FakeDisplay and submitted to a
+FrameMirror on a local port. Viewers are threads reading /stream.mjpg, one of
+them deliberately slow to show that it skips frames instead of piling them up.
+Frames are encoded once for all viewers, so the encode count stays at or below
+the number of rendered frames.
+
+Usage (from the repository root):
+    python -m bench.mirror_viewers [seconds]
+"""
+
+import sys
+import time
+import socket
+import threading
+import numpy as np
+from PIL import Image
+from bench.fakes import FakeDisplay
+from bench.jitter import SNAPSHOT
+from ui.dashboard import DashboardRenderer
+from ui.mirror import FrameMirror
+from ui.native import Rgb565Frames
+
+FPS = 10
+PORT = 18080
+VIEWERS = 10
+
+
+def viewer(stop, received, index, delay):
+    sock = socket.create_connection(('127.0.0.1', PORT))
+    sock.sendall(b'GET /stream.mjpg HTTP/1.1\r\nHost: localhost\r\n\r\n')
+    sock.settimeout(1)
+    marker = b'--w3pframe'
+    tail = b''
+    while not stop.is_set():
+        try:
+            data = sock.recv(65536)
+        except socket.timeout:
+            continue
+        if not data:
+            break
+        received[index] += (tail + data).count(marker)
+        tail = data[-len(marker):]
+        time.sleep(delay)
+    sock.close()
+
+
+def render(seconds, mirror):
+    disp = FakeDisplay()
+    frames = Rgb565Frames()
+    renderer = DashboardRenderer()
+    background = Image.open('./img/lcdbg.png').convert("RGBA")
+    times = []
+    tick = 0
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        loop_start = time.perf_counter()
+        renderer.compose(frames, background, SNAPSHOT, tick, tick % FPS == 0)
+        disp.ShowBuffer(frames.convert())
+        mirror.submit(frames.rgb565)
+        times.append(time.perf_counter() - loop_start)
+        tick += 1
+        time.sleep(max(0, 1 / FPS - (time.perf_counter() - loop_start)))
+    return np.array(times) * 1000, tick
+
+
+def report(name, times, frames, mirror, received=None):
+    p50, p99 = np.percentile(times, (50, 99))
+    line = f"{name:<12} frame time p50 {p50:5.2f} ms  p99 {p99:5.2f} ms  max {times.max():5.2f} ms  " \
+           f"frames {frames}  encoded {mirror.encoded}"
+    if received is not None:
+        line += f"  received min/max {min(received)}/{max(received)}"
+    print(line)
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 15
+    mirror = FrameMirror(PORT, '127.0.0.1', FPS)
+    mirror.start()
+
+    times, count = render(seconds, mirror)
+    report('no viewers', times, count, mirror)
+
+    stop = threading.Event()
+    received = [0] * VIEWERS
+    threads = [threading.Thread(target=viewer, args=(stop, received, i, 1.0 if i == 0 else 0), daemon=True)
+               for i in range(VIEWERS)]
+    for thread in threads:
+        thread.start()
+    encoded_before = mirror.encoded
+    times, count = render(seconds, mirror)
+    mirror.encoded -= encoded_before
+    stop.set()
+    report(f'{VIEWERS} viewers', times, count, mirror, received)
+    mirror.stop()
+
+
+if __name__ == '__main__':
+    main()
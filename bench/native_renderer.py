@@ -0,0 +1,75 @@
+"""
+Native RGB565 renderer vs. the PIL pipeline: pixel parity and frame time.
+
+Renders the same snapshots through FramePool (PIL RGBA -> RGB565) and
+Rgb565Frames (numpy canvas) with the same DashboardRenderer layout, compares
+the RGB565 output word for word and times both paths.
+
+Usage (from the repository root):
+    python -m bench.native_renderer [frames]
+"""
+
+import sys
+import time
+import random
+import numpy as np
+from PIL import Image
+from bench.jitter import SNAPSHOT
+from ui.dashboard import DashboardRenderer
+from ui.framebuffer import FramePool
+from ui.native import Rgb565Frames
+
+# Allowed number of differing pixels per frame (the native path is exact today)
+TOLERANCE_PIXELS = 0
+
+
+def random_snapshot(rng):
+    return SNAPSHOT._replace(
+        cpu_percent=rng.uniform(0, 400), cpu_temp=rng.uniform(30, 90), mem_percent=rng.uniform(0, 100),
+        disk_percent=rng.uniform(0, 100), disk_used_tb=rng.uniform(0, 10), exec=rng.randint(-5, 110),
+        node=rng.uniform(0, 100), cons=rng.randint(0, 100), ip=rng.choice([None, '10.0.0.7', '192.168.100.200']),
+        hostname=rng.choice(['eop-1', 'web3pi-node-07']))
+
+
+def time_frames(renderer, frames, background, snapshots, refresh_every):
+    start = time.perf_counter()
+    for tick, snap in enumerate(snapshots):
+        renderer.compose(frames, background, snap, tick, tick % refresh_every == 0)
+        frames.convert()
+    return (time.perf_counter() - start) / len(snapshots) * 1000
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    rng = random.Random(1)
+    background = Image.open('./img/lcdbg.png').convert("RGBA")
+    pil, native = FramePool(), Rgb565Frames()
+
+    worst = 0
+    for show_per_core in (False, True):
+        renderer = DashboardRenderer(show_per_core)
+        for tick in range(count):
+            snap = random_snapshot(rng)
+            renderer.compose(pil, background, snap, tick, True)
+            renderer.compose(native, background, snap, tick, True)
+            worst = max(worst, int(np.count_nonzero(pil.convert() != native.convert())))
+    print(f"parity: {2 * count} frames, worst frame differs in {worst} pixels (tolerance {TOLERANCE_PIXELS})")
+
+    renderer = DashboardRenderer()
+    snapshots = [random_snapshot(rng) for _ in range(count)]
+    for name, refresh_every in (('animation only', count + 1), ('with cell refresh', 1), ('10 FPS mix', 10)):
+        # Warm up glyph atlases and segment patterns first
+        time_frames(renderer, native, background, snapshots[:20], 1)
+        pil_ms = time_frames(renderer, pil, background, snapshots, refresh_every)
+        native_ms = time_frames(renderer, native, background, snapshots, refresh_every)
+        print(f"{name:<18} PIL {pil_ms:6.2f} ms/frame  native {native_ms:6.2f} ms/frame  "
+              f"speedup {pil_ms / native_ms:4.1f}x")
+
+    if worst > TOLERANCE_PIXELS:
+        print("FAIL: output differs from the PIL renderer")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""
+Address tracking by netlink events instead of 30 s polling, and static layer redraws.
+
+- Times one address lookup (what low_frequency_tasks did every 30 s).
+- Runs an AddressWatcher idle for a few seconds: without kernel events it
+  must not look anything up.
+- Adds a TEST-NET address to the loopback interface and removes it again
+  (needs root, skipped otherwise) and times until the watcher looked up the
+  address after each event.
+- Composes a minute of dashboard frames at 10 FPS with a cell refresh every
+  second and counts how often the static layer is actually redrawn: only
+  when a shown value changes.
+
+Usage (from the repository root):
+    python -m bench.network_watch [SECONDS]
+"""
+
+import sys
+import time
+import subprocess
+from PIL import Image
+from bench.jitter import SNAPSHOT
+from monitor.network import AddressWatcher, get_ip_address
+from ui.dashboard import DashboardRenderer
+from ui.native import Rgb565Frames
+
+INTERFACES = ['eth0', 'wlan0']
+TEST_ADDRESS = '198.51.100.7/32'
+FPS = 10
+
+
+def wait_for_lookup(watcher, lookups, timeout=2):
+    end = time.perf_counter() + timeout
+    while watcher.lookups == lookups and time.perf_counter() < end:
+        time.sleep(0.0005)
+    return watcher.lookups > lookups
+
+
+def change_latency(watcher):
+    """Seconds from adding and from removing the test address to the lookup, None without permission"""
+    latencies = []
+    for action in ('add', 'del'):
+        lookups = watcher.lookups
+        start = time.perf_counter()
+        result = subprocess.run(['ip', 'addr', action, TEST_ADDRESS, 'dev', 'lo'], capture_output=True, text=True)
+        if result.returncode != 0:
+            print(f"  ip addr {action}: {result.stderr.strip()}")
+            return None
+        if not wait_for_lookup(watcher, lookups):
+            return []
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def static_redraws(seconds):
+    """(refreshes requested, static layers drawn) for `seconds` of frames, the CPU value changing every 5 s"""
+    renderer = DashboardRenderer()
+    frames = Rgb565Frames()
+    background = Image.open('./img/lcdbg.png').convert("RGBA")
+    drawn = 0
+    draw_static = renderer.draw_static
+
+    def counting(draw, snap):
+        nonlocal drawn
+        drawn += 1
+        draw_static(draw, snap)
+    renderer.draw_static = counting
+
+    refreshes = 0
+    for tick in range(int(seconds * FPS)):
+        snap = SNAPSHOT._replace(cpu_percent=SNAPSHOT.cpu_percent + tick // (5 * FPS))
+        refresh = tick % FPS == 0
+        refreshes += refresh
+        renderer.compose(frames, background, snap, tick, refresh)
+    return refreshes, drawn
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+    failed = False
+
+    start = time.perf_counter()
+    for _ in range(100):
+        get_ip_address(INTERFACES)
+    lookup_ms = (time.perf_counter() - start) * 10
+    print(f"lookup: {lookup_ms:.3f} ms, polled every 30 s that is {24 * 3600 // 30} lookups a day")
+
+    watcher = AddressWatcher(INTERFACES)
+    watcher.start()
+    if watcher.socket is None:
+        print("FAIL: no netlink route socket")
+        sys.exit(1)
+    time.sleep(seconds)
+    print(f"idle {seconds:.0f} s: {watcher.events} kernel events, {watcher.lookups} lookups")
+    if watcher.lookups and not watcher.events:
+        print("  looked up without a kernel event")
+        failed = True
+
+    latencies = change_latency(watcher)
+    if latencies is None:
+        print("address change: skipped (needs root)")
+    elif len(latencies) < 2:
+        print("address change: no lookup within 2 s")
+        failed = True
+    else:
+        print(f"address change: looked up {latencies[0] * 1000:.1f} ms after adding, "
+              f"{latencies[1] * 1000:.1f} ms after removing the test address")
+    watcher.stop()
+
+    refreshes, drawn = static_redraws(60)
+    print(f"static layer: {drawn} redraws for {refreshes} cell refreshes (the shown values changed {60 // 5} times)")
+    if drawn > 60 // 5:
+        failed = True
+
+    if failed:
+        print("FAIL")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Cost of the top processes scan and its effect on the 10 FPS render loop.
+
+Starts a few hundred idle child processes, then
+- times one ProcessTable scan against a psutil.process_iter() pass that reads
+  the same values,
+- renders the dashboard at 10 FPS on a FakeDisplay without and with a
+  ProcessTable scanning in its background thread (every 0.5 s instead of 2 s
+  to make any effect visible) and compares the frame times.
+Fails if the median frame time grows by more than 0.5 ms.
+
+Usage (from the repository root):
+    python -m bench.process_table [seconds] [processes]
+"""
+
+import sys
+import time
+import subprocess
+import numpy as np
+import psutil
+from PIL import Image
+from bench.fakes import FakeDisplay
+from bench.jitter import SNAPSHOT
+from monitor.processes import ProcessTable
+from ui.dashboard import DashboardRenderer
+from ui.native import Rgb565Frames
+
+FPS = 10
+
+
+def render(seconds):
+    disp = FakeDisplay()
+    frames = Rgb565Frames()
+    renderer = DashboardRenderer()
+    background = Image.open('./img/lcdbg.png').convert("RGBA")
+    times = []
+    tick = 0
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        loop_start = time.perf_counter()
+        renderer.compose(frames, background, SNAPSHOT, tick, tick % FPS == 0)
+        disp.ShowBuffer(frames.convert())
+        times.append(time.perf_counter() - loop_start)
+        tick += 1
+        time.sleep(max(0, 1 / FPS - (time.perf_counter() - loop_start)))
+    return np.array(times) * 1000
+
+
+def process_iter_pass():
+    start = time.perf_counter()
+    for process in psutil.process_iter(['name', 'cpu_times', 'memory_info']):
+        process.cpu_percent()
+    return time.perf_counter() - start
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 15
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+    children = [subprocess.Popen(['sleep', '600']) for _ in range(count)]
+    try:
+        table = ProcessTable(interval=0.5)
+        table.scan()  # Creates the handles of all processes
+        first = table.scan_seconds
+        steady = []
+        for _ in range(10):
+            before = table.scan_seconds
+            table.scan()
+            steady.append(table.scan_seconds - before)
+        process_iter_pass()
+        full = min(process_iter_pass() for _ in range(5))
+        print(f"{table.get().count} processes: first scan {first * 1000:.1f} ms, "
+              f"steady scan {min(steady) * 1000:.1f} ms, psutil.process_iter pass {full * 1000:.1f} ms")
+
+        idle = render(seconds)
+        table.start()
+        busy = render(seconds)
+        table.stop()
+    finally:
+        for child in children:
+            child.kill()
+            child.wait()
+
+    for name, times in (('without scan', idle), ('with scan', busy)):
+        p50, p99 = np.percentile(times, (50, 99))
+        print(f"{name:<13} frame time p50 {p50:5.2f} ms  p99 {p99:5.2f} ms  frames {len(times)}")
+    print(f"background scans: {table.scans}, {table.scan_seconds / table.scans * 1000:.1f} ms per scan")
+    if np.median(busy) - np.median(idle) > 0.5:
+        print("FAIL")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""
+Writes a synthetic metric recording covering the states that are hard to reach on demand:
+install stages 0-2 (stage 1 with an error), then a syncing node running hot.
+
+The result can be replayed without hardware, e.g. for screenshots in CI:
+    python -m bench.scenarios /tmp/scenario.w3rec
+    python -m monitor.replay /tmp/scenario.w3rec --speed 0 --screenshots /tmp/shots
+"""
+
+import sys
+import math
+from bench.jitter import SNAPSHOT
+from monitor.recording import Recorder
+from monitor.snapshot import errors_to_mask
+
+START = 1721088000.0  # Fixed start time, so the install screen clock is reproducible
+
+INSTALL = (
+    # (seconds, stage, level, status)
+    (20, 0, 'INFO', 'Updating packages'),
+    (20, 1, 'INFO', 'Installing clients'),
+    (20, 1, 'ERROR', 'Download failed'),
+    (20, 2, 'INFO', 'Configuring services'),
+)
+
+
+def scenario():
+    """Yields (timestamp, Snapshot) once per second"""
+    t = START
+    errors = {"0": False, "1": False, "2": False, "100": False, "any": False}
+    for seconds, stage, level, status in INSTALL:
+        if level == 'ERROR':
+            errors[str(stage)] = errors["any"] = True
+        for _ in range(seconds):
+            yield t, SNAPSHOT._replace(install_stage=stage, errors=errors_to_mask(errors), status=status, ip=None)
+            t += 1
+
+    # Syncing, high CPU load and temperature climbing into the red
+    for second in range(60):
+        yield t, SNAPSHOT._replace(cpu_percent=70 + 25 * math.sin(second / 5), cpu_temp=70 + second / 4,
+                                   exec=second % 100, node=min(100, 50 + second), cons=30)
+        t += 1
+
+
+def main():
+    if len(sys.argv) != 2:
+        sys.exit("Usage: python -m bench.scenarios OUTPUT")
+    recorder = Recorder(sys.argv[1], max_bytes=0)
+    count = 0
+    for timestamp, snap in scenario():
+        recorder.write(snap, timestamp)
+        count += 1
+    recorder.close()
+    print(f"{count} records written to {sys.argv[1]}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,345 @@
+"""
+Soak test: the full hwmonitor main() loop over simulated days.
+
+hwmonitor runs unchanged on FakeDisplays with every page enabled, against a
+fake InfluxDB (history and status queries, in a child process so its threads
+and sockets are not counted) that goes down for OUTAGE_SECONDS every
+OUTAGE_EVERY, a status log that walks through the install stages (with an
+error) and fake CPU temperature and load with a daily hot and a busy period.
+The clocks (time.time, time.monotonic, time.sleep and waits on threading
+primitives) run SPEED times faster in all threads, so days pass in minutes;
+the render loop runs as fast as it can.
+
+Every SAMPLE_EVERY simulated seconds the traced Python heap (tracemalloc),
+RSS, open file descriptors, thread count and the percentiles of the real
+time the render loop worked per frame are recorded. After WARMUP (install
+done, caches filled, every page shown) the last sample must not grow beyond
+the MAX_* thresholds and the frame time p99 must not drift from the same
+hours of the previous day, otherwise the biggest allocation sites are listed
+and the check fails.
+
+Usage (from the repository root, with the dashboard dependencies installed):
+    python -m bench.soak [DAYS] [SPEED]
+"""
+
+import os
+import re
+import sys
+import json
+import math
+import time
+import tempfile
+import threading
+import tracemalloc
+import multiprocessing
+from collections import namedtuple
+from urllib.parse import urlparse, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import numpy as np
+import psutil
+from bench.fakes import FakeDisplay
+from bench.history_cache import STATEMENT, synthetic
+
+DAYS = 2
+SPEED = 400  # Simulated seconds per real second
+SAMPLE_EVERY = 3600
+WARMUP = 6 * 3600
+OUTAGE_EVERY = 8 * 3600
+OUTAGE_SECONDS = 1800
+PORT = 18088
+WORKS_MAX = 1000000  # frame times kept between two samples
+
+MAX_HEAP_GROWTH = 1024 * 1024  # bytes traced by tracemalloc
+MAX_RSS_GROWTH = 16 * 1024 * 1024
+MAX_FD_GROWTH = 2
+MAX_THREAD_GROWTH = 0
+MAX_P99_RATIO = 1.5  # p99 frame time at the end / after warmup, plus MAX_P99_SLACK
+MAX_P99_SLACK = 2.0  # ms
+
+# (simulated seconds, stage, level, statusShort) appended to the status log
+INSTALL = [
+    (0, 0, 'INFO', 'Preparing the system'),
+    (600, 1, 'ERROR', 'Download failed'),
+    (900, 1, 'INFO', 'Installing clients'),
+    (1800, 2, 'INFO', 'Configuring services'),
+    (2700, 100, 'INFO', 'Node is ready'),
+]
+
+FROM = re.compile(r'FROM "([^"]+)"')
+Temperature = namedtuple('Temperature', ['label', 'current', 'high', 'critical'])
+
+
+class SimulatedClock:
+    """Makes the clocks of every thread run `speed` times faster from now on"""
+
+    def __init__(self, speed):
+        self.speed = speed
+        self.wall = time.time()
+        self.origin = time.monotonic()
+        self.real_time = time.time
+        self.real_monotonic = time.monotonic
+        self.real_sleep = time.sleep
+        self.real_wait = threading.Condition.wait
+        self.on_sleep = None
+
+    def install(self):
+        clock = self
+        time.time = lambda: clock.wall + (clock.real_time() - clock.wall) * clock.speed
+        time.monotonic = lambda: clock.origin + (clock.real_monotonic() - clock.origin) * clock.speed
+        time.sleep = self.sleep
+
+        # Event.wait() waits on a Condition, so this covers both
+        def wait(condition, timeout=None):
+            return clock.real_wait(condition, None if timeout is None else timeout / clock.speed)
+        threading.Condition.wait = wait
+
+    def sleep(self, seconds):
+        if self.on_sleep is not None:
+            self.on_sleep()
+        self.real_sleep(seconds / self.speed)
+
+    def elapsed(self):
+        """Simulated seconds since the clock was created"""
+        return (self.real_monotonic() - self.origin) * self.speed
+
+
+class FakeInflux(BaseHTTPRequestHandler):
+    """Status and history queries with values that follow the simulated time"""
+
+    protocol_version = 'HTTP/1.1'
+    wall = 0
+    speed = 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.startswith('/ping'):
+            self.send_response(204)
+            self.send_header('X-Influxdb-Version', '1.8.10')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        now = FakeInflux.wall + (time.time() - FakeInflux.wall) * FakeInflux.speed
+        results = []
+        for i, statement in enumerate(parse_qs(urlparse(self.path).query)['q'][0].split(';')):
+            match = STATEMENT.search(statement)
+            if match is not None:
+                aggregate, measurement = match.group(1), match.group(3)
+                start, end, bucket = int(match.group(4)), int(match.group(5)), int(match.group(6))
+                values = [[t, synthetic(measurement, t)] for t in range(start, end, bucket)]
+                columns = ['time', aggregate]
+            else:
+                measurement = FROM.search(statement).group(1)
+                values = [['2024-07-16T00:00:00Z', synthetic(measurement, now)]]
+                columns = ['time', 'active_percent']
+            results.append({'statement_id': i, 'series': [{'name': measurement, 'columns': columns,
+                                                           'values': values}]})
+        body = json.dumps({'results': results}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_POST = do_GET
+
+
+def serve(port, wall, speed):
+    FakeInflux.wall, FakeInflux.speed = wall, speed
+    ThreadingHTTPServer.allow_reuse_address = True
+    server = ThreadingHTTPServer(('127.0.0.1', port), FakeInflux)
+    server.daemon_threads = True
+    server.serve_forever()
+
+
+class Influx:
+    """The fake InfluxDB in a child process, down means the port refuses connections"""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.context = multiprocessing.get_context('spawn')
+        self.process = None
+
+    def up(self):
+        self.process = self.context.Process(target=serve, args=(PORT, self.clock.wall, self.clock.speed),
+                                            daemon=True)
+        self.process.start()
+
+    def down(self):
+        self.process.terminate()
+        self.process.join()
+        self.process = None
+
+    @property
+    def online(self):
+        return self.process is not None
+
+
+def temperature(t):
+    """°C: daily cycle, hot for 40 minutes every afternoon"""
+    if 14 * 3600 <= t % 86400 < 14 * 3600 + 2400:
+        return 82.0
+    return 55 + 8 * math.sin(2 * math.pi * t / 86400)
+
+
+def cpu_load(t):
+    """%: an hour of catching up every day"""
+    if 3 * 3600 <= t % 86400 < 4 * 3600:
+        return 96.0
+    return 20 + 10 * math.sin(t / 700)
+
+
+class Sample:
+    def __init__(self, t, heap, rss, fds, threads, works, sent, influx):
+        self.t = t
+        self.heap = heap
+        self.rss = rss
+        self.fds = fds
+        self.threads = threads
+        self.frames = len(works)
+        self.p50, self.p99 = np.percentile(works, (50, 99)) if len(works) else (0.0, 0.0)
+        self.sent = sent
+        self.influx = influx
+
+    def __str__(self):
+        return (f"{int(self.t // 86400)}d {int(self.t % 86400 // 3600):02d}h  heap {self.heap / 2 ** 20:6.2f} MB  "
+                f"rss {self.rss / 2 ** 20:6.1f} MB  fds {self.fds:3d}  threads {self.threads:2d}  "
+                f"frame p50 {self.p50:5.2f} ms  p99 {self.p99:6.2f} ms  ({self.frames} frames, {self.sent} sent)  "
+                f"influx {self.influx}")
+
+
+def main():
+    days = float(sys.argv[1]) if len(sys.argv) > 1 else DAYS
+    speed = float(sys.argv[2]) if len(sys.argv) > 2 else SPEED
+    directory = tempfile.mkdtemp(prefix='w3p_soak_')
+    status_log = os.path.join(directory, 'status.jlog')
+    open(status_log, 'w').close()
+
+    tracemalloc.start()
+    clock = SimulatedClock(speed)
+    clock.install()
+    influx = Influx(clock)
+    influx.up()
+
+    psutil.sensors_temperatures = lambda: {'cpu_thermal': [Temperature('', temperature(clock.elapsed()), None, None)]}
+    psutil.cpu_percent = lambda interval=None, percpu=False: (
+        [cpu_load(clock.elapsed())] * psutil.cpu_count() if percpu else cpu_load(clock.elapsed()))
+
+    import hwmonitor
+    from lcd import fastboot
+    hwmonitor.LCD_1inch69.LCD_1inch69 = FakeDisplay
+    hwmonitor.screens.show_opening = lambda disp=None: None
+    hwmonitor.get_hostname = lambda: 'localhost'
+    hwmonitor.port = PORT
+    hwmonitor.STATUS_LOG = status_log
+    hwmonitor.PAGES = ['dashboard', 'history_1h', 'history_24h', 'processes', 'load']
+    hwmonitor.PAGE_SECONDS = 60
+    hwmonitor.RECORD_PATH = os.path.join(directory, 'soak.w3rec')
+    hwmonitor.RECORD_MAX_BYTES = 2 * 1024 * 1024
+    fastboot.PATH = os.path.join(directory, 'frame.rgb565')
+    # Collector timeouts guard against calls that hang in real time, at the simulated speed every
+    # scheduling delay would count as one
+    make_collectors = hwmonitor.make_collectors
+
+    def real_time_collectors():
+        collectors = make_collectors()
+        for collector in collectors:
+            collector.timeout *= speed
+        return collectors
+    hwmonitor.make_collectors = real_time_collectors
+
+    # Real time the render loop works between two sleeps = one frame (or install screen step),
+    # kept in a preallocated buffer so the measurement does not show up as heap growth
+    works = np.zeros(WORKS_MAX)
+    count = 0
+    woke = None
+
+    def on_sleep():
+        nonlocal woke, count
+        if threading.current_thread() is render:
+            if woke is not None and count < WORKS_MAX:
+                works[count] = (time.perf_counter() - woke) * 1000
+                count += 1
+            woke = time.perf_counter()
+    clock.on_sleep = on_sleep
+
+    render = threading.Thread(target=hwmonitor.main, name='hwmonitor', daemon=True)
+    render.start()
+
+    duration = days * 86400
+    installed = 0
+    next_sample = SAMPLE_EVERY
+    samples = []
+    baseline = baseline_snapshot = None
+    process = psutil.Process()
+    print(f"Soak: {days:g} simulated days at {speed:g}x, files in {directory}")
+    while clock.elapsed() < duration:
+        if not render.is_alive():
+            print("FAIL: main() ended")
+            sys.exit(1)
+        t = clock.elapsed()
+        while installed < len(INSTALL) and INSTALL[installed][0] <= t:
+            _, stage, level, status = INSTALL[installed]
+            with open(status_log, 'a') as f:
+                f.write(json.dumps({'stage': stage, 'level': level, 'statusShort': status}) + '\n')
+            installed += 1
+        outage = t % OUTAGE_EVERY >= OUTAGE_EVERY - OUTAGE_SECONDS
+        if outage and influx.online:
+            influx.down()
+        elif not outage and not influx.online:
+            influx.up()
+
+        if t >= next_sample:
+            next_sample += SAMPLE_EVERY
+            frame_works, count = works[:count].copy(), 0
+            disp = hwmonitor.disp
+            sample = Sample(t, tracemalloc.get_traced_memory()[0], process.memory_info().rss,
+                            len(os.listdir('/proc/self/fd')), threading.active_count(), frame_works,
+                            disp.sent if hasattr(disp, 'sent') else 0,
+                            getattr(getattr(hwmonitor, 'influx_handler', None), 'state', '-') if influx.online else 'down')
+            samples.append(sample)
+            print(sample, flush=True)
+            if baseline is None and t >= WARMUP:
+                baseline = sample
+                baseline_snapshot = tracemalloc.take_snapshot()
+        clock.real_sleep(0.02)
+
+    if baseline is None or baseline is samples[-1]:
+        print("FAIL: the run ended before the warmup, use more DAYS")
+        sys.exit(1)
+    last = samples[-1]
+    # The scenario repeats daily, frame times are compared with the same hours of the previous day
+    day = 86400 // SAMPLE_EVERY
+    pairs = [(samples[i - day].p99, samples[i].p99) for i in range(day, len(samples)) if samples[i - day].t >= WARMUP]
+    checks = [
+        ('heap', last.heap - baseline.heap, MAX_HEAP_GROWTH, lambda v: f'{v / 1024:.0f} kB'),
+        ('rss', last.rss - baseline.rss, MAX_RSS_GROWTH, lambda v: f'{v / 2 ** 20:.1f} MB'),
+        ('fds', last.fds - baseline.fds, MAX_FD_GROWTH, str),
+        ('threads', last.threads - baseline.threads, MAX_THREAD_GROWTH, str),
+    ]
+    if pairs:
+        earlier, later = np.median([p[0] for p in pairs]), np.median([p[1] for p in pairs])
+        checks.append(('frame p99', later - earlier, earlier * (MAX_P99_RATIO - 1) + MAX_P99_SLACK,
+                       lambda v: f'{v:.2f} ms'))
+    else:
+        print("Frame time drift needs a full simulated day after the warmup, not checked")
+    failed = False
+    print(f"Growth from {int(baseline.t // 3600)} h to {int(last.t // 3600)} h:")
+    for name, growth, limit, show in checks:
+        print(f"  {name:<10} {show(growth):>10}  (limit {show(limit)})")
+        failed |= growth > limit
+
+    # Without the allocations of the measurement itself
+    own = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+    top = tracemalloc.take_snapshot().filter_traces(own).compare_to(baseline_snapshot.filter_traces(own), 'lineno')
+    print("Largest heap growth by line:")
+    for stat in top[:10 if failed else 5]:
+        print(f"  {stat}")
+    print("FAIL" if failed else "OK")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
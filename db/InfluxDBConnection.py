@@ -1,11 +1,45 @@
 import logging
 import time
 import threading
-from datetime import datetime, timedelta
+from collections import namedtuple
 from influxdb import InfluxDBClient
 
+# Supervisor states
+CONNECTED = 'connected'  # Statuses are fetched every min_fetch_interval .. fetch_interval seconds
+BACKOFF = 'backoff'  # The last attempt failed, retrying after an exponentially growing delay
+DEGRADED = 'degraded'  # Circuit open after failure_threshold failures, probing every degraded_interval
+
+STATUS_QUERY = 'SELECT "active_percent" FROM "{measurement}" WHERE "host"::tag =~ /^{host}_s$/ ORDER BY time DESC LIMIT 1'
+MEASUREMENTS = (('exec', 'status_exec'), ('node', 'status_node'), ('cons', 'status_consensus'))
+SYNCED = 77  # Lowest active_percent of the 'synced' status band (ui/palette.py)
+
+# Last value of a status with the time.monotonic() it was fetched and last changed, None = never
+CachedStatus = namedtuple('CachedStatus', ['value', 'fetched', 'changed'])
+
+
 class InfluxDBConnectionHandler:
-    def __init__(self, host, port, username, password, database, timeout, retry_interval, fetch_interval):
+    """
+    Keeps the latest client statuses from InfluxDB, maintained by a single supervisor thread.
+
+    One InfluxDBClient (and so one keep-alive HTTP session) is used for the whole
+    lifetime, the three status queries go out as one request. After
+    `failure_threshold` failed attempts in a row the circuit opens (DEGRADED):
+    instead of full queries only a ping is sent every `degraded_interval`
+    seconds, a successful ping and fetch close it again.
+
+    While connected the poll interval adapts to the statuses: after a change
+    they are fetched again in `min_fetch_interval` seconds, follow-up changes
+    of a restart or a sync show up quickly. While nothing changes the interval
+    doubles after every fetch, up to `syncing_fetch_interval` while a client is
+    below the synced band and up to `fetch_interval` once all are synced.
+
+    Failures never reset the statuses. Every value is cached with the time it
+    was fetched, get_exec_status() and friends return it with its age.
+    """
+
+    def __init__(self, host, port, username, password, database, timeout, retry_interval, fetch_interval,
+                 failure_threshold=5, degraded_interval=300, min_fetch_interval=5, syncing_fetch_interval=30,
+                 synced=SYNCED):
         self.host = host
         self.port = port
         self.username = username
@@ -14,99 +48,160 @@ class InfluxDBConnectionHandler:
         self.timeout = timeout
         self.retry_interval = retry_interval
         self.fetch_interval = fetch_interval
+        self.min_fetch_interval = min(min_fetch_interval, fetch_interval)
+        self.syncing_fetch_interval = min(max(syncing_fetch_interval, self.min_fetch_interval), fetch_interval)
+        self.synced = synced
+        self.interval = self.min_fetch_interval
+        self.failure_threshold = failure_threshold
+        self.degraded_interval = degraded_interval
+        self.query = None
+        self.set_host(host)
         self.client = None
-        self.connection_thread = threading.Thread(target=self.connect_to_influxdb)
-        self.connection_thread.daemon = True
-        self.fetch_thread = threading.Thread(target=self.fetch_latest_record)
-        self.fetch_thread.daemon = True
-        self.exec = 0
-        self.node = 0
-        self.cons = 0
-
-    def connect_to_influxdb(self):
-        current_attempt = 0
-        while self.client is None:
-            try:
-                client = InfluxDBClient(host=self.host, port=self.port, username=self.username, password=self.password,
-                                        database=self.database, timeout=self.timeout)
-                if client.ping():
-                    logging.info("InfluxDB: Connection successful!")
-                    self.client = client
-                else:
-                    logging.warning("InfluxDB: Connection failed: ping unsuccessful")
-                    self.client = None
-            except Exception as e:
-                try:
-                    logging.error(f"InfluxDB: An error occurred: {e}")
-                except:
-                    logging.error("InfluxDB: An error occurred while logging error")
-                self.client = None
-
-            if self.client is None:
-                delay = int(min(300, self.retry_interval * (1.5 ** current_attempt)))
-                logging.info(f"InfluxDB: Retrying connection in {delay} seconds...")
-                time.sleep(delay)
-                current_attempt += 1
+        self.state = BACKOFF
+        self.failures = 0
+        self.error = None
+        self.updated = None  # time.monotonic() of the last successful fetch
+        self.fetches = 0
+        self.changed = False
+        self.cache = {name: CachedStatus(0, None, None) for name, _ in MEASUREMENTS}
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.supervise, name='influxdb', daemon=True)
 
     def start(self):
-        self.connection_thread.start()
-        self.fetch_thread.start()
+        self.thread.start()
+
+    def stop(self, timeout=None):
+        self.stop_event.set()
+        self.thread.join(timeout)
+        if self.client is not None:
+            self.client.close()
+
+    def set_host(self, host):
+        """Filters the following fetches on `host`, e.g. after the hostname changed"""
+        self.host = host
+        self.query = ';'.join(STATUS_QUERY.format(measurement=measurement, host=host)
+                              for _, measurement in MEASUREMENTS)
 
     def get_client(self):
-        return self.client
+        return self.client if self.state == CONNECTED else None
+
+    def get_status(self, name):
+        """
+        Returns:
+            tuple: (active_percent, seconds since it was fetched), the age is None if it never was.
+        """
+        cached = self.cache[name]
+        return cached.value, None if cached.fetched is None else time.monotonic() - cached.fetched
 
     def get_exec_status(self):
-        return self.exec
+        return self.get_status('exec')
 
     def get_node_status(self):
-        return self.node
+        return self.get_status('node')
 
     def get_cons_status(self):
-        return self.cons
-
-    def fetch_latest_record(self):
-        time.sleep(3)
-        current_attempt = 0
-        while True:
-            if self.client is None:
-                delay = int(min(300, self.retry_interval * (1.5 ** current_attempt)))
-                logging.info(f"InfluxDB: Client is not connected, retrying connection in {delay} seconds...")
-                time.sleep(delay)
-                current_attempt += 1
-                continue
-
-            current_attempt = 0
-            try:
-                    result1 = self.client.query(f'SELECT "active_percent" FROM "status_exec" WHERE "host"::tag =~ /^{self.host}_s$/ ORDER BY time DESC LIMIT 1')
-                    points1 = list(result1.get_points())
-                    if points1:
-                        self.exec = points1[0]['active_percent']
-
-                    result2 = self.client.query(
-                        f'SELECT "active_percent" FROM "status_node" WHERE "host"::tag =~ /^{self.host}_s$/ ORDER BY time DESC LIMIT 1')
-                    points2 = list(result2.get_points())
-                    if points2:
-                        self.node = points2[0]['active_percent']
-
-                    result3 = self.client.query(
-                        f'SELECT "active_percent" FROM "status_consensus" WHERE "host"::tag =~ /^{self.host}_s$/ ORDER BY time DESC LIMIT 1')
-                    points3 = list(result3.get_points())
-                    if points3:
-                        self.cons = points3[0]['active_percent']
-
-                    # logging.info(f'InfluxDB: {self.exec} / {self.node} / {self.cons}')
-
-                    time.sleep(self.fetch_interval)
-
-            except Exception as e:
-                try:
-                    logging.error(f'InfluxDB: An error occurred while fetching the latest record: {str(e)}')
-                except:
-                    logging.error("InfluxDB: An error occurred while logging error")
-                self.client = None
-                self.exec = 0
-                self.node = 0
-                self.cons = 0
-                self.connection_thread = threading.Thread(target=self.connect_to_influxdb)
-                self.connection_thread.start()
-                time.sleep(3)
\ No newline at end of file
+        return self.get_status('cons')
+
+    def get_age(self):
+        """Seconds since the statuses were last fetched successfully, None if they never were"""
+        if self.updated is None:
+            return None
+        return time.monotonic() - self.updated
+
+    def supervise(self):
+        delay = 0
+        while not self.stop_event.wait(delay):
+            if self.state == DEGRADED:
+                # Half-open circuit: a cheap ping decides whether a full fetch is worth it
+                ok = self.probe() and self.fetch()
+            else:
+                ok = self.fetch()
+            delay = self.advance(ok)
+
+    def _client(self):
+        if self.client is None:
+            # retries=1: the supervisor owns the retry policy, the client makes one attempt per call
+            self.client = InfluxDBClient(host=self.host, port=self.port, username=self.username,
+                                         password=self.password, database=self.database, timeout=self.timeout,
+                                         retries=1)
+        return self.client
+
+    def probe(self):
+        try:
+            self._client().ping()
+            return True
+        except Exception as e:
+            self.error = e
+            return False
+
+    def fetch(self):
+        try:
+            results = self._client().query(self.query)
+            if not isinstance(results, list):
+                results = [results]
+            now = time.monotonic()
+            self.changed = False
+            for (name, _), result in zip(MEASUREMENTS, results):
+                points = list(result.get_points())
+                if points:
+                    # A client without a point keeps its value and its age grows
+                    value = points[0]['active_percent']
+                    cached = self.cache[name]
+                    if value != cached.value or cached.changed is None:
+                        self.changed = True
+                        self.cache[name] = CachedStatus(value, now, now)
+                    else:
+                        self.cache[name] = CachedStatus(value, now, cached.changed)
+            self.updated = now
+            self.fetches += 1
+            return True
+        except Exception as e:
+            self.error = e
+            return False
+
+    def advance(self, ok):
+        """
+        Moves the state machine after an attempt.
+
+        Returns:
+            float: Seconds until the next attempt.
+        """
+        if ok:
+            self.failures = 0
+            delay = self.next_interval(self.state != CONNECTED)
+            self._set_state(CONNECTED)
+            return delay
+
+        self.failures += 1
+        if self.failures >= self.failure_threshold:
+            self._set_state(DEGRADED)
+            return self.degraded_interval
+
+        self._set_state(BACKOFF)
+        delay = min(self.degraded_interval, self.retry_interval * (1.5 ** (self.failures - 1)))
+        logging.info(f"InfluxDB: Attempt {self.failures} failed ({self.error}), retrying in {delay:.0f} seconds...")
+        return delay
+
+    def next_interval(self, reconnected=False):
+        """Seconds until the next fetch: short after a change, doubling while the statuses are stable"""
+        # After an outage the statuses may have moved on meanwhile
+        if reconnected or self.changed:
+            self.interval = self.min_fetch_interval
+        else:
+            syncing = any(cached.value < self.synced for cached in self.cache.values())
+            self.interval = min(self.syncing_fetch_interval if syncing else self.fetch_interval, self.interval * 2)
+        return self.interval
+
+    def _set_state(self, state):
+        if state == self.state:
+            return
+        previous, self.state = self.state, state
+        if state == CONNECTED:
+            logging.info("InfluxDB: Connection successful!")
+        elif state == DEGRADED:
+            age = self.get_age()
+            kept = 'no values yet' if age is None else f'keeping values from {age:.0f} seconds ago'
+            logging.warning(f"InfluxDB: Unreachable after {self.failures} attempts ({self.error}), "
+                            f"probing every {self.degraded_interval} seconds, {kept}")
+        elif previous == CONNECTED:
+            logging.error(f"InfluxDB: An error occurred while fetching the latest record: {self.error}")
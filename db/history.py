@@ -0,0 +1,139 @@
+import math
+import time
+import logging
+import threading
+from collections import namedtuple
+import numpy as np
+
+WIDTH = 240  # Display columns, at most one point per column is fetched
+
+HISTORY_QUERY = ('SELECT {aggregate}("{field}") FROM "{measurement}" WHERE "host"::tag =~ /{host}/ '
+                 'AND time >= {start}s AND time < {end}s GROUP BY time({bucket}s) fill(none)')
+
+# name -> (measurement, field, aggregate, host tag pattern)
+# block and peers are the gauges geth reports with --metrics.influxdb
+SERIES = {
+    'block': ('geth.chain/head/block.gauge', 'value', 'max', '^{host}$'),
+    'peers': ('geth.p2p/peers.gauge', 'value', 'mean', '^{host}$'),
+    'exec': ('status_exec', 'active_percent', 'mean', '^{host}_s$'),
+    'node': ('status_node', 'active_percent', 'mean', '^{host}_s$'),
+    'cons': ('status_consensus', 'active_percent', 'mean', '^{host}_s$'),
+}
+
+# name -> length in seconds
+WINDOWS = {'1h': 3600, '24h': 86400}
+
+# One fetched window: bucket starts in epoch seconds and values, per series
+HistoryData = namedtuple('HistoryData', ['window', 'bucket', 'start', 'end', 'series', 'fetched', 'version'])
+
+
+def bucket_seconds(window, width=WIDTH):
+    """Smallest whole-second GROUP BY interval that fits `window` into `width` points"""
+    return math.ceil(window / width)
+
+
+class HistoryCache:
+    """
+    Downsampled history of the node metrics, fetched in the background.
+
+    Every window is fetched with one multi-statement query of GROUP BY time()
+    aggregates, one bucket per display column. Buckets are aligned to multiples
+    of the bucket size and a window expires exactly when its newest bucket is
+    closed (plus `grace` seconds for late points), so a 1 h window is fetched
+    every 15 s and a 24 h window every 6 min. Pages only read the cache, a
+    re-render never causes a query. While paused nothing is fetched, expired
+    windows are fetched right after resume().
+
+    Args:
+        handler (InfluxDBConnectionHandler): Source of the InfluxDB client.
+        host (str): Host name used in the tag filters.
+    """
+
+    def __init__(self, handler, host, windows=WINDOWS, series=SERIES, width=WIDTH, grace=5, retry=30):
+        self.handler = handler
+        self.host = host
+        self.windows = windows
+        self.series = series
+        self.width = width
+        self.grace = grace
+        self.retry = retry
+        self.data = {}
+        self.expires = {name: 0 for name in windows}
+        self.queries = 0
+        self.active = threading.Event()
+        self.active.set()
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.run, name='history', daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        self.active.set()
+
+    def pause(self):
+        """Stops fetching until resume(), while no history page is on screen or next"""
+        self.active.clear()
+
+    def resume(self):
+        self.active.set()
+
+    def set_host(self, host):
+        """Filters on `host` from now on, the cached windows are fetched again at the next wakeup"""
+        self.host = host
+        self.expires = {name: 0 for name in self.windows}
+
+    def get(self, window):
+        """
+        Returns:
+            HistoryData: Cached data of `window`, None before the first successful fetch.
+        """
+        return self.data.get(window)
+
+    def run(self):
+        while not self.stop_event.is_set():
+            self.active.wait()
+            now = time.time()
+            for window, expires in list(self.expires.items()):
+                if expires <= now:
+                    self.fetch(window, now)
+            delay = min(self.expires.values()) - time.time()
+            self.stop_event.wait(max(1, delay))
+
+    def query(self, window, start, end, bucket):
+        return ';'.join(
+            HISTORY_QUERY.format(aggregate=aggregate, field=field, measurement=measurement,
+                                 host=pattern.format(host=self.host), start=start, end=end, bucket=bucket)
+            for measurement, field, aggregate, pattern in self.series.values())
+
+    def fetch(self, window, now):
+        bucket = bucket_seconds(self.windows[window], self.width)
+        end = (int(now) // bucket + 1) * bucket  # The current, still open bucket is included
+        start = end - bucket * self.width
+        client = self.handler.get_client()
+        if client is None:
+            self.expires[window] = now + min(bucket, self.retry)
+            return
+
+        try:
+            results = client.query(self.query(window, start, end, bucket), epoch='s')
+            self.queries += 1
+        except Exception as e:
+            logging.warning(f"History: Query for the last {window} failed: {e}")
+            self.expires[window] = now + min(bucket, self.retry)
+            return
+        if not isinstance(results, list):
+            results = [results]
+
+        series = {}
+        for name, result in zip(self.series, results):
+            points = list(result.get_points())
+            times = np.fromiter((p['time'] for p in points), dtype=np.int64, count=len(points))
+            values = np.fromiter((p[self.series[name][2]] for p in points), dtype=np.float64, count=len(points))
+            series[name] = (times, values)
+
+        previous = self.data.get(window)
+        version = previous.version + 1 if previous else 1
+        self.data[window] = HistoryData(window, bucket, start, end, series, now, version)
+        self.expires[window] = end + self.grace
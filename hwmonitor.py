@@ -19,16 +19,51 @@ THE SOFTWARE.
 import os
 import sys
 import time
+from lcd import fastboot
+
+# Raspberry Pi LCD pin configuration, here above the imports as the boot frame goes to the first panel:
+RST = 27
+DC = 25
+BL = 18
+bus = 0
+
+# Panels, each on its own SPI chip select (device) with its own RST/DC/BL pins. The first one shows PAGES,
+# every further one cycles through its own 'pages' (the dashboard is shown on the first panel only), e.g.
+# dict(bus=0, device=1, rst=23, dc=24, bl=13, pages=['load', 'processes'])
+PANELS = [dict(bus=bus, device=0, rst=RST, dc=DC, bl=BL)]
+
+# The frame saved by the previous run goes to the panel before the heavy imports below
+boot_display = fastboot.show_saved_frame(config=PANELS[0]) if __name__ == '__main__' else None
+
 import psutil
-import socket
-import netifaces
 import logging
 import json
-import math
 import signal
+from collections import namedtuple
 from lcd import LCD_1inch69
-from PIL import Image, ImageDraw, ImageFont, ImageOps, ImageEnhance
+from lcd.panels import Panel
+from lcd.power import ACTIVE
+from PIL import Image
 from db.InfluxDBConnection import InfluxDBConnectionHandler
+from db.history import HistoryCache
+from monitor.collectors import Collector, CollectorPool
+from monitor.governor import Governor, normalized_cpu_percent
+from monitor.load import LoadSampler
+from monitor.network import AddressWatcher, get_hostname
+from monitor.processes import ProcessTable
+from monitor.recording import Recorder
+from monitor.snapshot import Snapshot, errors_to_mask, STALE_BITS
+from ui import screens
+from ui.carousel import Carousel
+from ui.dashboard import DashboardRenderer, dashboard_content_key, map_status
+from ui.framebuffer import FramePool
+from ui.framestats import FrameStats
+from ui.history import HistoryPage
+from ui.load import LoadPage
+from ui.mirror import FrameMirror
+from ui.native import Rgb565Frames
+from ui.processes import ProcessesPage
+from ui.render_process import RenderProcess, apply_scheduling
 
 # Choose how to display CPU usage percentages
 SHOW_PER_CORE = False
@@ -50,24 +85,97 @@ username = "geth"
 password = "geth"
 database = "ethonrpi"
 install_stage = -1
+install_status = None
+STATUS_LOG = "/opt/web3pi/status.jlog"  # Install progress written by the Web3 Pi installer, one JSON object per line
 timeout = 3  # Timeout in seconds
 retry_interval = 10  # Interval in seconds between retries
-fetch_interval = 30  # Interval in seconds between fetches
+fetch_interval = 120  # Longest interval in seconds between fetches, reached while all statuses are synced and unchanged
+min_fetch_interval = 5  # Interval after a status changed
+syncing_fetch_interval = 30  # Longest interval while a client is not synced
+influx_handler = None  # InfluxDBConnectionHandler, fetches the client statuses
+STATUS_STALE_AFTER = 600  # Seconds without a fetched value before a status is shown grey as stale
+# exec/node/cons active_percent and the Snapshot.stale bits
+ClientStatuses = namedtuple('ClientStatuses', ['exec', 'node', 'cons', 'stale'])
+NO_STATUSES = ClientStatuses(0, 0, 0, 0)
+Memory = namedtuple('Memory', ['ram', 'swap'])  # psutil.virtual_memory() and swap_memory()
+
+# Interfaces whose IPv4 address is shown, in order of priority; names or patterns like 'wl*'
+NETWORK_INTERFACES = ['eth0', 'wlan0']
+network = None  # AddressWatcher, updates ip_local_address and hostname when the kernel reports a change
+ip_local_address = None
 
-# Raspberry Pi LCD pin configuration:
-RST = 27
-DC = 25
-BL = 18
-bus = 0
 disp = None
-
-# Text colors
-C_BG = '#00129A' #LCD bacground
-C_T1 = '#FFFFFF' #main text
-C_T2 = '#A1A1A1' #text on top
-C_T3 = '#A1A1A1' #text on bottom
-C_T_GREEN = '#22C55E' #green text
-C_T_RED = '#EF4433' #red text
+panels = []  # (Panel, Carousel) of every further panel
+
+# Panel power management (dim -> idle -> sleep when the shown content does not change)
+POWER_SAVING = False
+POWER_DIM_AFTER = 120  # Seconds without content change before the backlight is dimmed
+POWER_IDLE_AFTER = 600  # Seconds before idle mode, only the animated strip is refreshed
+POWER_SLEEP_AFTER = 1800  # Seconds before the panel is put to sleep, 0 = never
+POWER_BRIGHTNESS = 100  # Backlight duty cycle in %
+POWER_DIM_BRIGHTNESS = 30
+POWER_IDLE_BRIGHTNESS = 10
+POWER_OFF_SCHEDULE = []  # Off windows in local time, e.g. [("23:00", "07:00")]
+power = None
+frames = None
+
+# Frame composition backend:
+# 'native' = numpy RGB565 canvas with pre-rasterized glyphs (pixel-identical, no PIL work per frame)
+# 'pil'    = PIL RGBA images converted to RGB565 every frame
+RENDERER = 'native'
+
+# Rendering and SPI transmission in a dedicated process, this process only collects metrics
+RENDER_PROCESS = False
+RENDER_CPUS = {3}  # CPU cores for the render process, None = any
+RENDER_NICE = -5  # Absolute nice value of the render process, None = unchanged
+COLLECTOR_CPUS = None  # CPU cores for this (collector) process, None = any
+COLLECTOR_NICE = 5
+render_process = None
+
+# Recording of the rendered metrics for offline replay (python -m monitor.replay)
+RECORD_PATH = None  # e.g. '/var/log/w3p_hwm.w3rec', None = off
+RECORD_MAX_BYTES = 64 * 1024 * 1024  # Rotated to <RECORD_PATH>.1 above this size, about 4 days at 1 record/s
+recorder = None
+
+# Pages shown in turn once the node is installed (in-process rendering only):
+# 'dashboard', 'history_1h', 'history_24h' (block height, peers and client status from InfluxDB),
+# 'processes' (top processes by CPU and memory), 'load' (per-core load, disk and network throughput)
+PAGES = ['dashboard']
+PAGE_SECONDS = 10  # How long each page stays on the screen
+PAGE_TRANSITION = 'slide'  # 'slide', 'fade' or None
+PAGE_TRANSITION_SECONDS = 0.5
+TRANSITION_FPS = 30
+PROCESSES_INTERVAL = 2  # Seconds between scans of /proc for the processes page
+history = None
+processes = None
+load = None
+
+# Governor: lowers frame rate, animation and sampling cadence when the node is hot, throttled or busy
+GOVERNOR = True
+GOVERNOR_CPU_BUDGET = 10  # % of one core the dashboard itself may use
+GOVERNOR_TEMP_HIGH = 75  # °C, 5 FPS and halved sampling from here
+GOVERNOR_TEMP_CRITICAL = 80  # °C, 1 FPS without animation from here
+GOVERNOR_BUSY = 90  # % of all cores used by the system
+GOVERNOR_RECOVER_AFTER = 60  # Seconds of healthy readings before stepping back up
+governor = None
+
+# Metrics are sampled by collectors in a few worker threads (see make_collectors()), the render loop only
+# reads their last values. A collector that hangs, e.g. disk usage of a dead mount, occupies one worker.
+COLLECTOR_WORKERS = 3
+COLLECTOR_LOG_EVERY = 600  # Seconds between the logged collector costs, 0 = never
+collectors = None
+
+# Local HTTP mirror of the LCD: http://<ip>:<port>/ (page), /frame.png, /stream.mjpg
+MIRROR_PORT = None  # e.g. 8080, None = off
+MIRROR_HOST = '127.0.0.1'  # '0.0.0.0' serves the LAN, there is no authentication
+MIRROR_FPS = 10
+mirror = None
+
+# Frame shown at the next start before anything is loaded (lcd/fastboot.py), saved dimmed as stale
+BOOT_FRAME_INTERVAL = 600  # Seconds between saves of the dashboard (and at shutdown), 0 = off
+next_boot_frame = 0
+boot_frames = None  # fastboot.FrameSaver, started with the first save
+dashboard_on_panel = False
 
 logging.basicConfig(
     format='%(asctime)s %(levelname)-8s %(message)s',
@@ -75,17 +183,25 @@ logging.basicConfig(
     datefmt='%Y-%m-%d %H:%M:%S')
 
 def display_final_screen():
+    global render_process
+    save_boot_frame(force=True)
+    if render_process is not None:
+        # The render process owns the display and shows the final screen itself
+        stats = render_process.stop()
+        render_process = None
+        if stats:
+            logging.info(f"Render process: {stats['fps']:.1f} FPS, interval p99 {stats['p99']:.1f} ms, "
+                         f"jitter {stats['jitter']:.1f} ms")
+        return
+
     try:
         global disp
-
-        # Open image -> invert colours -> convert to grayscale -> dim to 15% brightness
-        img = ImageEnhance.Brightness(
-            ImageOps.invert(
-                Image.open('./img/Web3Pi_logo_0.png').convert('RGB')
-            ).convert('L')
-        ).enhance(0.15).convert('RGB')
-
-        disp.ShowImage(img)
+        wake_display()
+        screens.show_final_screen(disp)
+        for panel, carousel in panels:
+            if panel.power is not None:
+                panel.power.wake(wait=True)
+            screens.show_final_screen(panel.disp)
 
     except Exception as e:
         logging.error(f"Display final screen error: {e}")
@@ -105,6 +221,10 @@ error_in_stage = {"0": False, "1": False, "2": False, "100": False, "any": False
 
 def main():
     logging.info('Hardware Monitor Start')
+    if boot_display is not None and fastboot.first_pixels is not None:
+        logging.info(f"Boot frame: On the panel {fastboot.first_pixels:.2f} s after process start")
+    if fastboot.error is not None:
+        logging.error(f"Boot frame: Cannot show {fastboot.PATH}: {fastboot.error}")
     # chceck sensors avability
     if not hasattr(psutil, "sensors_temperatures"):
         logging.error("sensors_temperatures not supported")
@@ -114,212 +234,303 @@ def main():
         logging.error("sensors_temperatures not supported")
         sys.exit("SPI is not enabled")
 
-    global hostname
+    global hostname, network, ip_local_address
     hostname = get_hostname()
+    network = AddressWatcher(NETWORK_INTERFACES, on_change=network_changed)
+    ip_local_address = network.address
+    network.start()
+
+    global influx_handler
+    influx_handler = InfluxDBConnectionHandler(hostname, port, username, password, database, timeout, retry_interval,
+                                               fetch_interval, min_fetch_interval=min_fetch_interval,
+                                               syncing_fetch_interval=syncing_fetch_interval)
+    influx_handler.start()
+
+    if MIRROR_PORT:
+        start_mirror()
+
+    if RENDER_PROCESS and len(PANELS) > 1:
+        logging.warning("Further panels are not available with RENDER_PROCESS, using the first one only")
+
+    global history
+    if any(page.startswith('history_') for page in configured_pages()):
+        if RENDER_PROCESS:
+            logging.warning("History pages are not available with RENDER_PROCESS, showing the dashboard only")
+        else:
+            history = HistoryCache(influx_handler, hostname)
+            history.start()
+
+    global processes
+    if 'processes' in configured_pages():
+        if RENDER_PROCESS:
+            logging.warning("The processes page is not available with RENDER_PROCESS, showing the dashboard only")
+        else:
+            processes = ProcessTable(PROCESSES_INTERVAL)
+            processes.start()
+
+    global load
+    if 'load' in configured_pages():
+        if RENDER_PROCESS:
+            logging.warning("The load page is not available with RENDER_PROCESS, showing the dashboard only")
+        else:
+            load = LoadSampler()
+            load.start()
+
+    global governor
+    if GOVERNOR:
+        governor = Governor(GOVERNOR_CPU_BUDGET, GOVERNOR_TEMP_HIGH, GOVERNOR_TEMP_CRITICAL, GOVERNOR_BUSY,
+                            recover_after=GOVERNOR_RECOVER_AFTER)
+
+    global collectors
+    collectors = CollectorPool(make_collectors(), COLLECTOR_WORKERS, scale=sample_scale, log_every=COLLECTOR_LOG_EVERY)
+    collectors.start()
+
+    if RENDER_PROCESS:
+        if boot_display is not None:
+            # The render process opens the panel itself
+            fastboot.release(boot_display)
+        collector_loop()
+    else:
+        render_loop()
+
+    logging.info('Hardware Monitor End')
+    if recorder is not None:
+        recorder.close()
+    display_final_screen()
 
+def start_mirror():
+    global mirror
+    # In render process mode the encoder polls the shared framebuffer, otherwise show_frame() submits frames
+    source = (lambda: render_process and render_process.frame) if RENDER_PROCESS else None
+    try:
+        mirror = FrameMirror(MIRROR_PORT, MIRROR_HOST, MIRROR_FPS, source=source)
+        mirror.start()
+    except OSError as e:
+        logging.error(f"Mirror: Cannot listen on port {MIRROR_PORT}: {e}")
+        mirror = None
+
+def power_config():
+    if not POWER_SAVING:
+        return None
+    return dict(dim_after=POWER_DIM_AFTER, idle_after=POWER_IDLE_AFTER,
+                sleep_after=POWER_SLEEP_AFTER or float('inf'), brightness=POWER_BRIGHTNESS,
+                dim_brightness=POWER_DIM_BRIGHTNESS, idle_brightness=POWER_IDLE_BRIGHTNESS,
+                schedule=POWER_OFF_SCHEDULE)
+
+def govern():
+    """Feeds the governor with the latest samples, the render process follows its decisions"""
+    if governor is None:
+        return
+    if governor.update(normalized_cpu_percent(reading('cpu_percent', 0), SHOW_PER_CORE), reading('cpu_temp', 0)) \
+            and render_process is not None:
+        render_process.set_fidelity(governor.fps, governor.animate)
+
+def frame_interval():
+    return governor.frame_interval if governor is not None else 0.1
+
+def sample_scale():
+    return governor.sample_scale if governor is not None else 1
+
+def configured_pages():
+    """Pages of all panels"""
+    return PAGES + [page for config in PANELS[1:] for page in config.get('pages', [])]
+
+def make_carousel(order, width, height):
+    """Carousel of the pages in `order`, not started, None if it would only show the dashboard"""
+    pages = {f'history_{window}': HistoryPage(history, window)
+             for window in (history.windows if history is not None else ())}
+    if processes is not None:
+        pages['processes'] = ProcessesPage(processes)
+    if load is not None:
+        pages['load'] = LoadPage(load)
+    carousel = Carousel(pages, order, PAGE_SECONDS, PAGE_TRANSITION, PAGE_TRANSITION_SECONDS,
+                        width=width, height=height)
+    if carousel.order == ['dashboard']:
+        return None
+    return carousel
+
+def open_display(config):
+    """Display of a PANELS entry"""
+    return LCD_1inch69.LCD_1inch69(**{key: value for key, value in config.items() if key != 'pages'})
+
+def open_panels():
+    """Opens every further panel with a carousel of its pages"""
+    for index, config in enumerate(PANELS[1:], 1):
+        name = f'Panel {index}'
+        order = [page for page in config.get('pages', []) if page != 'dashboard']
+        try:
+            lcd = open_display(config)
+            lcd.Init()
+            lcd.clear()
+            lcd.bl_DutyCycle(POWER_BRIGHTNESS)
+        except Exception as e:
+            logging.error(f"{name}: Cannot open: {e}")
+            continue
+        carousel = make_carousel(order, lcd.width, lcd.height)
+        if carousel is None:
+            logging.warning(f"{name}: None of the pages {config.get('pages')} is available")
+            continue
+        carousel.start()
+        panels.append((Panel(lcd, name, power_config()), carousel))
+
+def show_panels(now, cut):
+    """Advances the pages of the further panels, they wake and dim with the dashboard"""
+    if not panels:
+        return
+    key = dashboard_content_key(snapshot())
+    for panel, carousel in panels:
+        panel.show(carousel.advance(now, cut), key)
+
+def make_frames(width, height, rgb565=None):
+    if RENDERER == 'native':
+        return Rgb565Frames(width, height, rgb565=rgb565)
+    return FramePool(width, height, rgb565=rgb565)
+
+def render_loop():
+    """Samples metrics and drives the display from this process"""
     # display with hardware SPI:
     global disp
-    disp = LCD_1inch69.LCD_1inch69()
-    # Initialize library.
-    disp.Init()
-    # Clear display.
-    disp.clear()
+    if boot_display is not None:
+        # Already initialized and showing the saved frame, which stays until the first real one
+        disp = boot_display
+    else:
+        disp = open_display(PANELS[0])
+        # Initialize library.
+        disp.Init()
+        # Clear display.
+        disp.clear()
     # Set the backlight to 100
-    disp.bl_DutyCycle(100) # ToDo: Fix hardware PWM on Rpi 5
+    disp.bl_DutyCycle(POWER_BRIGHTNESS) # ToDo: Fix hardware PWM on Rpi 5
     # If backlight is flickering a quick fix is to connect BL pin to 3.3V on Rpi to set backlight to 100%
 
-    # https://www.fontsquirrel.com/fonts/jetbrains-mono
-    Font1 = ImageFont.truetype("./font/JetBrainsMono-Medium.ttf", 35)
-    Font2 = ImageFont.truetype("./font/JetBrainsMono-Medium.ttf", 25)
-    Font3 = ImageFont.truetype("./font/JetBrainsMono-Medium.ttf", 20)
-    Font3_5 = ImageFont.truetype("./font/JetBrainsMono-Medium.ttf", 18)
-    Font4 = ImageFont.truetype("./font/JetBrainsMono-Medium.ttf", 15)
+    # Frames go to the panel from a transmitter thread, further panels get their own
+    global power
+    primary = Panel(disp, 'Panel 0', power_config())
+    disp, power = primary.disp, primary.power
+    open_panels()
 
-    global influx_handler
-    influx_handler = InfluxDBConnectionHandler(hostname, port, username, password, database, timeout, retry_interval,
-                                               fetch_interval)
-    influx_handler.start()
+    renderer = DashboardRenderer(SHOW_PER_CORE)
 
     update_install_stage(disp=disp)
-    show_opening(disp=disp)
+    if boot_display is None:
+        screens.show_opening(disp=disp)
 
-    low_frequency_tasks()
-    high_frequency_tasks()
-    medium_frequency_tasks()
+    collectors.wait(1)
+    print_stats()
 
     time.sleep(1)
 
-    spinner = "   "
-    error_msg_color = 0
     try:
-        
+
         # New loop logic for smoother animation
         bg_template = Image.open('./img/lcdbg.png').convert("RGBA")
-        cached_frame = None
+        global frames
+        frames = make_frames(disp.width, disp.height)
+        stats = FrameStats('Render loop', 0.1)
+        carousel = make_carousel(PAGES, disp.width, disp.height)
+        if carousel is not None:
+            carousel.start()
+        shown_page = 'dashboard'
+        shown_version = None
+        static_ready = False
+        next_high = next_log = 0
         skip = 0
         logging.info('Entering forever loop')
         while True:
             loop_start = time.time()
             try:
-                global animation_tick
-                animation_tick = (animation_tick + 1) % 10000
+                global animation_tick, dashboard_on_panel
+                # The wave keeps its speed at reduced frame rates
+                animation_tick = (animation_tick + max(1, round(frame_interval() / 0.1))) % 10000
 
                 if install_stage != 100:
-                    status = update_install_stage(disp=disp)
-                    spinner = update_spinner(spinner)
-                    
-                    image1 = Image.open('./img/lcdbg.png').convert("RGBA")
-                    draw = ImageDraw.Draw(image1)
-                    logo = Image.open('./img/web3-pi-logo-240x70.png')
-                    image1.paste(logo, (0, 25), logo)
-                    
-                    if install_stage == 0:
-                        if error_in_stage["0"]:
-                            draw.text((10, 35+60), f'Stage 0: ERROR', fill=C_T_RED, font=Font2, anchor="lt")
-                        else:
-                            draw.text((10, 35+60), f'Stage 0: {spinner} ', fill=C_T2, font=Font2, anchor="lt")
-                        draw.text((120, 2*35+65), f'{status}', fill=C_T1, font=Font3, anchor="mm")
+                    update_install_stage(disp=disp)
+                    snap = snapshot()
+                    now = time.monotonic()
+                    if now >= next_high:
+                        # One record per second, like the dashboard
+                        record(snap)
+                        next_high = now + 1
+                    key = renderer.compose(frames, bg_template, snap, animation_tick, True)
+                    show_frame(key)
+                    dashboard_on_panel = False
+                    show_panels(time.monotonic(), True)
 
-                    elif install_stage == 1:
-                        if error_in_stage["0"]:
-                            draw.text((10, 35+60), f'Stage 0: ERROR', fill=C_T_RED, font=Font2, anchor="lt")
-                        else:
-                            draw.text((10, 35+60), f'Stage 0: DONE', fill=C_T_GREEN, font=Font2, anchor="lt")
-                        if error_in_stage["1"]:
-                            draw.text((10, 2*35+60), f'Stage 1: ERROR', fill=C_T_RED, font=Font2, anchor="lt")
-                        else:
-                            draw.text((10, 2*35+60), f'Stage 1: {spinner} ', fill=C_T2, font=Font2, anchor="lt")
-                        draw.text((120, 3*35+65), f'{status}', fill=C_T1, font=Font3, anchor="mm")
+                    time.sleep(0.5)
 
-                    elif install_stage == 2:
-                        if error_in_stage["0"]:
-                            draw.text((10, 35+60), f'Stage 0: ERROR', fill=C_T_RED, font=Font2, anchor="lt")
-                        else:
-                            draw.text((10, 35+60), f'Stage 0: DONE', fill=C_T_GREEN, font=Font2, anchor="lt")
-                        if error_in_stage["1"]:
-                            draw.text((10, 2*35+60), f'Stage 1: ERROR', fill=C_T_RED, font=Font2, anchor="lt")
+                else:
+                    # The collectors sample in the background, the cells show their values every second
+                    # (stretched by the governor like the collector intervals)
+                    now = time.monotonic()
+                    refresh = now >= next_high
+                    if refresh:
+                        govern()
+                        record(snapshot())
+                        next_high = now + 1 * sample_scale()
+
+                    if now >= next_log:
+                        print_stats() # every 10s
+                        next_log = now + 10 * sample_scale()
+
+                    # No animation when the governor turned it off or nobody can see it
+                    cut = (governor is not None and not governor.animate) or \
+                          (power is not None and power.state != ACTIVE)
+
+                    # Pages switch once the next one is prepared, the power key always follows the dashboard
+                    page = carousel.scheduled(now) if carousel is not None else 'dashboard'
+                    if page != shown_page and not carousel.transitioning and carousel.ready(page):
+                        if shown_page == 'dashboard':
+                            source = frames.rgb565
                         else:
-                            draw.text((10, 2*35+60), f'Stage 1: DONE', fill=C_T_GREEN, font=Font2, anchor="lt")
-                        if error_in_stage["2"]:
-                            draw.text((10, 3*35+60), f'Stage 2: ERROR', fill=C_T_RED, font=Font2, anchor="lt")
+                            source = carousel.output.rgb565
+                        if page == 'dashboard':
+                            renderer.compose(frames, bg_template, snapshot(), animation_tick, True)
+                            static_ready = True
+                            target = frames.convert()
                         else:
-                            draw.text((10, 3*35+60), f'Stage 2: {spinner} ', fill=C_T2, font=Font2, anchor="lt")
-                        draw.text((120, 4*35+65), f'{status}', fill=C_T1, font=Font3, anchor="mm")
-
-                    if ip_local_address != None:
-                        if error_in_stage["any"]:
-                            if error_msg_color == 0:
-                                draw.text((120, 5*35+60), f'For more info visit:', fill=C_T_RED, font=Font3_5, anchor="mm")
-                                error_msg_color = 1
-                            else:
-                                draw.text((120, 5*35+60), f'For more info visit:', fill=C_T1, font=Font3_5, anchor="mm")
-                                error_msg_color = 0
+                            shown_version, target = carousel.frame(page)
+                        carousel.begin(source, target, now, cut)
+                        shown_page = page
+
+                    if carousel is not None and carousel.transitioning:
+                        show_frame(dashboard_content_key(snapshot()), carousel.step(now))
+                        dashboard_on_panel = False
+
+                    elif shown_page != 'dashboard':
+                        # Other pages change only when their data does (a new history bucket, a process scan)
+                        if carousel.frame(shown_page)[0] != shown_version:
+                            shown_version = carousel.present(shown_page)
+                            show_frame(dashboard_content_key(snapshot()), carousel.output)
                         else:
-                                draw.text((120, 5*35+60), f'For more info visit:', fill=C_T1, font=Font3_5, anchor="mm")
-
-                        draw.text((120, 10), f"{time.strftime('%d.%m.%y %H:%M:%S', time.localtime())}", fill=C_T2, font=Font3_5, anchor="mm")
-                        draw.text((120, 5*35+80), f'http://{ip_local_address}', fill=C_T1, font=Font3_5, anchor="mm")
-                    disp.ShowImage(image1.convert("RGB"))
-                    
-                    time.sleep(0.5)
-
-                else:
-                    if skip % 10 == 0 or cached_frame is None:
-                        high_frequency_tasks() # every second approx
-
-                        # Update cached frame every second 
-                        image_base = bg_template.copy()
-                        draw = ImageDraw.Draw(image_base)
+                            keep_frame(dashboard_content_key(snapshot()), carousel.output)
 
-                        # Draw vertical lines
-                        draw.line([(240 / 3, 0), (240 / 3, (280 / 3) * 2)], fill="BLACK", width=2, joint=None)
-                        draw.line([((240 / 3) * 2, 0), ((240 / 3) * 2, (280 / 3) * 2)], fill="BLACK", width=2, joint=None)
+                    # Cells are redrawn every second into the cached frame, the animation every frame
+                    # (without animation only changed cells are sent)
+                    elif refresh or governor is None or governor.animate:
+                        stats.tick()
+                        key = renderer.compose(frames, bg_template, snapshot(), animation_tick,
+                                               refresh or not static_ready)
+                        static_ready = True
 
-                        # Draw vertical lines
-                        draw.line([(0, 280 / 3), (240, 280 / 3)], fill="BLACK", width=2, joint=None)
-                        draw.line([(0, (280 / 3) * 2), (240, (280 / 3) * 2)], fill="BLACK", width=2, joint=None)
+                        # Send image to lcd display
+                        show_frame(key)
+                        dashboard_on_panel = True
+                        save_boot_frame()
 
-                        # CPU
-                        x = 0
-                        y = 0
-                        draw.text((120 + x, 108 + y), 'CPU', fill=C_T2, font=Font2, anchor="mm")
+                    else:
+                        keep_frame(dashboard_content_key(snapshot()), frames)
 
-                        if SHOW_PER_CORE:
-                            draw.text((120 + x, 140 + y), f'{int(cpu_percent)}', fill=f'{value_to_hex_color_cpu_usage_400(int(cpu_percent))}', font=Font1, anchor="mm")
-                            draw.text((150 + x, 108 + y), '%', fill=C_T2, font=Font3, anchor="mm")
-                        else:
-                            draw.text((120 + x, 140 + y), f'{int(cpu_percent)}', fill=f'{value_to_hex_color_cpu_usage(int(cpu_percent))}', font=Font1, anchor="mm")
-                            draw.text((150 + x, 145 + y), '%', fill=C_T2, font=Font3, anchor="mm")
-                        ct = int(cpu_temp)
-                        draw.text((122 + x, 170 + y), f'{ct}°C', fill=C_T2, font=Font2, anchor="mm")
-
-
-                        # DISK
-                        x = -80
-                        y = 0
-                        draw.text((120 + x, 108 + y), 'DISK', fill=C_T2, font=Font2, anchor="mm")
-                        draw.text((120 + x, 140 + y), f'{int(disk.percent)}%', fill=C_T1, font=Font1, anchor="mm")
-                        draw.text((122 + x, 170 + y), f'{disk_free_tb:.2f}TB', fill=C_T2, font=Font3, anchor="mm")
-
-                        # EXEC
-                        x = -80
-                        y = -90
-                        draw.text((120 + x, 108 + y), 'EXEC', fill=C_T2, font=Font2, anchor="mm")
-                        draw.text((120 + x, 140 + y), f'{map_status(exec)}', fill=map_status_color(exec), font=Font4, anchor="mm")
-
-                        # NODE
-                        x = 0
-                        y = -90
-                        draw.text((120 + x, 108 + y), 'NODE', fill=C_T2, font=Font2, anchor="mm")
-                        draw.text((120 + x, 140 + y), f'{map_status(node)}', fill=map_status_color(node), font=Font4, anchor="mm")
-
-                        # CONS
-                        x = 80
-                        y = -90
-                        draw.text((120 + x, 108 + y), 'CONS', fill=C_T2, font=Font2, anchor="mm")
-                        draw.text((120 + x, 140 + y), f'{map_status(cons)}', fill=map_status_color(cons), font=Font4, anchor="mm")
-
-                        # RAM
-                        x = 80
-                        y = 0
-                        draw.text((120 + x, 108 + y), 'RAM', fill=C_T2, font=Font2, anchor="mm")
-                        draw.text((120 + x, 140 + y), f'{int(mem.percent)}', fill=C_T1, font=Font1, anchor="mm")
-                        draw.text((145 + x, 170 + y), '%', fill=C_T2, font=Font2, anchor="mm")
-
-                        # SWAP
-                        # x = 80
-                        # y = 0
-                        # draw.text((120 + x, 108 + y), 'SWAP', fill=C_T2, font=Font2, anchor="mm")
-                        # draw.text((120 + x, 140 + y), f'{int(swap.percent)}', fill=C_T1, font=Font1, anchor="mm")
-                        # draw.text((145 + x, 170 + y), '%', fill=C_T2, font=Font2, anchor="mm")
-
-                        # Local IP / HostName
-                        x = 40
-                        y = 95
-                        draw.text((120, 108 + y), 'IP / HOSTNAME', fill=C_T2, font=Font2, anchor="mm")
-                        draw.text((120, 170 + y - 35), f'{ip_local_address}', fill=C_T1, font=Font3, anchor="mm")
-                        draw.text((120, 170 + y - 10), f'{hostname}.local', fill=C_T1, font=Font3, anchor="mm")
-
-                        cached_frame = image_base
-
-                    if skip % 100 == 0:
-                        medium_frequency_tasks() # every 10s
-
-                    if skip % 300 == 0:
-                        low_frequency_tasks() # every 30s
-
-                    display_frame = cached_frame.copy()
-                    draw_anim = ImageDraw.Draw(display_frame)
-                    
-                    draw_dashboard_animation(draw_anim, animation_tick)
-
-                    # Send image to lcd display
-                    disp.ShowImage(display_frame.convert("RGB"))
+                    show_panels(now, cut)
 
                     skip += 1
-                    
+                    if skip % 600 == 0:
+                        stats.log()
+
                     elapsed = time.time() - loop_start
-                    delay = max(0, 0.1 - elapsed) # 10 FPS
+                    # 10 FPS unless the governor lowers it, transitions run at TRANSITION_FPS
+                    transitioning = any(c is not None and c.transitioning for c in [carousel] + [c for _, c in panels])
+                    interval = 1 / TRANSITION_FPS if transitioning else frame_interval()
+                    delay = max(0, interval - elapsed)
                     time.sleep(delay)
 
             except Exception as error:
@@ -334,40 +545,171 @@ def main():
 
     logging.info('End forever loop')
 
-    logging.info('Hardware Monitor End')
-    display_final_screen()
+def collector_loop():
+    """Samples metrics and publishes them to the render process, which owns the display"""
+    global render_process
+    render_process = RenderProcess(LCD_1inch69.LCD_1inch69.width, LCD_1inch69.LCD_1inch69.height, fps=10,
+                                   show_per_core=SHOW_PER_CORE, power_config=power_config(),
+                                   cpus=RENDER_CPUS, nice=RENDER_NICE, native=RENDERER == 'native',
+                                   opening=boot_display is None)
+    render_process.start()
+    apply_scheduling('Collector', COLLECTOR_CPUS, COLLECTOR_NICE)
+    global dashboard_on_panel
+
+    update_install_stage()
+    collectors.wait(1)
+    print_stats()
+    publish()
 
-def print_stats():
     try:
-        global cpu_percent, cpu_temp, disk, disk_free_tb, ip_local_address, ram, swap, exec, node, cons
-        logging.info(f'Values -> CPU: {int(cpu_percent)}%, CPU_TEMP: {int(cpu_temp)}°C, RAM: {int(mem.percent)}%, SWAP: {int(swap.percent)}%, DISK: {int(disk.percent)}%, EXECUTION: {map_status(exec)}, NODE: {map_status(node)}, CONSENSUS: {map_status(cons)}')
-    except Exception as error:
-        logging.error("An exception occurred: " + type(error).__name__)
+        skip = 0
+        next_record = 0
+        logging.info('Entering forever loop')
+        while True:
+            loop_start = time.time()
+            try:
+                if install_stage != 100:
+                    update_install_stage()
+                    # Published every 0.5 s for the install animation, recorded once per second
+                    now = time.monotonic()
+                    publish(now >= next_record)
+                    if now >= next_record:
+                        next_record = now + 1
+                    dashboard_on_panel = False
+                    time.sleep(0.5)
+                    continue
+
+                govern()
+                if skip % 10 == 0:
+                    print_stats() # every 10s
+                publish()
+                dashboard_on_panel = True
+                save_boot_frame()
+                skip += 1
+
+                if not render_process.process.is_alive():
+                    logging.error("Render process: Exited unexpectedly")
+                    break
 
+                time.sleep(max(0, 1 * sample_scale() - (time.time() - loop_start)))
 
-def map_status(value):
-    if 0 <= value <= 25:
-        return 'inactive'
-    elif 26 <= value <= 45:
-        return 'waiting'
-    elif 46 <= value <= 76:
-        return 'syncing'
-    elif 77 <= value <= 100:
-        return 'synced'
+            except Exception as error:
+                logging.error("An exception occurred: " + type(error).__name__)
+                time.sleep(1)
+
+    except KeyboardInterrupt:
+        logging.info("Loop interrupted by user")
+
+    logging.info('End forever loop')
+
+def publish(recorded=True):
+    snap = snapshot()
+    if recorded:
+        record(snap)
+    render_process.publish(snap)
+
+def record(snap):
+    """Appends `snap` to the recording at RECORD_PATH, if enabled"""
+    global recorder, RECORD_PATH
+    if RECORD_PATH is None:
+        return
+    try:
+        if recorder is None:
+            recorder = Recorder(RECORD_PATH, RECORD_MAX_BYTES)
+        recorder.write(snap)
+    except OSError as e:
+        logging.error(f"Recorder: {e}, recording disabled")
+        RECORD_PATH = None
+
+def save_boot_frame(force=False):
+    """
+    Saves the dashboard on the panel as the next boot frame, at most every BOOT_FRAME_INTERVAL.
+
+    The periodic saves are written by a background thread, `force` (at shutdown) writes before returning.
+    """
+    global next_boot_frame, boot_frames
+    if not BOOT_FRAME_INTERVAL or not dashboard_on_panel:
+        return
+    now = time.monotonic()
+    if not force and now < next_boot_frame:
+        return
+    next_boot_frame = now + BOOT_FRAME_INTERVAL
+    if render_process is not None:
+        rgb565 = render_process.frame
     else:
-        return 'unknown'
-
-def map_status_color(value):
-    if 0 <= value <= 25:
-        return '#FF0000'
-    elif 26 <= value <= 45:
-        return '#FFFF00'
-    elif 46 <= value <= 76:
-        return '#FFA500'
-    elif 77 <= value <= 100:
-        return '#00FF00' # 'synced' green
+        rgb565 = frames.rgb565 if frames is not None else None
+    if rgb565 is None:
+        return
+    if boot_frames is None:
+        boot_frames = fastboot.FrameSaver(fastboot.PATH)
+        boot_frames.start()
+    if not force:
+        boot_frames.submit(rgb565)
+        return
+    try:
+        boot_frames.save(rgb565)
+    except OSError as e:
+        logging.error(f"Boot frame: Cannot save {fastboot.PATH}: {e}")
+
+def snapshot():
+    """Current values of everything the renderer consumes, zero for metrics not collected yet"""
+    memory, disk = reading('memory'), reading('disk')
+    statuses = reading('statuses', NO_STATUSES)
+    return Snapshot(reading('cpu_percent', 0), reading('cpu_temp', 0),
+                    memory.ram.percent if memory else 0, memory.swap.percent if memory else 0,
+                    disk.percent if disk else 0, disk.used / 1024 / 1024 / 1024 / 1024 if disk else 0,
+                    statuses.exec, statuses.node, statuses.cons,
+                    install_stage=install_stage, errors=errors_to_mask(error_in_stage),
+                    ip=ip_local_address, hostname=hostname, status=install_status, stale=statuses.stale)
+
+def reading(name, default=None):
+    """Last value of a collector, read without locking; `default` before it first returned"""
+    if collectors is None:
+        return default
+    return collectors.value(name, default)
+
+def show_frame(content_key, pool=None):
+    """
+    Sends the frame composed in `frames.frame` to the display, honouring the panel power state.
+
+    Args:
+        content_key (tuple): Values an operator cares about, a change wakes the panel.
+        pool: Frame to send instead of `frames`, e.g. a carousel page or transition frame.
+    """
+    if pool is None:
+        pool = frames
+    if power is None:
+        disp.ShowBuffer(pool.convert())
     else:
-        return '#FFFFFF'
+        power.present(pool, content_key)
+    if mirror is not None:
+        mirror.submit(pool.rgb565)
+
+def keep_frame(content_key, pool):
+    """
+    Advances the panel power state on a frame that sends nothing, `pool` holds the frame on the panel.
+    A change of `content_key` wakes the panel, the rows skipped meanwhile are sent again.
+    """
+    if power is None:
+        return
+    state = power.state
+    power.content(content_key)
+    power.update()
+    if state != ACTIVE and power.state == ACTIVE:
+        power.present(pool, content_key)
+
+def wake_display():
+    """Brings the panel back to full power before drawing outside of show_frame()"""
+    if power is not None and power.state != ACTIVE:
+        power.wake(wait=True)
+
+def print_stats():
+    try:
+        snap = snapshot()
+        logging.info(f'Values -> CPU: {int(snap.cpu_percent)}%, CPU_TEMP: {int(snap.cpu_temp)}°C, RAM: {int(snap.mem_percent)}%, SWAP: {int(snap.swap_percent)}%, DISK: {int(snap.disk_percent)}%, EXECUTION: {map_status(snap.exec)}, NODE: {map_status(snap.node)}, CONSENSUS: {map_status(snap.cons)}')
+    except Exception as error:
+        logging.error("An exception occurred: " + type(error).__name__)
+
 
 def get_cpu_temperature():
     """
@@ -400,19 +742,21 @@ def get_cpu_temperature():
     return cpu_temp
 
 def update_install_stage(disp=None):
-    global install_stage
+    global install_stage, install_status
     try:
-        lines = read_last_n_lines("/opt/web3pi/status.jlog", n=1)
+        lines = read_last_n_lines(STATUS_LOG, n=1)
         if len(lines) != 0:
             if len(lines) >= 1:
                 line = lines[0]
                 data = json.loads(line)
                 status = data.get("statusShort")
+                install_status = status
                 stage = int(data.get("stage"))
 
                 if stage != None:
-                    if install_stage == 2 and stage == 100:
-                        show_animation_sequence(disp=disp)
+                    if install_stage == 2 and stage == 100 and disp is not None:
+                        wake_display()
+                        screens.show_animation_sequence(disp=disp)
                     install_stage = stage
                 else:
                     install_stage = -1
@@ -455,170 +799,54 @@ def read_last_n_lines(filepath, n=2):
 
         return lines[-n:]
 
-def show_opening(disp=None):
-    if os.path.exists("/root/opening.flag"):
-        show_animation_sequence(disp=disp)
-    else:
-        open("/root/opening.flag", "w").close()
-
-def show_animation_sequence(folder_path="./img/3D/", frame_count=240, fps=30, disp=None):
-    delay = 1.0 / fps
-
-    image_files = sorted([
-        f for f in os.listdir(folder_path)
-        if f.lower().endswith('.png')
-    ])
-
-    for filename in image_files:
-        image_path = os.path.join(folder_path, filename)
-        image = Image.open(image_path)
-        if disp:
-            disp.ShowImage(image)
-        time.sleep(delay)
-    time.sleep(1)
-
-def update_spinner(spinner):
-    next_dot_count = (spinner.count('.') + 1) % 4
-    return '.' * next_dot_count + ' ' * (3 - next_dot_count)
-
-def draw_dashboard_animation(draw, tick):
-    # Activity Pulse at bottom
-    base_y = 275
-    width = 240
-    phase = tick * 0.1 # speed
-    
-    # Draw a sine wave
-    points = []
-    for x in range(0, width, 4):
-        y_off = math.sin((x * 0.05) + phase) * 3
-        points.append((x, base_y + y_off))
-    
-    draw.line(points, fill=(0, 255, 0, 80), width=2)
-
-def high_frequency_tasks():
-    logging.debug("high_frequency_tasks()")
-    global cpu_percent
-    global cpu_temp
-    global SHOW_PER_CORE
-
+def make_collectors():
+    """
+    The sampled metrics. A new one needs an entry here and its use in snapshot(),
+    a collector may also be a Collector subclass that overrides collect().
+    """
+    return [
+        Collector('cpu_percent', sample_cpu_percent, interval=1, timeout=1),
+        Collector('cpu_temp', get_cpu_temperature, interval=1, timeout=1),
+        # Only reads the handler's cache, a change shows up within a second of being fetched
+        Collector('statuses', sample_statuses, interval=1, timeout=1),
+        Collector('memory', sample_memory, interval=10, timeout=2),
+        Collector('disk', sample_disk, interval=30, timeout=5),
+    ]
+
+def sample_cpu_percent():
     if SHOW_PER_CORE:
-        cpu_percent = sum(psutil.cpu_percent(percpu=True))
-    else:
-        cpu_percent = psutil.cpu_percent()
-
-    #cpu_percent = psutil.cpu_percent()
-
-    cpu_temp = get_cpu_temperature()
-    #logging.info(f'CPU_TEMP= {getCpuTemperature()} °C')
-
-
-def medium_frequency_tasks():
-    logging.debug("medium_frequency_tasks()")
-
-    global mem
-    global swap
-    # global nvme_temp
-    # global cpu_rpm
-    mem = psutil.virtual_memory()
-    swap = psutil.swap_memory()
+        return sum(psutil.cpu_percent(percpu=True))
+    return psutil.cpu_percent()
 
-    print_stats()
+def sample_statuses():
+    statuses = {'exec': influx_handler.get_exec_status(), 'node': influx_handler.get_node_status(),
+                'cons': influx_handler.get_cons_status()}
+    stale = sum(STALE_BITS[name] for name, (_, age) in statuses.items() if age is None or age > STATUS_STALE_AFTER)
+    return ClientStatuses(*(value for value, _ in statuses.values()), stale)
 
+def sample_memory():
     # nvme_temp = getNvmeTemperature()
     # cpu_rpm = getCpuRpm()
+    return Memory(psutil.virtual_memory(), psutil.swap_memory())
 
-
-def low_frequency_tasks():
-    logging.debug("low_frequency_tasks()")
-    global disk
-    global disk_free_tb
-    global ip_local_address
-    global exec, node, cons
-
+def sample_disk():
     # ToDo: Check and set it at start for optimization.
     if os.path.exists("/mnt/storage/") and os.path.isdir("/mnt/storage/"):
-        disk = psutil.disk_usage("/mnt/storage/")
-    else:
-        disk = psutil.disk_usage("/home/")
-
-    disk_free_tb = disk.used / 1024 / 1024 / 1024 / 1024
-    ip_local_address = get_ip_address()
-    exec = influx_handler.get_exec_status()
-    node = influx_handler.get_node_status()
-    cons = influx_handler.get_cons_status()
-
-
-def value_to_hex_color_cpu_usage(value):
-    if not (0 <= value <= 100):
-        return C_BG
-
-    # Definition of Colors in RGB Format
-    green = (0, 255, 0)
-    yellow = (255, 255, 0)
-    red = (255, 0, 0)
-
-    if value <= 50:
-        # Interpolacja między zielonym a żółtym
-        ratio = value / 50
-        r = int(green[0] + ratio * (yellow[0] - green[0]))
-        g = int(green[1] + ratio * (yellow[1] - green[1]))
-        b = int(green[2] + ratio * (yellow[2] - green[2]))
-    else:
-        # Interpolacja między żółtym a czerwonym
-        ratio = (value - 50) / 50
-        r = int(yellow[0] + ratio * (red[0] - yellow[0]))
-        g = int(yellow[1] + ratio * (red[1] - yellow[1]))
-        b = int(yellow[2] + ratio * (red[2] - yellow[2]))
-
-    return f'#{r:02x}{g:02x}{b:02x}'
-
-def value_to_hex_color_cpu_usage_400(value):
-    if not (0 <= value <= 400):
-        return C_BG
-
-    # Definition of Colors in RGB Format
-    green = (0, 255, 0)
-    yellow = (255, 255, 0)
-    red = (255, 0, 0)
-
-    if value <= 200:
-        # Interpolacja między zielonym a żółtym
-        ratio = value / 200
-        r = int(green[0] + ratio * (yellow[0] - green[0]))
-        g = int(green[1] + ratio * (yellow[1] - green[1]))
-        b = int(green[2] + ratio * (yellow[2] - green[2]))
-    else:
-        # Interpolacja między żółtym a czerwonym
-        ratio = (value - 200) / 200
-        r = int(yellow[0] + ratio * (red[0] - yellow[0]))
-        g = int(yellow[1] + ratio * (red[1] - yellow[1]))
-        b = int(yellow[2] + ratio * (red[2] - yellow[2]))
-
-    return f'#{r:02x}{g:02x}{b:02x}'
-
-def get_hostname():
-    hostname = socket.gethostname()
-    return hostname
-
-def get_ip_address():
-    """
-    Get the local IP address, prioritizing Ethernet over WiFi.
-
-    Returns:
-        str: The local IP address or None if no IP address is found.
-    """
-    interfaces = ['eth0', 'wlan0']
-    for interface in interfaces:
-        try:
-            addresses = netifaces.ifaddresses(interface)
-            ip_info = addresses.get(netifaces.AF_INET)
-            if ip_info:
-                ip_address = ip_info[0]['addr']
-                if ip_address and not ip_address.startswith("127."):
-                    return ip_address
-        except ValueError:
-            continue
-    return None
+        return psutil.disk_usage("/mnt/storage/")
+    return psutil.disk_usage("/home/")
+
+
+def network_changed(address, name):
+    """Called by the AddressWatcher thread, the next snapshot shows the new address"""
+    global ip_local_address, hostname
+    renamed = name != hostname
+    ip_local_address, hostname = address, name
+    if renamed:
+        # The status and history queries filter on the host tag
+        if influx_handler is not None:
+            influx_handler.set_host(name)
+        if history is not None:
+            history.set_host(name)
 
 def is_raspberry_pi():
     """
@@ -114,6 +114,23 @@ class LCD_1inch69(lcdconfig.RaspberryPi):
 
         self.command(0x29)
 
+    def SleepIn(self):
+        """Enter sleep mode: DC/DC converter, oscillator and panel scanning stop"""
+        self.command(0x10)
+        time.sleep(0.005)
+
+    def SleepOut(self):
+        """Leave sleep mode, the controller needs 5 ms before accepting the next command"""
+        self.command(0x11)
+        time.sleep(0.005)
+
+    def IdleMode(self, on):
+        """Idle mode limits the panel to 8 colors (MSB of each channel) to save power"""
+        self.command(0x39 if on else 0x38)
+
+    def DisplayOn(self, on):
+        self.command(0x29 if on else 0x28)
+
     def SetWindows(self, Xstart, Ystart, Xend, Yend, horizontal=0):
         if horizontal:
             # set the X coordinates
@@ -181,6 +198,19 @@ class LCD_1inch69(lcdconfig.RaspberryPi):
         for i in range(0, len(pix), 4096):
             self.spi_writebyte(pix[i: i + 4096])
 
+    def ShowBuffer(self, buf, Ystart=0, Yend=None):
+        """
+        Write a prepared (height, width) big-endian RGB565 array to the display.
+        Only rows [Ystart, Yend) are sent when a row range is given.
+        """
+        if Yend is None:
+            Yend = self.height
+        self.command(0x36)
+        self.data(0x00)
+        self.SetWindows(0, Ystart, self.width, Yend, 0)
+        self.digital_write(self.DC_PIN, True)
+        self.spi_writebuffer(buf[Ystart:Yend].view(self.np.uint8))
+
     def clear(self):
         """Clear contents of image buffer"""
         _buffer = [0xff] * (self.width * self.height * 2)
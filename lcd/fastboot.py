@@ -0,0 +1,172 @@
+"""
+Fast boot path: puts the last saved frame on the panel before the application has loaded.
+
+Imported at the very top of hwmonitor.py, so it must stay light: only the
+display driver (numpy, spidev, gpiozero) is loaded here. PIL is imported only
+when a frame is saved, by the fully started application.
+"""
+
+import os
+import threading
+import numpy as np
+
+PATH = '/var/tmp/w3p_hwm_frame.rgb565'
+MAGIC = b'W3PF'
+HEADER_SIZE = 8  # magic, width (uint16 BE), height (uint16 BE)
+
+# Seconds from process start until the saved frame was on the panel, None if it was not shown
+first_pixels = None
+# Why a saved frame could not be shown, logged by the application once logging is set up
+error = None
+
+
+def process_age():
+    """Seconds since this process was started, from /proc (psutil is not imported yet)"""
+    try:
+        with open('/proc/self/stat') as f:
+            start_ticks = int(f.read().rsplit(')', 1)[1].split()[19])
+        with open('/proc/uptime') as f:
+            uptime = float(f.read().split()[0])
+        return uptime - start_ticks / os.sysconf('SC_CLK_TCK')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def load_frame(path, width, height):
+    """
+    Returns:
+        numpy.ndarray: (height, width) big-endian RGB565 frame, None if missing or not matching the panel.
+    """
+    try:
+        data = np.fromfile(path, dtype=np.uint8)
+    except OSError:
+        return None
+    if len(data) != HEADER_SIZE + width * height * 2 or data[:4].tobytes() != MAGIC:
+        return None
+    if int.from_bytes(data[4:6].tobytes(), 'big') != width or int.from_bytes(data[6:8].tobytes(), 'big') != height:
+        return None
+    return data[HEADER_SIZE:].view('>u2').reshape(height, width)
+
+
+def show_saved_frame(path=PATH, brightness=100, display=None, config=None):
+    """
+    Initializes the panel and streams the saved frame to it.
+
+    Args:
+        display (type): Display class, lcd.LCD_1inch69.LCD_1inch69 if None.
+        config (dict): PANELS entry of the panel (bus, device, rst, dc, bl), the driver's defaults if None.
+
+    Returns:
+        LCD_1inch69: The initialized display showing the frame, to be reused by the
+            application (without clearing it), None if there was no usable frame.
+    """
+    global first_pixels, error
+    if display is None:
+        from lcd.LCD_1inch69 import LCD_1inch69 as display
+
+    frame = load_frame(path, display.width, display.height)
+    if frame is None:
+        return None
+    disp = None
+    try:
+        disp = display(**{key: value for key, value in (config or {}).items() if key != 'pages'})
+        disp.Init()
+        disp.ShowBuffer(frame)
+        disp.bl_DutyCycle(brightness)
+    except Exception as e:
+        error = e
+        if disp is not None:
+            # The application opens the panel again, the pins and the SPI device must be free
+            try:
+                release(disp)
+            except Exception:
+                pass
+        return None
+    first_pixels = process_age()
+    return disp
+
+
+def release(disp):
+    """Frees the pins and the SPI device, e.g. for a render process that opens the panel itself"""
+    disp.module_exit()
+    disp.RST_PIN.close()
+    disp.DC_PIN.close()
+
+
+def save_frame(rgb565, path=PATH, dim=0.4, label='STARTING...'):
+    """
+    Atomically writes `rgb565` as the next boot frame, dimmed and labelled as stale.
+
+    The frame is written to a temporary file in the same directory, synced and
+    renamed over `path`, the directory is synced after the rename, so a power
+    cut leaves either the old or the new frame.
+    """
+    from PIL import ImageDraw, ImageEnhance, ImageFont
+    from ui.dashboard import FONT_PATH
+    from ui.framebuffer import pack_rgb565, unpack_rgb565
+
+    height, width = rgb565.shape
+    image = ImageEnhance.Brightness(unpack_rgb565(rgb565)).enhance(dim)
+    draw = ImageDraw.Draw(image)
+    draw.rectangle([(0, height - 28), (width, height)], fill=(0, 0, 0))
+    draw.text((width // 2, height - 14), label, fill=(161, 161, 161), font=ImageFont.truetype(FONT_PATH, 18),
+              anchor="mm")
+
+    rgb = np.asarray(image)
+    out = np.zeros((height, width), dtype='>u2')
+    pack_rgb565(rgb, out, np.zeros((height, width), dtype=np.uint16), np.zeros((height, width), dtype=np.uint16))
+
+    temporary = f'{path}.tmp'
+    with open(temporary, 'wb') as f:
+        f.write(MAGIC + width.to_bytes(2, 'big') + height.to_bytes(2, 'big'))
+        f.write(out.tobytes())
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, path)
+    directory = os.open(os.path.dirname(path) or '.', os.O_RDONLY)
+    try:
+        os.fsync(directory)
+    finally:
+        os.close(directory)
+
+
+class FrameSaver:
+    """
+    Saves boot frames in a background thread, the render loop only hands over a copy.
+
+    Dimming, labelling and the synced write take tens of milliseconds on a Pi
+    and longer on a busy SD card. A newer frame submitted while one is written
+    replaces the pending one. save() writes synchronously (at shutdown), one
+    write at a time.
+    """
+
+    def __init__(self, path=PATH):
+        self.path = path
+        self.pending = None
+        self.lock = threading.Lock()
+        self.event = threading.Event()
+        self.thread = threading.Thread(target=self.run, name='boot-frame', daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def submit(self, rgb565):
+        self.pending = rgb565.copy()
+        self.event.set()
+
+    def save(self, rgb565):
+        with self.lock:
+            save_frame(rgb565, self.path)
+
+    def run(self):
+        import logging
+        while True:
+            self.event.wait()
+            self.event.clear()
+            rgb565, self.pending = self.pending, None
+            if rgb565 is None:
+                continue
+            try:
+                self.save(rgb565)
+            except OSError as e:
+                logging.error(f"Boot frame: Cannot save {self.path}: {e}")
@@ -36,8 +36,8 @@ from gpiozero.pins.lgpio import LGPIOFactory
 factory = LGPIOFactory()
 
 class RaspberryPi:
-    def __init__(self, spi=spidev.SpiDev(0, 0), spi_freq=40000000, rst=27, dc=25, bl=18, bl_freq=1000, i2c=None,
-                 i2c_freq=100000):
+    def __init__(self, spi=None, spi_freq=40000000, rst=27, dc=25, bl=18, bl_freq=1000, i2c=None,
+                 i2c_freq=100000, bus=0, device=0):
         self.np = np
         self.INPUT = False
         self.OUTPUT = True
@@ -50,8 +50,8 @@ class RaspberryPi:
         self.BL_PIN = self.gpio_pwm(bl)
         self.bl_DutyCycle(0)
 
-        # Initialize SPI
-        self.SPI = spi
+        # Initialize SPI, every display opens its own device (bus, chip select) unless one is passed in
+        self.SPI = spi if spi is not None else spidev.SpiDev(bus, device)
         if self.SPI != None:
             self.SPI.max_speed_hz = spi_freq
             self.SPI.mode = 0b00
@@ -81,6 +81,11 @@ class RaspberryPi:
         if self.SPI != None:
             self.SPI.writebytes(data)
 
+    def spi_writebuffer(self, data):
+        """Write any buffer-protocol object (bytes, numpy array) without building a list"""
+        if self.SPI != None:
+            self.SPI.writebytes2(data)
+
     def bl_DutyCycle(self, duty):
         self.BL_PIN.value = duty / 100
 
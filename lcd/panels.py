@@ -0,0 +1,152 @@
+import logging
+import threading
+import numpy as np
+from lcd.power import PowerManager, ACTIVE
+from ui.framestats import FrameStats
+
+# Backlight calls only change a PWM pin, they do not wait for frame transfers
+UNSYNCHRONIZED = {'bl_DutyCycle', 'bl_Frequency'}
+
+
+class ThreadedDisplay:
+    """
+    A display whose frame transfers run in a transmitter thread of its own.
+
+    ShowBuffer() copies the rows to send and returns at once. The transmitter
+    sends them with spidev, which releases the GIL while transmitting, so the
+    render loop composes the next frame while the panel is being written and
+    the transfers to several panels overlap. A frame submitted while the
+    previous one is still pending replaces it (the row ranges are merged), so
+    the panel always ends up showing the newest frame.
+
+    Every other call (Init, ShowImage, SleepIn, ...) waits until the submitted
+    frames are on the panel and then runs in the calling thread; the backlight
+    calls run immediately.
+
+    Args:
+        disp (lcd.LCD_1inch69.LCD_1inch69): The display to drive.
+        name (str): Used for the thread, the logs and the frame statistics.
+        log_every (int): Frames between the logged transfer statistics, 0 = never.
+    """
+
+    def __init__(self, disp, name='Panel', log_every=600):
+        self.disp = disp
+        self.name = name
+        self.log_every = log_every
+        self.pending = np.zeros((disp.height, disp.width), dtype='>u2')
+        self.sending = np.zeros((disp.height, disp.width), dtype='>u2')
+        self.rows = None  # (Ystart, Yend) of the pending frame, None = nothing to send
+        self.busy = False
+        self.condition = threading.Condition()
+        self.lock = threading.Lock()  # one transfer or command on the panel at a time
+        self.stats = FrameStats(f'{name} transfers', 0.1)
+        self.sent = 0
+        self.replaced = 0
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.run, name=f'spi-{name.lower().replace(" ", "")}', daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        """Sends the pending frame, then ends the transmitter"""
+        self.flush()
+        with self.condition:
+            self.stop_event.set()
+            self.condition.notify_all()
+
+    def ShowBuffer(self, buf, Ystart=0, Yend=None):
+        """Queues rows [Ystart, Yend) of a (height, width) big-endian RGB565 array, `buf` is copied"""
+        if Yend is None:
+            Yend = self.disp.height
+        with self.condition:
+            self.pending[Ystart:Yend] = buf[Ystart:Yend]
+            if self.rows is not None:
+                self.replaced += 1
+                Ystart, Yend = min(Ystart, self.rows[0]), max(Yend, self.rows[1])
+            self.rows = (Ystart, Yend)
+            self.condition.notify_all()
+
+    def flush(self):
+        """Waits until the submitted frames are on the panel"""
+        with self.condition:
+            while (self.rows is not None or self.busy) and self.thread.is_alive():
+                self.condition.wait(0.1)
+
+    def __getattr__(self, name):
+        if name == 'disp':
+            raise AttributeError(name)
+        attribute = getattr(self.disp, name)
+        if not callable(attribute) or name in UNSYNCHRONIZED:
+            return attribute
+
+        def call(*args, **kwargs):
+            self.flush()
+            with self.lock:
+                return attribute(*args, **kwargs)
+        return call
+
+    def run(self):
+        while True:
+            with self.condition:
+                while self.rows is None and not self.stop_event.is_set():
+                    self.condition.wait()
+                if self.rows is None:
+                    return
+                start, end = self.rows
+                self.sending[start:end] = self.pending[start:end]
+                self.rows = None
+                self.busy = True
+            try:
+                with self.lock:
+                    self.disp.ShowBuffer(self.sending, start, end)
+                self.stats.tick()
+                self.sent += 1
+            except Exception as e:
+                logging.error(f"{self.name}: Transfer failed: {e}")
+            finally:
+                with self.condition:
+                    self.busy = False
+                    self.condition.notify_all()
+            if self.log_every and self.sent and self.sent % self.log_every == 0:
+                self.stats.log()
+                logging.info(f"{self.name}: {self.sent} frames sent, {self.replaced} replaced before sending")
+
+
+class Panel:
+    """
+    One display with its transmitter thread and optional power management.
+
+    Args:
+        disp (lcd.LCD_1inch69.LCD_1inch69): An initialized display.
+        name (str): e.g. 'Panel 1', used in the logs.
+        power_config (dict): PowerManager arguments, None = always on.
+    """
+
+    def __init__(self, disp, name, power_config=None, frame_interval=0.1):
+        self.name = name
+        self.disp = ThreadedDisplay(disp, name)
+        self.disp.start()
+        self.power = PowerManager(self.disp, frame_interval=frame_interval, **power_config) if power_config else None
+        self.last = None
+
+    def show(self, pool, content_key):
+        """
+        Sends the frame of `pool` honouring the power state. Call it every frame,
+        with `pool` None while the frame is unchanged, so dimming progresses.
+        """
+        if pool is not None:
+            self.last = pool
+        if self.power is None:
+            if pool is not None:
+                self.disp.ShowBuffer(pool.convert())
+            return
+        if pool is None:
+            state = self.power.state
+            self.power.content(content_key)
+            self.power.update()
+            if state == ACTIVE or self.power.state != ACTIVE or self.last is None:
+                return
+            # Woken up: the rows skipped while idle are sent again
+            pool = self.last
+        self.power.present(pool, content_key)
@@ -0,0 +1,206 @@
+import time
+import logging
+
+# Power states, from full brightness to panel asleep
+ACTIVE = 'active'
+DIMMED = 'dimmed'
+IDLE = 'idle'
+SLEEP = 'sleep'
+
+SLPOUT_AFTER_SLPIN = 0.12  # Seconds the ST7789 needs after sleep-in before it accepts sleep-out
+
+
+class PowerManager:
+    """
+    Drives the ST7789 power features from screen activity.
+
+    The dashboard reports a "content key" every frame - a tuple of the values an
+    operator actually cares about (client statuses, install stage, IP, alarms).
+    When the key stops changing the panel walks down the ladder:
+
+        ACTIVE -> DIMMED  backlight faded to `dim_brightness`
+        DIMMED -> IDLE    idle mode (0x39, 8 colors), the whole frame stays shown
+                          from the panel's memory, only the animated strip is sent
+        IDLE   -> SLEEP   sleep-in (0x10), backlight off, nothing is sent
+
+    Any change of the key, or leaving a scheduled off window, wakes the panel
+    back to ACTIVE. Scheduled off windows force SLEEP regardless of activity.
+    A wake within 120 ms of sleep-in does not block the frame: sleep-out is
+    sent by the first update() after the controller accepts it.
+    """
+
+    def __init__(self, disp, frame_interval=0.1, dim_after=120, idle_after=600, sleep_after=1800,
+                 brightness=100, dim_brightness=30, idle_brightness=10, fade_step=5,
+                 strip=(262, 280), schedule=None):
+        self.disp = disp
+        self.frame_interval = frame_interval
+        self.dim_after = dim_after
+        self.idle_after = idle_after
+        self.sleep_after = sleep_after
+        self.brightness = brightness
+        self.dim_brightness = dim_brightness
+        self.idle_brightness = idle_brightness
+        self.fade_step = fade_step
+        self.strip = strip
+        self.schedule = [(self._parse_hhmm(start), self._parse_hhmm(end)) for start, end in (schedule or [])]
+
+        self.state = ACTIVE
+        self.content_key = None
+        self.last_change = time.monotonic()
+        self.slept_at = 0
+        self.wake_pending = False  # woken from SLEEP before SLPOUT_AFTER_SLPIN, update() finishes it
+        self.scheduled_sleep = False
+        self.duty = brightness
+        self.target_duty = brightness
+        self.wake_latency = 0
+        self.wake_latency_max = 0
+        self.wakes = 0
+
+        self.disp.bl_DutyCycle(self.duty)
+
+    @staticmethod
+    def _parse_hhmm(value):
+        hours, minutes = value.split(':')
+        return int(hours) * 60 + int(minutes)
+
+    def in_off_window(self, now=None):
+        """True if the local time falls into one of the scheduled off windows"""
+        if not self.schedule:
+            return False
+        t = time.localtime(now)
+        minute = t.tm_hour * 60 + t.tm_min
+        for start, end in self.schedule:
+            if start <= end:
+                if start <= minute < end:
+                    return True
+            elif minute >= start or minute < end:  # window wraps around midnight
+                return True
+        return False
+
+    def content(self, key):
+        """Report the current content key, any change counts as activity"""
+        if key != self.content_key:
+            self.content_key = key
+            self.last_change = time.monotonic()
+            if self.state != ACTIVE and not self.in_off_window():
+                self.wake()
+
+    def update(self):
+        """Advance the state machine and the backlight fade, call once per frame"""
+        now = time.monotonic()
+        quiet = now - self.last_change
+
+        if self.in_off_window():
+            if self.state != SLEEP:
+                self._enter_sleep()
+            self.scheduled_sleep = True
+            self.wake_pending = False
+        elif self.wake_pending:
+            if now - self.slept_at >= SLPOUT_AFTER_SLPIN:
+                self.wake()
+        elif self.state == SLEEP and self.scheduled_sleep:
+            # Off window is over
+            self.last_change = now
+            self.wake()
+        elif self.state == ACTIVE and quiet >= self.dim_after:
+            self._enter_dimmed()
+        elif self.state == DIMMED and quiet >= self.idle_after:
+            self._enter_idle()
+        elif self.state == IDLE and quiet >= self.sleep_after:
+            self._enter_sleep()
+
+        self._fade()
+        return self.state
+
+    def rows(self):
+        """
+        Rows of the frame that have to be transmitted in the current state.
+
+        Returns:
+            tuple: (Ystart, Yend) or None if nothing should be sent.
+        """
+        if self.state == SLEEP:
+            return None
+        if self.state == IDLE:
+            return self.strip
+        return 0, self.disp.height
+
+    def present(self, frames, content_key):
+        """
+        Reports the content key and sends the rows the current state needs.
+
+        Args:
+            frames (ui.framebuffer.FramePool): Pool holding the composed frame, converted only if sent.
+            content_key (tuple): Values an operator cares about, a change wakes the panel.
+        """
+        self.content(content_key)
+        self.update()
+        rows = self.rows()
+        if rows is not None:
+            self.disp.ShowBuffer(frames.convert(), *rows)
+
+    def wake(self, wait=False):
+        """
+        Return to ACTIVE from any state, the time spent is kept as wake latency.
+
+        Args:
+            wait (bool): Within 120 ms of sleep-in, wait for the controller instead of leaving
+                the wake to the next update(). For drawing outside of the frame loop.
+        """
+        start = time.perf_counter()
+        if self.state == SLEEP:
+            # SLPOUT must not follow SLPIN within 120 ms
+            remaining = SLPOUT_AFTER_SLPIN - (time.monotonic() - self.slept_at)
+            if remaining > 0:
+                if not wait:
+                    self.wake_pending = True
+                    return
+                time.sleep(remaining)
+            self.disp.SleepOut()
+            self.disp.DisplayOn(True)
+        if self.state in (IDLE, SLEEP):
+            self.disp.IdleMode(False)
+        self.wake_pending = False
+        self.duty = self.target_duty = self.brightness
+        self.disp.bl_DutyCycle(self.duty)
+        previous = self.state
+        self.state = ACTIVE
+        self.scheduled_sleep = False
+
+        self.wake_latency = time.perf_counter() - start
+        self.wake_latency_max = max(self.wake_latency_max, self.wake_latency)
+        self.wakes += 1
+        logging.info(f"Power: {previous} -> {ACTIVE}, wake latency {self.wake_latency * 1000:.1f} ms")
+        if self.wake_latency > self.frame_interval:
+            logging.warning(f"Power: wake latency {self.wake_latency * 1000:.1f} ms exceeds one frame "
+                            f"({self.frame_interval * 1000:.0f} ms)")
+
+    def _enter_dimmed(self):
+        logging.info(f"Power: {self.state} -> {DIMMED}")
+        self.state = DIMMED
+        self.target_duty = self.dim_brightness
+
+    def _enter_idle(self):
+        logging.info(f"Power: {self.state} -> {IDLE}")
+        # No partial mode (0x12): it blanks the rows outside the partial area, the strip rows are sent instead
+        self.disp.IdleMode(True)
+        self.state = IDLE
+        self.target_duty = self.idle_brightness
+
+    def _enter_sleep(self):
+        logging.info(f"Power: {self.state} -> {SLEEP}")
+        self.duty = self.target_duty = 0
+        self.disp.bl_DutyCycle(0)
+        self.disp.DisplayOn(False)
+        self.disp.SleepIn()
+        self.slept_at = time.monotonic()
+        self.state = SLEEP
+
+    def _fade(self):
+        if self.duty == self.target_duty:
+            return
+        if self.duty > self.target_duty:
+            self.duty = max(self.target_duty, self.duty - self.fade_step)
+        else:
+            self.duty = min(self.target_duty, self.duty + self.fade_step)
+        self.disp.bl_DutyCycle(self.duty)
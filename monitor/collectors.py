@@ -0,0 +1,176 @@
+import time
+import queue
+import logging
+import threading
+from collections import namedtuple
+
+# Result of a successful run: the value collect() returned, the time.monotonic() it was
+# collected and the seconds the run took. Replaced as a whole, readers never see a partial update.
+Reading = namedtuple('Reading', ['value', 'time', 'seconds'])
+
+
+class Collector:
+    """
+    One metric sampled by a CollectorPool.
+
+    Either subclass it and override collect(), or pass the sampling function.
+    collect() runs in a pool worker and must return a value that is not
+    modified afterwards (a number, a namedtuple such as psutil's), it is
+    handed to the readers as it is.
+
+    Args:
+        name (str): Key of the reading, e.g. 'disk'.
+        function (callable): Takes no arguments and returns the value, unless collect() is overridden.
+        interval (float): Seconds between the starts of two runs, stretched by the pool's scale.
+        timeout (float): Seconds after which a run counts as timed out. A Python call cannot be
+            interrupted: the run occupies its worker until it returns, the collector is not started
+            again meanwhile and its last reading keeps ageing.
+    """
+
+    def __init__(self, name, function=None, interval=1, timeout=1):
+        self.name = name
+        self.function = function
+        self.interval = interval
+        self.timeout = timeout
+        self.reading = None
+        self.started = None  # time.monotonic() of the run in flight, None while idle
+        self.overdue = False  # The run in flight exceeded the timeout, set by the scheduler
+        self.runs = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.seconds = 0.0  # Total runtime, for the cost per run
+        self.worst = 0.0
+        self.error = None
+
+    def collect(self):
+        return self.function()
+
+    def stats(self):
+        """
+        Returns:
+            dict: runs, failures, timeouts, mean and worst runtime in ms, age of the reading in seconds.
+        """
+        age = None if self.reading is None else time.monotonic() - self.reading.time
+        return {'runs': self.runs, 'failures': self.failures, 'timeouts': self.timeouts,
+                'mean': self.seconds / self.runs * 1000 if self.runs else 0.0, 'worst': self.worst * 1000,
+                'age': age}
+
+
+class CollectorPool:
+    """
+    Runs collectors in a few worker threads, each at its own interval.
+
+    A scheduler thread hands every due collector to the workers, at most one
+    run per collector at a time. The render loop never calls a collector, it
+    reads the published readings (value()), so a slow or hung collector - a
+    disk_usage() on a dead mount - only delays its own metric. A run over its
+    timeout is counted and logged, its worker stays busy until the call
+    returns, the other workers keep the remaining collectors going.
+
+    Args:
+        collectors (list): Collector objects, names must be unique.
+        workers (int): Worker threads.
+        scale (callable): Returns the factor the intervals are stretched by (the governor's sample_scale).
+        log_every (float): Seconds between the logged cost statistics, 0 = never.
+    """
+
+    def __init__(self, collectors, workers=3, scale=None, log_every=600):
+        self.collectors = {collector.name: collector for collector in collectors}
+        self.scale = scale if scale is not None else lambda: 1
+        self.log_every = log_every
+        self.due = {name: 0 for name in self.collectors}
+        self.queue = queue.SimpleQueue()
+        self.wakeup = threading.Event()  # set when a run ends, the scheduler may start an overdue collector again
+        self.stop_event = threading.Event()
+        self.workers = [threading.Thread(target=self.work, name=f'collector{index}', daemon=True)
+                        for index in range(workers)]
+        self.thread = threading.Thread(target=self.run, name='collectors', daemon=True)
+
+    def start(self):
+        for worker in self.workers:
+            worker.start()
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        self.wakeup.set()
+        for _ in self.workers:
+            self.queue.put(None)
+
+    def value(self, name, default=None):
+        """Latest value collected by `name`, `default` before its first successful run"""
+        reading = self.collectors[name].reading
+        return default if reading is None else reading.value
+
+    def wait(self, timeout):
+        """Waits until every collector has a reading, at most `timeout` seconds; returns whether they all do"""
+        end = time.monotonic() + timeout
+        while any(collector.reading is None for collector in self.collectors.values()):
+            if time.monotonic() >= end:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def run(self):
+        next_log = time.monotonic() + self.log_every
+        while not self.stop_event.is_set():
+            self.wakeup.clear()
+            now = time.monotonic()
+            wake = now + 1
+            for name, collector in self.collectors.items():
+                if collector.started is not None:
+                    if not collector.overdue:
+                        if now - collector.started > collector.timeout:
+                            collector.overdue = True
+                            collector.timeouts += 1
+                            logging.warning(f"Collectors: {name} has not returned after {collector.timeout} s, "
+                                            f"keeping its reading from before")
+                        else:
+                            wake = min(wake, collector.started + collector.timeout)
+                    continue
+                if now >= self.due[name]:
+                    collector.overdue = False
+                    collector.started = now
+                    self.due[name] = now + collector.interval * self.scale()
+                    self.queue.put(collector)
+                wake = min(wake, self.due[name])
+            if self.log_every and now >= next_log:
+                next_log = now + self.log_every
+                self.log()
+            self.wakeup.wait(max(0, wake - time.monotonic()))
+
+    def work(self):
+        while True:
+            collector = self.queue.get()
+            if collector is None:
+                return
+            start = time.perf_counter()
+            try:
+                value = collector.collect()
+                seconds = time.perf_counter() - start
+                collector.reading = Reading(value, time.monotonic(), seconds)
+                if collector.error is not None:
+                    logging.info(f"Collectors: {collector.name} works again")
+                collector.error = None
+            except Exception as e:
+                seconds = time.perf_counter() - start
+                collector.failures += 1
+                if collector.error is None:
+                    logging.error(f"Collectors: {collector.name} failed: {e}")
+                collector.error = e
+            collector.runs += 1
+            collector.seconds += seconds
+            collector.worst = max(collector.worst, seconds)
+            if collector.overdue:
+                logging.info(f"Collectors: {collector.name} returned after {seconds:.1f} s")
+            collector.started = None
+            self.wakeup.set()
+
+    def log(self):
+        parts = []
+        for name, collector in self.collectors.items():
+            s = collector.stats()
+            parts.append(f"{name} {s['runs']} runs {s['mean']:.2f}/{s['worst']:.1f} ms"
+                         + (f" {s['timeouts']} timeouts" if s['timeouts'] else '')
+                         + (f" {s['failures']} failures" if s['failures'] else ''))
+        logging.info(f"Collectors: {', '.join(parts)} (mean/worst runtime)")
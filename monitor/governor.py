@@ -0,0 +1,202 @@
+import os
+import time
+import logging
+
+# Raspberry Pi firmware throttling flags (same value as `vcgencmd get_throttled`)
+THROTTLED_PATH = '/sys/devices/platform/soc/soc:firmware/get_throttled'
+UNDER_VOLTAGE = 0x1
+FREQ_CAPPED = 0x2
+THROTTLED = 0x4
+SOFT_TEMP_LIMIT = 0x8
+
+# Fidelity levels, best first: (name, frames per second, animation, sampling interval multiplier)
+LEVELS = (
+    ('full', 10, True, 1),
+    ('reduced', 5, True, 2),
+    ('minimal', 1, False, 4),
+)
+
+
+def read_throttled(path=THROTTLED_PATH):
+    """
+    Returns:
+        int: Current firmware throttling flags, None if the kernel does not expose them.
+    """
+    try:
+        with open(path) as f:
+            return int(f.read().strip(), 16)
+    except (OSError, ValueError):
+        return None
+
+
+class Governor:
+    """
+    Keeps the dashboard's own CPU use within a budget and backs off when the node needs the CPU.
+
+    update() is called once per sampling round with the values the monitor
+    already collects. The governor drops to
+
+        the lowest level      at temp_critical or when the firmware caps the frequency
+        at least the second   when the CPU is hot (temp_high), soft throttled,
+                              under-voltage or the whole system is busy (busy %)
+        one level lower       while the dashboard process itself uses more
+                              than cpu_budget % of one core
+
+    It steps back up one level at a time once everything has been healthy for
+    `recover_after` seconds (with `hysteresis` degrees / percent of margin) and
+    the projected own CPU use at the higher frame rate still fits the budget.
+
+    Counters: level changes and their reasons, seconds spent per level.
+    """
+
+    def __init__(self, cpu_budget=10, temp_high=75, temp_critical=80, busy=90, hysteresis=5, recover_after=60,
+                 levels=LEVELS, throttled_path=THROTTLED_PATH, settle=10, report_every=600):
+        self.cpu_budget = cpu_budget
+        self.temp_high = temp_high
+        self.temp_critical = temp_critical
+        self.busy = busy
+        self.hysteresis = hysteresis
+        self.recover_after = recover_after
+        self.levels = levels
+        self.throttled_path = throttled_path
+        self.settle = settle  # Seconds for the own CPU average to follow a level change
+        self.report_every = report_every
+
+        self.level = 0
+        self.own_cpu = 0.0
+        self.throttled = None
+        self.healthy_since = None
+        now = time.monotonic()
+        self.last_update = now
+        self.last_cpu_time = time.process_time()
+        self.last_report = now
+        self.changed_at = now
+        self.counters = {
+            'steps_down': 0,
+            'steps_up': 0,
+            'temperature': 0,
+            'throttled': 0,
+            'busy': 0,
+            'budget': 0,
+            'seconds': {name: 0.0 for name, _, _, _ in levels},
+        }
+
+    @property
+    def name(self):
+        return self.levels[self.level][0]
+
+    @property
+    def fps(self):
+        return self.levels[self.level][1]
+
+    @property
+    def frame_interval(self):
+        return 1 / self.fps
+
+    @property
+    def animate(self):
+        return self.levels[self.level][2]
+
+    @property
+    def sample_scale(self):
+        return self.levels[self.level][3]
+
+    def _measure_own_cpu(self, now):
+        """Smoothed CPU use of this process (all threads) in % of one core"""
+        cpu_time = time.process_time()
+        elapsed = now - self.last_update
+        if elapsed > 0:
+            usage = (cpu_time - self.last_cpu_time) / elapsed * 100
+            self.own_cpu += 0.3 * (usage - self.own_cpu)
+        self.last_cpu_time = cpu_time
+        self.counters['seconds'][self.name] += elapsed
+        self.last_update = now
+
+    def update(self, cpu_percent, cpu_temp, now=None):
+        """
+        Args:
+            cpu_percent (float): Total CPU usage of the system, 0 - 100.
+            cpu_temp (float): CPU temperature in degrees Celsius.
+
+        Returns:
+            bool: True if the fidelity level changed.
+        """
+        if now is None:
+            now = time.monotonic()
+        self._measure_own_cpu(now)
+        self.throttled = read_throttled(self.throttled_path)
+        flags = self.throttled or 0
+
+        # Reasons to step down, most severe first
+        if cpu_temp >= self.temp_critical or flags & (FREQ_CAPPED | THROTTLED):
+            reason = 'throttled' if flags & (FREQ_CAPPED | THROTTLED) else 'temperature'
+            changed = self._set_level(len(self.levels) - 1, reason, cpu_percent, cpu_temp)
+        elif cpu_temp >= self.temp_high or flags & (SOFT_TEMP_LIMIT | UNDER_VOLTAGE):
+            reason = 'throttled' if flags & (SOFT_TEMP_LIMIT | UNDER_VOLTAGE) else 'temperature'
+            changed = self._set_level(max(self.level, 1), reason, cpu_percent, cpu_temp)
+        elif cpu_percent >= self.busy:
+            changed = self._set_level(max(self.level, 1), 'busy', cpu_percent, cpu_temp)
+        elif self.own_cpu > self.cpu_budget and now - self.changed_at >= self.settle:
+            changed = self._set_level(self.level + 1, 'budget', cpu_percent, cpu_temp)
+        else:
+            changed = self._recover(now, cpu_percent, cpu_temp)
+
+        if now - self.last_report >= self.report_every:
+            self.last_report = now
+            self.log()
+        return changed
+
+    def _recover(self, now, cpu_percent, cpu_temp):
+        if self.level == 0:
+            return False
+        margin_ok = cpu_temp < self.temp_high - self.hysteresis and cpu_percent < self.busy - self.hysteresis
+        if not margin_ok:
+            self.healthy_since = None
+            return False
+        if self.healthy_since is None:
+            self.healthy_since = now
+            return False
+        if now - self.healthy_since < self.recover_after:
+            return False
+        # Own CPU use grows roughly with the frame rate
+        projected = self.own_cpu * self.levels[self.level - 1][1] / self.fps
+        if projected > self.cpu_budget * 0.8:
+            return False
+        return self._set_level(self.level - 1, 'recovered', cpu_percent, cpu_temp)
+
+    def _set_level(self, level, reason, cpu_percent, cpu_temp):
+        level = min(level, len(self.levels) - 1)
+        if level == self.level:
+            return False
+        previous = self.name
+        if level > self.level:
+            self.counters['steps_down'] += 1
+            self.counters[reason] += 1
+        else:
+            self.counters['steps_up'] += 1
+        self.level = level
+        # Every change restarts the healthy period needed for the next step up
+        self.healthy_since = None
+        self.changed_at = self.last_update
+        logging.info(f"Governor: {previous} -> {self.name} ({reason}: CPU {cpu_percent:.0f}%, {cpu_temp:.0f}°C, "
+                     f"own {self.own_cpu:.1f}% of {self.cpu_budget}% budget, throttled {self._flags()}), "
+                     f"{self.fps} FPS, animation {'on' if self.animate else 'off'}, "
+                     f"sampling x{self.sample_scale}")
+        return True
+
+    def _flags(self):
+        return 'n/a' if self.throttled is None else hex(self.throttled)
+
+    def log(self):
+        c = self.counters
+        seconds = ', '.join(f"{name} {value:.0f}s" for name, value in c['seconds'].items())
+        logging.info(f"Governor: level {self.name}, own CPU {self.own_cpu:.1f}%, steps down {c['steps_down']} "
+                     f"(temperature {c['temperature']}, throttled {c['throttled']}, busy {c['busy']}, "
+                     f"budget {c['budget']}), steps up {c['steps_up']}, time per level: {seconds}")
+
+
+def normalized_cpu_percent(cpu_percent, per_core):
+    """Total CPU usage in 0 - 100 %, also when the dashboard shows the per-core sum (0 - 400 %)"""
+    if per_core:
+        return cpu_percent / (os.cpu_count() or 1)
+    return cpu_percent
@@ -0,0 +1,91 @@
+import time
+import logging
+import threading
+from collections import namedtuple
+import psutil
+
+# per_core in % per core, throughputs in bytes per second
+LoadSample = namedtuple('LoadSample', ['per_core', 'disk_read', 'disk_write', 'net_recv', 'net_sent', 'version'])
+
+
+class LoadSampler:
+    """
+    Per-core CPU load and disk / network throughput, sampled in a background thread.
+
+    Everything is computed from the counter deltas of two consecutive samples
+    (psutil.cpu_times, disk_io_counters, net_io_counters), the first sample
+    after start or resume() is only a baseline.
+
+    Args:
+        interval (float): Seconds between samples.
+    """
+
+    def __init__(self, interval=1):
+        self.interval = interval
+        self.sample = None
+        self.active = threading.Event()
+        self.active.set()
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.run, name='load', daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        self.active.set()
+
+    def pause(self):
+        """Stops sampling until resume(), while the load page is not on screen or next"""
+        self.active.clear()
+
+    def resume(self):
+        self.active.set()
+
+    def get(self):
+        """
+        Returns:
+            LoadSample: The latest sample, None before the second reading.
+        """
+        return self.sample
+
+    @staticmethod
+    def read():
+        return time.monotonic(), psutil.cpu_times(percpu=True), psutil.disk_io_counters(), psutil.net_io_counters()
+
+    def run(self):
+        previous = None
+        while not self.stop_event.is_set():
+            if not self.active.is_set():
+                previous = None
+                self.active.wait()
+                continue
+            try:
+                current = self.read()
+                if previous is not None:
+                    self.publish(previous, current)
+                previous = current
+            except Exception as e:
+                logging.error(f"Load: Sampling failed: {e}")
+            self.stop_event.wait(self.interval)
+
+    def publish(self, previous, current):
+        elapsed = current[0] - previous[0]
+        if elapsed <= 0:
+            return
+        per_core = []
+        for before, after in zip(previous[1], current[1]):
+            total = sum(after) - sum(before)
+            idle = (after.idle + getattr(after, 'iowait', 0)) - (before.idle + getattr(before, 'iowait', 0))
+            per_core.append(100 * (total - idle) / total if total > 0 else 0.0)
+
+        def rate(before, after, field):
+            if before is None or after is None:
+                return 0.0
+            return max(0, getattr(after, field) - getattr(before, field)) / elapsed
+
+        version = self.sample.version + 1 if self.sample else 1
+        self.sample = LoadSample(tuple(per_core), rate(previous[2], current[2], 'read_bytes'),
+                                 rate(previous[2], current[2], 'write_bytes'),
+                                 rate(previous[3], current[3], 'bytes_recv'),
+                                 rate(previous[3], current[3], 'bytes_sent'), version)
@@ -0,0 +1,189 @@
+import os
+import errno
+import select
+import socket
+import struct
+import fnmatch
+import logging
+import threading
+import netifaces
+
+# rtnetlink multicast groups (linux/rtnetlink.h): link up/down and IPv4 address changes
+RTMGRP_LINK = 0x1
+RTMGRP_IPV4_IFADDR = 0x10
+NLMSG_HEADER = struct.Struct('=IHHII')  # length, type, flags, sequence, port id
+ROUTE_EVENTS = {16: 'new link', 17: 'deleted link', 20: 'new address', 21: 'deleted address'}
+HOSTNAME_PATH = '/proc/sys/kernel/hostname'  # pollable, the kernel flags a change with POLLPRI
+
+
+def get_hostname():
+    return socket.gethostname()
+
+
+def get_ip_address(interfaces=('eth0', 'wlan0')):
+    """
+    Get the local IP address of the first interface in `interfaces` that has one.
+
+    Args:
+        interfaces (list): Interface names in order of priority, shell patterns
+            like 'wl*' match every interface with a matching name.
+
+    Returns:
+        str: The local IP address or None if no IP address is found.
+    """
+    for interface in expand(interfaces):
+        try:
+            addresses = netifaces.ifaddresses(interface)
+            ip_info = addresses.get(netifaces.AF_INET)
+            if ip_info:
+                ip_address = ip_info[0]['addr']
+                if ip_address and not ip_address.startswith("127."):
+                    return ip_address
+        except ValueError:
+            continue
+    return None
+
+
+def expand(interfaces):
+    """Interface names in priority order, patterns replaced by the present interfaces they match"""
+    present = None
+    for name in interfaces:
+        if not any(c in name for c in '*?['):
+            yield name
+            continue
+        if present is None:
+            present = sorted(netifaces.interfaces())
+        yield from fnmatch.filter(present, name)
+
+
+def route_events(data):
+    """Names of the rtnetlink messages in a datagram, unknown types are skipped"""
+    events = []
+    offset = 0
+    while offset + NLMSG_HEADER.size <= len(data):
+        length, kind, _, _, _ = NLMSG_HEADER.unpack_from(data, offset)
+        if length < NLMSG_HEADER.size:
+            break
+        if kind in ROUTE_EVENTS:
+            events.append(ROUTE_EVENTS[kind])
+        offset += (length + 3) & ~3
+    return events
+
+
+class AddressWatcher:
+    """
+    Local IP address and hostname, looked up again only when the kernel reports a change.
+
+    A thread blocks in poll() on an AF_NETLINK route socket subscribed to link
+    and IPv4 address events and on /proc/sys/kernel/hostname, which the kernel
+    flags when the hostname is set. A burst of messages (DHCP replacing a
+    lease, a cable swap) is drained first and costs one lookup. `on_change`
+    is called from the watcher thread with (address, hostname) whenever one
+    of them differs from before.
+
+    Without netlink (not Linux, no permission) the lookup falls back to
+    every `fallback_interval` seconds.
+
+    Args:
+        interfaces (list): Interface names or patterns in order of priority, see get_ip_address().
+        on_change (callable): Called with (address, hostname) after a change.
+    """
+
+    def __init__(self, interfaces=('eth0', 'wlan0'), on_change=None, fallback_interval=30):
+        self.interfaces = list(interfaces)
+        self.on_change = on_change
+        self.fallback_interval = fallback_interval
+        self.address = get_ip_address(self.interfaces)
+        self.hostname = get_hostname()
+        self.lookups = 0
+        self.events = 0
+        self.socket = None
+        self.hostname_fd = None
+        self.stop_event = threading.Event()
+        self.wakeup = None
+        self.thread = threading.Thread(target=self.run, name='network', daemon=True)
+
+    def start(self):
+        try:
+            self.socket = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, socket.NETLINK_ROUTE)
+            self.socket.bind((0, RTMGRP_LINK | RTMGRP_IPV4_IFADDR))
+            self.socket.setblocking(False)
+        except (AttributeError, OSError) as e:
+            logging.warning(f"Network: No netlink route socket ({e}), looking up the address "
+                            f"every {self.fallback_interval} seconds")
+            if self.socket is not None:
+                self.socket.close()
+            self.socket = None
+        else:
+            try:
+                self.hostname_fd = os.open(HOSTNAME_PATH, os.O_RDONLY)
+            except OSError as e:
+                logging.warning(f"Network: Hostname changes are not watched: {e}")
+            self.wakeup = os.pipe()
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        if self.wakeup is not None:
+            os.write(self.wakeup[1], b'\0')
+
+    def run(self):
+        if self.socket is None:
+            while not self.stop_event.wait(self.fallback_interval):
+                self.lookup()
+            return
+
+        poller = select.poll()
+        poller.register(self.socket, select.POLLIN)
+        poller.register(self.wakeup[0], select.POLLIN)
+        if self.hostname_fd is not None:
+            poller.register(self.hostname_fd, select.POLLPRI | select.POLLERR)
+        try:
+            while not self.stop_event.is_set():
+                ready = poller.poll()
+                if self.stop_event.is_set():
+                    break
+                events = []
+                for fd, _ in ready:
+                    if fd == self.socket.fileno():
+                        events += self.drain()
+                    elif fd == self.hostname_fd:
+                        events.append('hostname')
+                if events:
+                    self.events += len(events)
+                    logging.debug(f"Network: {', '.join(sorted(set(events)))}")
+                    self.lookup()
+        except Exception as e:
+            logging.error(f"Network: Watcher failed: {e}")
+        finally:
+            self.close()
+
+    def drain(self):
+        """Reads every queued netlink message, a lost message (ENOBUFS) counts as a change"""
+        events = []
+        while True:
+            try:
+                events += route_events(self.socket.recv(65536))
+            except BlockingIOError:
+                return events
+            except OSError as e:
+                if e.errno != errno.ENOBUFS:
+                    raise
+                events.append('overflow')
+
+    def lookup(self):
+        self.lookups += 1
+        address, hostname = get_ip_address(self.interfaces), get_hostname()
+        if (address, hostname) == (self.address, self.hostname):
+            return
+        logging.info(f"Network: Address {self.address} -> {address}, hostname {self.hostname} -> {hostname}")
+        self.address, self.hostname = address, hostname
+        if self.on_change is not None:
+            self.on_change(address, hostname)
+
+    def close(self):
+        self.socket.close()
+        if self.hostname_fd is not None:
+            os.close(self.hostname_fd)
+        for fd in self.wakeup:
+            os.close(fd)
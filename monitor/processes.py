@@ -0,0 +1,148 @@
+import os
+import time
+import heapq
+import logging
+import threading
+from collections import namedtuple
+
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK')
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+COMM_LENGTH = 15  # The kernel cuts the name in /proc/<pid>/stat to 15 characters
+
+# cpu in % of one core (like top), rss in bytes
+ProcessInfo = namedtuple('ProcessInfo', ['pid', 'name', 'cpu', 'rss'])
+# Published after every scan, replaced as a whole so readers never see a partial update
+ProcessTop = namedtuple('ProcessTop', ['by_cpu', 'by_rss', 'count', 'version'])
+
+
+class ProcessTable:
+    """
+    Top processes by CPU and resident memory, sampled in a background thread.
+
+    Every scan lists the PIDs in /proc and reads one file per process,
+    /proc/<pid>/stat, for the name, CPU ticks, RSS and start time. The name
+    is kept per PID (with the start time, which tells a reused PID apart) and
+    looked at again only for a new process; /proc/<pid>/cmdline is read only
+    when the kernel cut the name. Entries of exited PIDs are dropped. CPU %
+    comes from the tick deltas between two scans.
+
+    Args:
+        interval (float): Seconds between scans.
+        top (int): Processes kept per list.
+    """
+
+    def __init__(self, interval=2, top=5, proc='/proc'):
+        self.interval = interval
+        self.count = top
+        self.proc = proc
+        self.known = {}  # pid -> (name, start ticks)
+        self.ticks = {}  # pid -> CPU ticks at the last scan
+        self.scanned = None
+        self.top = None
+        self.scans = 0
+        self.scan_seconds = 0.0  # Total time spent scanning, for the cost per scan
+        self.active = threading.Event()
+        self.active.set()
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.run, name='processes', daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        self.active.set()
+
+    def pause(self):
+        """Stops scanning until resume(), while the processes page is not on screen or next"""
+        self.active.clear()
+
+    def resume(self):
+        self.active.set()
+
+    def get(self):
+        """
+        Returns:
+            ProcessTop: Result of the latest scan, None before the first one.
+        """
+        return self.top
+
+    def run(self):
+        while not self.stop_event.is_set():
+            if not self.active.is_set():
+                # CPU % of the first scan after a pause would average over the whole pause
+                self.scanned = None
+                self.active.wait()
+                continue
+            try:
+                self.scan()
+            except Exception as e:
+                logging.error(f"Processes: Scan failed: {e}")
+            self.stop_event.wait(self.interval)
+
+    def read_stat(self, pid):
+        """
+        Returns:
+            tuple: (name, start ticks, CPU ticks, RSS bytes), None if the process is gone.
+        """
+        try:
+            with open(f'{self.proc}/{pid}/stat', 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        # The name may contain spaces and parentheses, the fields after it are numbers
+        end = data.rfind(b')')
+        fields = data[end + 2:].split()
+        # fields[0] is field 3 of proc(5): utime 14, stime 15, starttime 22, rss 24
+        return (data[data.find(b'(') + 1:end].decode(errors='replace'), int(fields[19]),
+                int(fields[11]) + int(fields[12]), int(fields[21]) * PAGE_SIZE)
+
+    def identify(self, pid, comm, start):
+        """Name of a new process: `comm` from stat, completed from the command line if it was cut"""
+        name = comm
+        if len(comm) >= COMM_LENGTH:
+            # Like psutil: argv[0] without the path, if it continues the cut name
+            try:
+                with open(f'{self.proc}/{pid}/cmdline', 'rb') as f:
+                    command = os.path.basename(f.read().split(b'\0', 1)[0].decode(errors='replace'))
+                if command.startswith(comm):
+                    name = command
+            except OSError:
+                pass
+        self.known[pid] = (name, start)
+        return name
+
+    def scan(self):
+        scan_start = time.perf_counter()
+        now = time.monotonic()
+        pids = {int(entry) for entry in os.listdir(self.proc) if entry.isdigit()}
+        for pid in self.known.keys() - pids:
+            del self.known[pid]
+            self.ticks.pop(pid, None)
+
+        elapsed = now - self.scanned if self.scanned is not None else None
+        processes = []
+        for pid in pids:
+            stat = self.read_stat(pid)
+            if stat is None:
+                continue
+            comm, start, ticks, rss = stat
+            known = self.known.get(pid)
+            if known is None or known[1] != start:
+                # New process or a reused PID
+                self.ticks.pop(pid, None)
+                name = self.identify(pid, comm, start)
+            else:
+                name = known[0]
+            previous = self.ticks.get(pid)
+            self.ticks[pid] = ticks
+            cpu = (ticks - previous) / CLOCK_TICKS / elapsed * 100 if previous is not None and elapsed else 0.0
+            processes.append(ProcessInfo(pid, name, cpu, rss))
+
+        self.scanned = now
+        version = self.top.version + 1 if self.top else 1
+        self.top = ProcessTop(tuple(heapq.nlargest(self.count, processes, key=lambda p: p.cpu)),
+                              tuple(heapq.nlargest(self.count, processes, key=lambda p: p.rss)),
+                              len(processes), version)
+        self.scans += 1
+        self.scan_seconds += time.perf_counter() - scan_start
@@ -0,0 +1,112 @@
+import os
+import mmap
+import time
+import struct
+import logging
+import numpy as np
+from monitor.snapshot import FIELDS, STRUCT, unpack_from, pack_into
+
+# File layout: HEADER, then fixed-width records of RECORD (timestamp + Snapshot)
+MAGIC = b'W3PIREC\0'
+VERSION = 3  # 2: Snapshot.stale, 3: 64 byte hostname
+HEADER = struct.Struct('<8sHHd')  # magic, version, record size, creation time
+TIMESTAMP = struct.Struct('<d')
+RECORD_SIZE = TIMESTAMP.size + STRUCT.size
+
+# The same layout as a numpy dtype, for column access through np.memmap
+NUMPY_TYPES = {'f': '<f4', 'h': '<i2', 'B': 'u1'}
+RECORD_DTYPE = np.dtype([('time', '<f8')] + [
+    (name, NUMPY_TYPES.get(fmt, 'S' + fmt[:-1])) for name, fmt in FIELDS
+])
+assert RECORD_DTYPE.itemsize == RECORD_SIZE
+
+
+class Recorder:
+    """
+    Appends Snapshots with their wall clock time to a recording file.
+
+    Records have a fixed width, so a recording can be memory-mapped and indexed
+    directly. When the file grows over `max_bytes` it is rotated to `<path>.1`.
+    Writes go to the file buffer, which is flushed every `flush_interval`
+    seconds and by close(), so a crash loses at most that many seconds.
+    """
+
+    def __init__(self, path, max_bytes=64 * 1024 * 1024, flush_interval=10):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.flush_interval = flush_interval
+        self.next_flush = time.monotonic() + flush_interval
+        self.buffer = bytearray(RECORD_SIZE)
+        self.file = None
+        self._open()
+
+    def _open(self):
+        exists = os.path.exists(self.path) and os.path.getsize(self.path) >= HEADER.size
+        if exists:
+            with open(self.path, 'rb') as f:
+                magic, version, record_size, _ = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC or version != VERSION or record_size != RECORD_SIZE:
+                logging.warning(f"Recorder: {self.path} has another format, rotating it")
+                os.replace(self.path, self.path + '.1')
+                exists = False
+        self.file = open(self.path, 'ab')
+        if not exists:
+            self.file.write(HEADER.pack(MAGIC, VERSION, RECORD_SIZE, time.time()))
+
+    def write(self, snapshot, timestamp=None):
+        TIMESTAMP.pack_into(self.buffer, 0, time.time() if timestamp is None else timestamp)
+        pack_into(self.buffer, TIMESTAMP.size, snapshot)
+        self.file.write(self.buffer)
+        now = time.monotonic()
+        if now >= self.next_flush:
+            self.next_flush = now + self.flush_interval
+            self.file.flush()
+        if self.max_bytes and self.file.tell() >= self.max_bytes:
+            self.file.close()
+            os.replace(self.path, self.path + '.1')
+            self._open()
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+class Recording:
+    """Read-only, memory-mapped view of a recording file"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, record_size, self.created = HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC or version != VERSION or record_size != RECORD_SIZE:
+            raise ValueError(f"{path} is not a recording of version {VERSION}")
+        # A record cut short by a crash is ignored
+        self.count = (len(self.map) - HEADER.size) // RECORD_SIZE
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        """
+        Returns:
+            tuple: (timestamp, Snapshot)
+        """
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        offset = HEADER.size + index * RECORD_SIZE
+        return TIMESTAMP.unpack_from(self.map, offset)[0], unpack_from(self.map, offset + TIMESTAMP.size)
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield self[index]
+
+    def columns(self):
+        """All records as a numpy structured memmap, e.g. recording.columns()['cpu_temp']"""
+        return np.memmap(self.path, dtype=RECORD_DTYPE, mode='r', offset=HEADER.size, shape=(self.count,))
+
+    def close(self):
+        self.map.close()
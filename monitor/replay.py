@@ -0,0 +1,131 @@
+"""
+Replays a metric recording through the dashboard renderer, without hardware.
+
+Frames are composed exactly like the render loop does (dashboard at `fps`,
+install screen at 2 Hz), on a simulated clock that starts at the first record.
+With --speed 0 frames are rendered as fast as possible, which makes frame time
+regressions visible; --screenshots saves PNGs for visual comparison in CI.
+
+Usage (from the repository root):
+    python -m monitor.replay RECORDING [--speed 1] [--fps 10] [--renderer native|pil]
+                             [--screenshots DIR] [--every 10] [--display lcd.LCD_1inch69:LCD_1inch69]
+"""
+
+import os
+import sys
+import time
+import argparse
+import logging
+from PIL import Image
+from monitor.recording import Recording
+from ui.dashboard import DashboardRenderer
+from ui.framebuffer import FramePool, unpack_rgb565
+from ui.framestats import FrameStats
+from ui.native import Rgb565Frames
+from ui.render_process import load_class
+
+
+def replay(recording, fps=10, speed=1.0, native=True, show_per_core=False, display=None, screenshots=None,
+           every=10):
+    """
+    Renders every frame a live render loop would have shown for the recorded period.
+
+    Args:
+        recording (Recording): Source of Snapshots.
+        fps (int): Dashboard frame rate.
+        speed (float): Simulated seconds per wall clock second, 0 = as fast as possible.
+        display: Optional display object with ShowBuffer(), e.g. the real panel.
+        screenshots (str): Directory for PNG screenshots, None = no screenshots.
+        every (int): Save a screenshot every `every` rendered frames and on every record change.
+
+    Returns:
+        dict: FrameStats summary of the frame intervals and of the composition times.
+    """
+    if len(recording) == 0:
+        raise ValueError("The recording is empty")
+
+    frames = (Rgb565Frames if native else FramePool)()
+    renderer = DashboardRenderer(show_per_core)
+    background = Image.open('./img/lcdbg.png').convert("RGBA")
+    window = 100000
+    intervals = FrameStats('Replay', 1 / fps / speed if speed else 0, window)
+    compose_times = FrameStats('Compose', 0, window)
+    if screenshots:
+        os.makedirs(screenshots, exist_ok=True)
+
+    start, _ = recording[0]
+    end, _ = recording[-1]
+    install_every = max(1, round(0.5 * fps))
+    wall_start = time.perf_counter()
+    index = -1
+    rendered = 0
+    tick = 0
+    while True:
+        now = start + tick / fps
+        if now > end:
+            break
+        changed = False
+        while index + 1 < len(recording) and recording[index + 1][0] <= now:
+            index += 1
+            changed = True
+        timestamp, snap = recording[index]
+
+        if snap.install_stage == 100 or tick % install_every == 0:
+            if speed:
+                time.sleep(max(0, wall_start + (now - start) / speed - time.perf_counter()))
+            frame_start = time.perf_counter()
+            intervals.tick(frame_start)
+            renderer.compose(frames, background, snap, tick, changed or rendered == 0, now=now)
+            rgb565 = frames.convert()
+            compose_times.add(time.perf_counter() - frame_start)
+            if display is not None:
+                display.ShowBuffer(rgb565)
+            if screenshots and (changed or rendered % every == 0):
+                unpack_rgb565(rgb565).save(os.path.join(screenshots, f'frame_{tick:06d}.png'))
+            rendered += 1
+        tick += 1
+
+    summary = intervals.summary() or {}
+    summary['compose'] = compose_times.summary()
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a metric recording through the dashboard renderer")
+    parser.add_argument('recording')
+    parser.add_argument('--speed', type=float, default=1.0, help="0 = as fast as possible")
+    parser.add_argument('--fps', type=int, default=10)
+    parser.add_argument('--renderer', choices=('native', 'pil'), default='native')
+    parser.add_argument('--per-core', action='store_true', help="CPU usage in the 0 - 400%% range")
+    parser.add_argument('--screenshots', help="directory for PNG screenshots")
+    parser.add_argument('--every', type=int, default=10, help="screenshot interval in rendered frames")
+    parser.add_argument('--display', help="display class as module:Class, e.g. lcd.LCD_1inch69:LCD_1inch69")
+    args = parser.parse_args()
+    logging.basicConfig(format='%(asctime)s %(levelname)-8s %(message)s', level=logging.INFO,
+                        datefmt='%Y-%m-%d %H:%M:%S')
+
+    display = None
+    if args.display:
+        display = load_class(args.display)()
+        display.Init()
+        display.clear()
+        display.bl_DutyCycle(100)
+
+    recording = Recording(args.recording)
+    try:
+        s = replay(recording, fps=args.fps, speed=args.speed, native=args.renderer == 'native',
+                   show_per_core=args.per_core, display=display, screenshots=args.screenshots, every=args.every)
+    except ValueError as e:
+        sys.exit(str(e))
+    finally:
+        recording.close()
+
+    c = s['compose']
+    print(f"{len(recording)} records, {c['frames']} frames")
+    print(f"compose  mean {c['mean']:6.2f} ms  p50 {c['p50']:6.2f} ms  p99 {c['p99']:6.2f} ms  max {c['max']:6.2f} ms")
+    if args.speed and 'fps' in s:
+        print(f"interval {s['fps']:5.1f} FPS  p99 {s['p99']:6.1f} ms  jitter {s['jitter']:5.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
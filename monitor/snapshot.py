@@ -0,0 +1,121 @@
+import time
+import struct
+from collections import namedtuple
+from multiprocessing import shared_memory
+
+# Everything the render loop consumes, in a fixed little-endian binary layout
+FIELDS = (
+    ('cpu_percent', 'f'),
+    ('cpu_temp', 'f'),
+    ('mem_percent', 'f'),
+    ('swap_percent', 'f'),
+    ('disk_percent', 'f'),
+    ('disk_used_tb', 'f'),
+    ('exec', 'f'),
+    ('node', 'f'),
+    ('cons', 'f'),
+    ('install_stage', 'h'),
+    ('errors', 'B'),  # One bit per ERROR_KEYS entry
+    ('ip', '16s'),
+    ('hostname', '64s'),  # HOST_NAME_MAX on Linux
+    ('status', '64s'),
+    ('stale', 'B'),  # One bit per client status (exec, node, cons) that is too old to trust
+)
+TEXT_FIELDS = ('ip', 'hostname', 'status')
+# Text fields longer than this many UTF-8 bytes are cut, at a character boundary
+TEXT_SIZES = {name: int(fmt[:-1]) for name, fmt in FIELDS if name in TEXT_FIELDS}
+ERROR_KEYS = ("0", "1", "2", "100", "any")
+STALE_BITS = {'exec': 1, 'node': 2, 'cons': 4}
+
+Snapshot = namedtuple('Snapshot', [name for name, _ in FIELDS], defaults=(0,))
+STRUCT = struct.Struct('<' + ''.join(fmt for _, fmt in FIELDS))
+
+
+def errors_to_mask(error_in_stage):
+    """Converts the error_in_stage dict to the `errors` bit mask"""
+    mask = 0
+    for bit, key in enumerate(ERROR_KEYS):
+        if error_in_stage.get(key):
+            mask |= 1 << bit
+    return mask
+
+
+def mask_to_errors(mask):
+    """Converts the `errors` bit mask back to an error_in_stage dict"""
+    return {key: bool(mask & (1 << bit)) for bit, key in enumerate(ERROR_KEYS)}
+
+
+def encode_text(value, size):
+    """`value` as UTF-8, cut to at most `size` bytes without splitting a character"""
+    data = (value or '').encode('utf-8')
+    if len(data) > size:
+        # The source is valid UTF-8, only the character cut at the end is dropped
+        data = data[:size].decode('utf-8', 'ignore').encode('utf-8')
+    return data
+
+
+def pack_into(buffer, offset, snapshot):
+    values = []
+    for name, value in zip(Snapshot._fields, snapshot):
+        if name in TEXT_FIELDS:
+            value = encode_text(value, TEXT_SIZES[name])
+        values.append(value)
+    STRUCT.pack_into(buffer, offset, *values)
+
+
+def unpack_from(buffer, offset=0):
+    values = []
+    for name, value in zip(Snapshot._fields, STRUCT.unpack_from(buffer, offset)):
+        if name in TEXT_FIELDS:
+            # An empty string stands for None (e.g. no IP address yet)
+            value = value.rstrip(b'\0').decode('utf-8', 'replace') or None
+        values.append(value)
+    return Snapshot(*values)
+
+
+class SharedSnapshot:
+    """
+    A Snapshot in a multiprocessing.shared_memory block, guarded by a sequence lock.
+
+    There is exactly one writer. The sequence counter is odd while a write is in
+    progress, readers retry until they see the same even value before and after
+    copying the record, so they never block the writer and never see a torn record.
+    """
+
+    HEADER = struct.Struct('<I')
+
+    def __init__(self, name=None):
+        size = self.HEADER.size + STRUCT.size
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+            self.HEADER.pack_into(self.shm.buf, 0, 0)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.name = self.shm.name
+
+    def write(self, snapshot):
+        buf = self.shm.buf
+        sequence = self.HEADER.unpack_from(buf, 0)[0]
+        self.HEADER.pack_into(buf, 0, (sequence + 1) & 0xFFFFFFFF)
+        pack_into(buf, self.HEADER.size, snapshot)
+        self.HEADER.pack_into(buf, 0, (sequence + 2) & 0xFFFFFFFF)
+
+    def read(self):
+        """
+        Returns:
+            tuple: (sequence, Snapshot) - sequence changes with every write, 0 means never written.
+        """
+        buf = self.shm.buf
+        while True:
+            before = self.HEADER.unpack_from(buf, 0)[0]
+            if before & 1:
+                time.sleep(0)
+                continue
+            snapshot = unpack_from(buf, self.HEADER.size)
+            if self.HEADER.unpack_from(buf, 0)[0] == before:
+                return before, snapshot
+
+    def close(self, unlink=False):
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
@@ -0,0 +1,261 @@
+import time
+import threading
+import numpy as np
+from ui.framebuffer import pack_rgb565
+
+# Green in the high half, red and blue in the low half of a 32-bit word, 5 spare bits above each channel
+SPREAD_MASK = 0x07E0F81F
+FADE_STEPS = 32  # Blend levels of a fade, the weights fit the spare bits
+
+
+def spread(rgb565, out):
+    """RGB565 words -> 32-bit words with room above every channel, so all three can be weighted at once"""
+    np.copyto(out, rgb565, casting='unsafe')
+    np.left_shift(out, 16, out=out)
+    np.bitwise_or(out, rgb565, out=out, casting='unsafe')
+    np.bitwise_and(out, SPREAD_MASK, out=out)
+    return out
+
+
+class StillFrame:
+    """A finished RGB565 frame with the interface show_frame() expects from a frame pool"""
+
+    def __init__(self, width=240, height=280):
+        self.width = width
+        self.height = height
+        self.rgb565 = np.zeros((height, width), dtype='>u2')
+
+    def convert(self):
+        return self.rgb565
+
+
+class Transition:
+    """
+    Slide or fade from one RGB565 frame to another, computed on the RGB565 words.
+
+    A slide only copies column ranges of both frames. A fade weights the
+    channels of both frames with one multiplication each on spread 32-bit
+    words, so no frame is unpacked to RGB888 and PIL is not involved. All
+    buffers are allocated once.
+    """
+
+    def __init__(self, width=240, height=280):
+        self.width = width
+        self.height = height
+        self.source = np.zeros((height, width), dtype='>u2')
+        self.target = None
+        self.kind = None
+        self.duration = 0
+        self.started = 0
+        self.active = False
+        self.spread_source = np.zeros((height, width), dtype=np.uint32)
+        self.spread_target = np.zeros((height, width), dtype=np.uint32)
+        self.weighted_source = np.zeros((height, width), dtype=np.uint32)
+        self.weighted_target = np.zeros((height, width), dtype=np.uint32)
+
+    def begin(self, source, target, kind, duration, now):
+        """Starts a transition, `source` is copied, `target` must not change until it ends"""
+        np.copyto(self.source, source)
+        self.target = target
+        self.kind = kind
+        self.duration = duration
+        self.started = now
+        if kind == 'fade':
+            spread(self.source, self.spread_source)
+            spread(target, self.spread_target)
+        self.active = True
+
+    def frame(self, now, out):
+        """
+        Writes the transition frame for `now` to `out`.
+
+        Returns:
+            bool: False once the target frame has been written, the transition is over.
+        """
+        progress = min(1.0, (now - self.started) / self.duration) if self.duration else 1.0
+        if progress >= 1:
+            np.copyto(out, self.target)
+            self.active = False
+            self.target = None
+            return False
+        # Ease out, the motion slows down towards the end
+        progress = 1 - (1 - progress) ** 2
+        if self.kind == 'fade':
+            self.fade(int(progress * FADE_STEPS), out)
+        else:
+            self.slide(int(progress * self.width), out)
+        return True
+
+    def slide(self, offset, out):
+        out[:, :self.width - offset] = self.source[:, offset:]
+        out[:, self.width - offset:] = self.target[:, :offset]
+
+    def fade(self, weight, out):
+        np.multiply(self.spread_source, FADE_STEPS - weight, out=self.weighted_source)
+        np.multiply(self.spread_target, weight, out=self.weighted_target)
+        np.add(self.weighted_source, self.weighted_target, out=self.weighted_source)
+        np.right_shift(self.weighted_source, 5, out=self.weighted_source)
+        np.bitwise_and(self.weighted_source, SPREAD_MASK, out=self.weighted_source)
+        # Fold green back between red and blue
+        np.right_shift(self.weighted_source, 16, out=self.weighted_target)
+        np.bitwise_or(self.weighted_source, self.weighted_target, out=self.weighted_source)
+        np.copyto(out, self.weighted_source, casting='unsafe')
+
+
+class Carousel:
+    """
+    Pages shown in turn, each for `seconds`, with transitions between them.
+
+    The dashboard is composed by the render loop itself. Every other page is
+    rendered and packed to RGB565 in a background thread, only when its data
+    version changed and only while it is on screen or next in line (from
+    `prepare` seconds before the switch). The data sources of all other pages
+    are paused, so inactive pages neither sample nor render, and the render
+    loop only copies finished frames.
+
+    A carousel without the dashboard drives a secondary panel on its own, see
+    advance(). Each panel has its own carousel and page objects; a data source
+    shown on several panels runs while any of them needs it.
+
+    Args:
+        pages (dict): name -> page with `source` (pause() / resume()), `current()` and `render(data)`.
+        order (list): Page names in display order, 'dashboard' included; unknown names are skipped.
+        transition (str): 'slide', 'fade' or None for a cut.
+    """
+
+    # source -> carousels that currently need it, shared by the carousels of all panels
+    demand = {}
+    demand_lock = threading.Lock()
+
+    def __init__(self, pages, order, seconds, transition='slide', duration=0.5, prepare=3, width=240, height=280):
+        self.pages = pages
+        self.order = [name for name in order if name == 'dashboard' or name in pages] or ['dashboard']
+        self.seconds = seconds
+        self.kind = transition
+        self.duration = duration
+        self.prepare = prepare
+        self.width = width
+        self.height = height
+        self.prepared = {}  # name -> (data version, rgb565), entries are replaced, never modified
+        self.output = StillFrame(width, height)
+        self.transition = Transition(width, height)
+        self.shown = None  # page on the panel and its data version, advance() only
+        self.shown_version = None
+        self.renders = 0
+        self.sources = []
+        for page in pages.values():
+            if page.source is not None and all(page.source is not source for source in self.sources):
+                self.sources.append(page.source)
+        self._word = np.zeros((height, width), dtype=np.uint16)
+        self._part = np.zeros((height, width), dtype=np.uint16)
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.run, name='pages', daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+
+    def scheduled(self, now):
+        """Name of the page the timer selects at `now` (time.monotonic())"""
+        return self.order[int(now // self.seconds) % len(self.order)]
+
+    def wanted(self, now):
+        """Pages that need data at `now`: the scheduled one and, shortly before the switch, the next one"""
+        slot = int(now // self.seconds)
+        names = {self.order[slot % len(self.order)]}
+        if (slot + 1) * self.seconds - now <= self.prepare:
+            names.add(self.order[(slot + 1) % len(self.order)])
+        return names
+
+    def ready(self, name):
+        return name == 'dashboard' or name in self.prepared
+
+    def frame(self, name):
+        """
+        Returns:
+            tuple: (data version, rgb565) of the prepared page, None if not prepared yet.
+        """
+        return self.prepared.get(name)
+
+    def present(self, name):
+        """
+        Copies the prepared frame of `name` to `output`.
+
+        Returns:
+            int: Data version of the copied frame.
+        """
+        version, rgb565 = self.prepared[name]
+        np.copyto(self.output.rgb565, rgb565)
+        return version
+
+    @property
+    def transitioning(self):
+        return self.transition.active
+
+    def begin(self, source, target, now, cut=False):
+        """Starts the transition from the `source` frame to the `target` frame, `cut` skips the animation"""
+        cut = cut or self.kind is None
+        self.transition.begin(source, target, self.kind, 0 if cut else self.duration, now)
+
+    def step(self, now):
+        """Writes the next transition frame to `output`, the target frame when the transition is over"""
+        self.transition.frame(now, self.output.rgb565)
+        return self.output
+
+    def advance(self, now, cut=False):
+        """
+        Shows the pages of a carousel without the dashboard: switches to the
+        scheduled page once it is prepared, steps transitions and picks up new
+        data versions.
+
+        Returns:
+            StillFrame: `output` when it has to be sent, None if the panel already shows it.
+        """
+        page = self.scheduled(now)
+        if page != self.shown and not self.transitioning and self.ready(page):
+            self.shown_version, target = self.frame(page)
+            # The first page appears without a transition from the blank output
+            self.begin(self.output.rgb565, target, now, cut or self.shown is None)
+            self.shown = page
+        if self.transitioning:
+            return self.step(now)
+        if self.shown is not None and self.frame(self.shown)[0] != self.shown_version:
+            self.shown_version = self.present(self.shown)
+            return self.output
+        return None
+
+    def need(self, source, needed):
+        """Records whether this carousel needs `source`, which runs while any carousel does"""
+        with Carousel.demand_lock:
+            users = Carousel.demand.setdefault(source, set())
+            if needed:
+                users.add(self)
+            else:
+                users.discard(self)
+            if users:
+                source.resume()
+            else:
+                source.pause()
+
+    def run(self):
+        while not self.stop_event.is_set():
+            wanted = self.wanted(time.monotonic())
+            for source in self.sources:
+                self.need(source, any(self.pages[name].source is source for name in wanted if name != 'dashboard'))
+            for name in wanted:
+                if name != 'dashboard':
+                    self.prepare_page(name)
+            self.stop_event.wait(0.25)
+
+    def prepare_page(self, name):
+        page = self.pages[name]
+        version, data = page.current()
+        prepared = self.prepared.get(name)
+        if prepared is not None and prepared[0] == version:
+            return
+        rgb565 = np.empty((self.height, self.width), dtype='>u2')
+        pack_rgb565(np.asarray(page.render(data).convert('RGB')), rgb565, self._word, self._part)
+        self.prepared[name] = (version, rgb565)
+        self.renders += 1
@@ -0,0 +1,348 @@
+import math
+import time
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+from ui import palette
+from ui.native import ArrayDraw
+from monitor.snapshot import mask_to_errors, STALE_BITS
+
+# Text colors
+C_BG = '#00129A' #LCD bacground
+C_T1 = '#FFFFFF' #main text
+C_T2 = '#A1A1A1' #text on top
+C_T3 = '#A1A1A1' #text on bottom
+C_T_GREEN = '#22C55E' #green text
+C_T_RED = '#EF4433' #red text
+
+FONT_PATH = "./font/JetBrainsMono-Medium.ttf"
+
+
+def map_status(value):
+    return palette.active.status.name(value)
+
+
+def status_color(snap, name):
+    """Color of a client status, grey while the value is stale (InfluxDB has not delivered it for a while)"""
+    if snap.stale & STALE_BITS[name]:
+        return C_T2
+    return palette.active.status.color(getattr(snap, name))
+
+
+def dashboard_content_key(snap):
+    """
+    Significant dashboard state - client statuses, address and alarms, but not
+    the fluctuating CPU/RAM numbers which would keep the panel awake forever.
+    """
+    return (map_status(snap.exec), map_status(snap.node), map_status(snap.cons), snap.stale, snap.ip, snap.hostname,
+            snap.cpu_temp >= 80, snap.disk_percent >= 90)
+
+
+def static_key(snap, show_per_core=False):
+    """Everything draw_static() shows, as it is shown: equal keys draw identical cells"""
+    colors = palette.active
+    return (colors, show_per_core, int(snap.cpu_percent), int(snap.cpu_temp), int(snap.disk_percent),
+            f'{snap.disk_used_tb:.2f}', int(snap.mem_percent), snap.ip, snap.hostname,
+            *((map_status(getattr(snap, name)), status_color(snap, name)) for name in STALE_BITS))
+
+
+def install_content_key(snap):
+    return snap.install_stage, snap.status, snap.errors, snap.ip
+
+
+def update_spinner(spinner):
+    next_dot_count = (spinner.count('.') + 1) % 4
+    return '.' * next_dot_count + ' ' * (3 - next_dot_count)
+
+
+class DashboardRenderer:
+    """
+    Draws the dashboard and the install progress screen from a Snapshot.
+
+    Keeps the fonts and the little bit of state the install screen animates
+    (spinner dots, blinking error hint), so the same renderer can run in the
+    main loop or in the render process.
+    """
+
+    def __init__(self, show_per_core=False):
+        self.show_per_core = show_per_core
+
+        # https://www.fontsquirrel.com/fonts/jetbrains-mono
+        self.Font1 = ImageFont.truetype(FONT_PATH, 35)
+        self.Font2 = ImageFont.truetype(FONT_PATH, 25)
+        self.Font3 = ImageFont.truetype(FONT_PATH, 20)
+        self.Font3_5 = ImageFont.truetype(FONT_PATH, 18)
+        self.Font4 = ImageFont.truetype(FONT_PATH, 15)
+
+        self.spinner = "   "
+        self.static_drawn = None  # (frames, background, static_key) of the static layer last drawn
+        self.error_msg_color = 0
+        self.install = InstallScreen({'Font2': self.Font2, 'Font3': self.Font3, 'Font3_5': self.Font3_5})
+
+    def draw_static(self, draw, snap):
+        """Draws the six dashboard cells, the part of the frame that changes about once per second"""
+        Font1, Font2, Font3, Font4 = self.Font1, self.Font2, self.Font3, self.Font4
+
+        # Draw vertical lines
+        draw.line([(240 / 3, 0), (240 / 3, (280 / 3) * 2)], fill="BLACK", width=2, joint=None)
+        draw.line([((240 / 3) * 2, 0), ((240 / 3) * 2, (280 / 3) * 2)], fill="BLACK", width=2, joint=None)
+
+        # Draw vertical lines
+        draw.line([(0, 280 / 3), (240, 280 / 3)], fill="BLACK", width=2, joint=None)
+        draw.line([(0, (280 / 3) * 2), (240, (280 / 3) * 2)], fill="BLACK", width=2, joint=None)
+
+        # CPU
+        x = 0
+        y = 0
+        draw.text((120 + x, 108 + y), 'CPU', fill=C_T2, font=Font2, anchor="mm")
+
+        colors = palette.active
+        cpu_percent = int(snap.cpu_percent)
+        if self.show_per_core:
+            draw.text((120 + x, 140 + y), f'{cpu_percent}', fill=colors.cpu_400.color(cpu_percent), font=Font1, anchor="mm")
+            draw.text((150 + x, 108 + y), '%', fill=C_T2, font=Font3, anchor="mm")
+        else:
+            draw.text((120 + x, 140 + y), f'{cpu_percent}', fill=colors.cpu_100.color(cpu_percent), font=Font1, anchor="mm")
+            draw.text((150 + x, 145 + y), '%', fill=C_T2, font=Font3, anchor="mm")
+        ct = int(snap.cpu_temp)
+        draw.text((122 + x, 170 + y), f'{ct}°C', fill=C_T2, font=Font2, anchor="mm")
+
+        # DISK
+        x = -80
+        y = 0
+        draw.text((120 + x, 108 + y), 'DISK', fill=C_T2, font=Font2, anchor="mm")
+        draw.text((120 + x, 140 + y), f'{int(snap.disk_percent)}%', fill=C_T1, font=Font1, anchor="mm")
+        draw.text((122 + x, 170 + y), f'{snap.disk_used_tb:.2f}TB', fill=C_T2, font=Font3, anchor="mm")
+
+        # EXEC
+        x = -80
+        y = -90
+        draw.text((120 + x, 108 + y), 'EXEC', fill=C_T2, font=Font2, anchor="mm")
+        draw.text((120 + x, 140 + y), map_status(snap.exec), fill=status_color(snap, 'exec'), font=Font4, anchor="mm")
+
+        # NODE
+        x = 0
+        y = -90
+        draw.text((120 + x, 108 + y), 'NODE', fill=C_T2, font=Font2, anchor="mm")
+        draw.text((120 + x, 140 + y), map_status(snap.node), fill=status_color(snap, 'node'), font=Font4, anchor="mm")
+
+        # CONS
+        x = 80
+        y = -90
+        draw.text((120 + x, 108 + y), 'CONS', fill=C_T2, font=Font2, anchor="mm")
+        draw.text((120 + x, 140 + y), map_status(snap.cons), fill=status_color(snap, 'cons'), font=Font4, anchor="mm")
+
+        # RAM
+        x = 80
+        y = 0
+        draw.text((120 + x, 108 + y), 'RAM', fill=C_T2, font=Font2, anchor="mm")
+        draw.text((120 + x, 140 + y), f'{int(snap.mem_percent)}', fill=C_T1, font=Font1, anchor="mm")
+        draw.text((145 + x, 170 + y), '%', fill=C_T2, font=Font2, anchor="mm")
+
+        # SWAP
+        # x = 80
+        # y = 0
+        # draw.text((120 + x, 108 + y), 'SWAP', fill=C_T2, font=Font2, anchor="mm")
+        # draw.text((120 + x, 140 + y), f'{int(snap.swap_percent)}', fill=C_T1, font=Font1, anchor="mm")
+        # draw.text((145 + x, 170 + y), '%', fill=C_T2, font=Font2, anchor="mm")
+
+        # Local IP / HostName
+        x = 40
+        y = 95
+        draw.text((120, 108 + y), 'IP / HOSTNAME', fill=C_T2, font=Font2, anchor="mm")
+        draw.text((120, 170 + y - 35), f'{snap.ip}', fill=C_T1, font=Font3, anchor="mm")
+        draw.text((120, 170 + y - 10), f'{snap.hostname}.local', fill=C_T1, font=Font3, anchor="mm")
+
+    def compose(self, frames, background, snap, tick, refresh_static, now=None):
+        """
+        Composes the next dashboard frame into `frames.frame`.
+
+        Args:
+            frames (FramePool): Target buffers.
+            background (PIL.Image): Dashboard background.
+            snap (Snapshot): Values to show.
+            tick (int): Animation tick.
+            refresh_static (bool): Redraw the cells if a shown value changed, otherwise the cached static
+                layer is reused.
+            now (float): Time shown on the install screen, the current time by default (replay sets it).
+
+        Returns:
+            tuple: Content key of the frame for the power manager.
+        """
+        if snap.install_stage != 100:
+            spinner, blink = self.advance_install(snap)
+            frames.begin_frame(self.install.compose(snap, spinner, blink, now))
+            return install_content_key(snap)
+
+        if refresh_static:
+            key = static_key(snap, self.show_per_core)
+            drawn = self.static_drawn
+            if drawn is None or drawn[0] is not frames or drawn[1] is not background or drawn[2] != key:
+                self.draw_static(frames.begin_static(background), snap)
+                self.static_drawn = (frames, background, key)
+        draw_dashboard_animation(frames.begin_frame(), tick)
+        return dashboard_content_key(snap)
+
+    def render_install(self, snap, now=None):
+        """
+        Renders one frame of the install progress screen with PIL and advances its animation.
+
+        The reference for InstallScreen, which compose() uses.
+
+        Returns:
+            PIL.Image: RGBA frame.
+        """
+        spinner, blink = self.advance_install(snap)
+        image1 = self.install.backdrop.copy()
+        draw = ImageDraw.Draw(image1)
+        for kind, xy, text, fill, font, anchor in install_layout(snap):
+            if kind == 'spinner':
+                text = text.format(spinner)
+            elif kind == 'blink':
+                fill = blink
+            elif kind == 'clock':
+                text = time.strftime(text, time.localtime(now))
+            draw.text(xy, text, fill=fill, font=getattr(self, font), anchor=anchor)
+        return image1
+
+    def advance_install(self, snap):
+        """
+        Advances the install screen animation by one frame.
+
+        Returns:
+            tuple: (spinner dots, color of the blinking hint)
+        """
+        self.spinner = update_spinner(self.spinner)
+        blink = C_T1
+        if snap.ip != None and mask_to_errors(snap.errors)["any"]:
+            blink = C_T_RED if self.error_msg_color == 0 else C_T1
+            self.error_msg_color = 1 - self.error_msg_color
+        return self.spinner, blink
+
+
+def install_layout(snap):
+    """
+    Text of the install progress screen in drawing order.
+
+    Returns:
+        list: (kind, xy, text, fill, font, anchor) tuples. `kind` is None for text that only
+            changes with the state, 'spinner' (`text` takes the dots with format()), 'blink'
+            (`fill` alternates) or 'clock' (`text` is a time.strftime() format).
+    """
+    error_in_stage = mask_to_errors(snap.errors)
+    install_stage = snap.install_stage
+    items = []
+    if install_stage in (0, 1, 2):
+        for stage in range(install_stage + 1):
+            y = (stage + 1) * 35 + 60
+            if error_in_stage[str(stage)]:
+                items.append((None, (10, y), f'Stage {stage}: ERROR', C_T_RED, 'Font2', "lt"))
+            elif stage < install_stage:
+                items.append((None, (10, y), f'Stage {stage}: DONE', C_T_GREEN, 'Font2', "lt"))
+            else:
+                items.append(('spinner', (10, y), f'Stage {stage}: {{}} ', C_T2, 'Font2', "lt"))
+        items.append((None, (120, (install_stage + 2) * 35 + 65), f'{snap.status}', C_T1, 'Font3', "mm"))
+
+    if snap.ip != None:
+        if error_in_stage["any"]:
+            items.append(('blink', (120, 5*35+60), 'For more info visit:', None, 'Font3_5', "mm"))
+        else:
+            items.append((None, (120, 5*35+60), 'For more info visit:', C_T1, 'Font3_5', "mm"))
+        items.append(('clock', (120, 10), '%d.%m.%y %H:%M:%S', C_T2, 'Font3_5', "mm"))
+        items.append((None, (120, 5*35+80), f'http://{snap.ip}', C_T1, 'Font3_5', "mm"))
+    return items
+
+
+class InstallScreen:
+    """
+    The install progress screen composed from cached layers instead of redrawn.
+
+    The background and logo are loaded once. For every install state (stage,
+    errors, status, address) a base frame with all text that only changes
+    with the state is drawn once. Each animated item - spinner dots, blinking
+    hint, clock - gets row slabs of that base with one variant drawn in from
+    pre-rasterized glyphs, built the first time the variant is needed (the
+    clock keeps only the current second). A frame is a copy of the base plus
+    one slab per animated item, neither PIL nor the disk is touched.
+    """
+
+    def __init__(self, fonts, width=240, height=280):
+        self.fonts = fonts
+        self.backdrop = Image.open('./img/lcdbg.png').convert("RGBA")
+        logo = Image.open('./img/web3-pi-logo-240x70.png')
+        self.backdrop.paste(logo, (0, 25), logo)
+        self.height = height
+        self.frame = np.zeros((height, width, 3), dtype=np.uint8)
+        self.state = None
+        self.base = None
+        self.animated = []
+        self.slabs = {}
+        self.builds = 0
+
+    def rows(self, xy, text, font, anchor):
+        """Rows any variant of `text` can touch, with a margin for anti-aliasing"""
+        top, bottom = font.getbbox(text, anchor=anchor)[1::2]
+        return max(0, int(xy[1]) + top - 2), min(self.height, int(xy[1]) + bottom + 2)
+
+    def build(self, snap):
+        base = self.backdrop.copy()
+        draw = ImageDraw.Draw(base)
+        self.animated = []
+        for kind, xy, text, fill, font, anchor in install_layout(snap):
+            font = self.fonts[font]
+            if kind is None:
+                draw.text(xy, text, fill=fill, font=font, anchor=anchor)
+                continue
+            sample = {'spinner': text.format('...'), 'blink': text, 'clock': '00.00.00 00:00:00'}[kind]
+            self.animated.append((kind, xy, text, fill, font, anchor, self.rows(xy, sample, font, anchor)))
+        self.base = np.array(base.convert('RGB'))
+        self.slabs = {}
+        self.builds += 1
+
+    def slab(self, key, rows, xy, text, fill, font, anchor):
+        slab = self.slabs.get(key)
+        if slab is None:
+            top, bottom = rows
+            slab = self.base[top:bottom].copy()
+            ArrayDraw(slab).text((xy[0], xy[1] - top), text, fill=fill, font=font, anchor=anchor)
+            self.slabs[key] = slab
+        return slab
+
+    def compose(self, snap, spinner, blink, now=None):
+        """
+        Returns:
+            numpy.ndarray: (height, width, 3) RGB frame, reused by the next call.
+        """
+        state = (snap.install_stage, snap.errors, snap.status, snap.ip)
+        if state != self.state:
+            self.build(snap)
+            self.state = state
+        np.copyto(self.frame, self.base)
+        for kind, xy, text, fill, font, anchor, rows in self.animated:
+            if kind == 'spinner':
+                text = text.format(spinner)
+                key = (kind, text)
+            elif kind == 'blink':
+                fill = blink
+                key = (kind, fill)
+            else:
+                text = time.strftime(text, time.localtime(now))
+                key = (kind, text)
+                if key not in self.slabs:
+                    self.slabs = {k: v for k, v in self.slabs.items() if k[0] != 'clock'}
+            self.frame[rows[0]:rows[1]] = self.slab(key, rows, xy, text, fill, font, anchor)
+        return self.frame
+
+
+def draw_dashboard_animation(draw, tick):
+    # Activity Pulse at bottom
+    base_y = 275
+    width = 240
+    phase = tick * 0.1 # speed
+
+    # Draw a sine wave
+    points = []
+    for x in range(0, width, 4):
+        y_off = math.sin((x * 0.05) + phase) * 3
+        points.append((x, base_y + y_off))
+
+    draw.line(points, fill=(0, 255, 0, 80), width=2)
@@ -0,0 +1,105 @@
+import numpy as np
+from PIL import Image, ImageDraw
+
+
+def shared_image(array):
+    """
+    Wraps an (height, width, 4) uint8 array in a PIL RGBA image sharing its memory.
+
+    PIL marks images created by frombuffer() as read-only and would copy them on
+    the first draw, clearing the flag keeps every paste/draw writing into `array`.
+    """
+    height, width = array.shape[:2]
+    image = Image.frombuffer('RGBA', (width, height), array, 'raw', 'RGBA', 0, 1)
+    image.readonly = 0
+    return image
+
+
+def pack_rgb565(rgb, out, word, part):
+    """
+    Packs the first three channels of an (height, width, 3+) uint8 array into RGB565 words
+    using the preallocated (height, width) uint16 scratch arrays `word` and `part`.
+    """
+    np.bitwise_and(rgb[..., 0], 0xF8, out=word)
+    np.left_shift(word, 8, out=word)
+    np.bitwise_and(rgb[..., 1], 0xFC, out=part)
+    np.left_shift(part, 3, out=part)
+    np.bitwise_or(word, part, out=word)
+    np.right_shift(rgb[..., 2], 3, out=part)
+    np.bitwise_or(word, part, out=out)
+    return out
+
+
+def unpack_rgb565(rgb565):
+    """
+    Expands (height, width) RGB565 words back to a PIL RGB image, the low bits
+    are filled by bit replication. Used for screenshots, not per frame.
+    """
+    word = rgb565.astype(np.uint16)
+    rgb = np.empty(word.shape + (3,), dtype=np.uint8)
+    r, g, b = word >> 11, (word >> 5) & 0x3F, word & 0x1F
+    rgb[..., 0] = (r << 3) | (r >> 2)
+    rgb[..., 1] = (g << 2) | (g >> 4)
+    rgb[..., 2] = (b << 3) | (b >> 2)
+    return Image.fromarray(rgb, 'RGB')
+
+
+class FramePool:
+    """
+    Fixed set of frame buffers allocated once at startup and reused every frame.
+
+    static  - RGBA canvas for the layer redrawn about once per second
+    frame   - RGBA canvas for the frame being shown (static layer + animation)
+    rgb565  - the frame converted to RGB565, big-endian as the panel expects
+
+    All conversions write into preallocated arrays (numpy `out=`), so a steady
+    state frame does not allocate anything proportional to the frame size.
+    `rgb565` may be given to place the output in another buffer (shared memory).
+    """
+
+    def __init__(self, width=240, height=280, rgb565=None):
+        self.width = width
+        self.height = height
+
+        self.static_rgba = np.zeros((height, width, 4), dtype=np.uint8)
+        self.static = shared_image(self.static_rgba)
+        self.static_draw = ImageDraw.Draw(self.static)
+
+        self.frame_rgba = np.zeros((height, width, 4), dtype=np.uint8)
+        self.frame = shared_image(self.frame_rgba)
+        self.frame_draw = ImageDraw.Draw(self.frame)
+
+        if rgb565 is None:
+            rgb565 = np.zeros((height, width), dtype='>u2')
+        self.rgb565 = rgb565
+        self.rgb565_bytes = self.rgb565.reshape(-1).view(np.uint8)
+        self._word = np.zeros((height, width), dtype=np.uint16)
+        self._part = np.zeros((height, width), dtype=np.uint16)
+
+    def begin_static(self, background):
+        """Resets the static layer to `background` in place and returns its ImageDraw"""
+        self.static.paste(background)
+        return self.static_draw
+
+    def begin_frame(self, base=None):
+        """
+        Copies `base` (the static layer by default, a PIL image or an (height, width, 3) RGB array)
+        into the frame canvas and returns its ImageDraw
+        """
+        if base is None:
+            np.copyto(self.frame_rgba, self.static_rgba)
+        elif isinstance(base, np.ndarray):
+            np.copyto(self.frame_rgba[..., :3], base)
+            self.frame_rgba[..., 3] = 255
+        else:
+            self.frame.paste(base)
+        return self.frame_draw
+
+    def convert(self):
+        """
+        RGBA frame -> RGB565 words, the same bit layout as LCD_1inch69.ShowImage.
+
+        Returns:
+            numpy.ndarray: (height, width) big-endian uint16 view ready for the SPI transport.
+        """
+        return pack_rgb565(self.frame_rgba, self.rgb565, self._word, self._part)
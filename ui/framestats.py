@@ -0,0 +1,63 @@
+import time
+import logging
+import numpy as np
+
+
+class FrameStats:
+    """
+    Frame interval statistics over the last `window` frames.
+
+    Intervals go into a preallocated ring buffer, percentiles are computed only
+    when a report is requested, so recording a frame costs one clock read.
+    """
+
+    def __init__(self, name, target_interval, window=600):
+        self.name = name
+        self.target_interval = target_interval
+        self.intervals = np.zeros(window, dtype=np.float64)
+        self.window = window
+        self.count = 0
+        self.last = None
+
+    def tick(self, now=None):
+        """Records the start of a frame"""
+        if now is None:
+            now = time.perf_counter()
+        if self.last is not None:
+            self.intervals[self.count % self.window] = now - self.last
+            self.count += 1
+        self.last = now
+
+    def add(self, seconds):
+        """Records a duration measured by the caller (e.g. composition time) instead of an interval"""
+        self.intervals[self.count % self.window] = seconds
+        self.count += 1
+
+    def summary(self):
+        """
+        Returns:
+            dict: fps, mean/p50/p95/p99/max interval and jitter (std deviation) in milliseconds, or None.
+        """
+        n = min(self.count, self.window)
+        if n == 0:
+            return None
+        samples = self.intervals[:n] * 1000
+        p50, p95, p99 = np.percentile(samples, (50, 95, 99))
+        mean = float(samples.mean())
+        return {
+            'frames': self.count,
+            'fps': 1000 / mean if mean else 0,
+            'mean': mean,
+            'p50': float(p50),
+            'p95': float(p95),
+            'p99': float(p99),
+            'max': float(samples.max()),
+            'jitter': float(samples.std()),
+        }
+
+    def log(self):
+        s = self.summary()
+        if s is None:
+            return
+        logging.info(f"{self.name}: {s['fps']:.1f} FPS, interval p50 {s['p50']:.1f} ms, p99 {s['p99']:.1f} ms, "
+                     f"max {s['max']:.1f} ms, jitter {s['jitter']:.1f} ms (target {self.target_interval * 1000:.0f} ms)")
@@ -0,0 +1,103 @@
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+from ui.dashboard import FONT_PATH, C_T1, C_T2, C_T_GREEN
+
+C_GRID = '#334155'
+C_BLOCK = '#38BDF8'
+C_PEERS = '#F472B6'
+C_EXEC = C_T_GREEN
+C_NODE = '#60A5FA'
+C_CONS = '#FACC15'
+
+# (top, bottom) of the plot area of each panel
+BLOCK_PLOT = (52, 108)
+PEERS_PLOT = (136, 190)
+STATUS_PLOT = (218, 276)
+
+
+class HistoryPage:
+    """
+    A page with block height, peer count and client status history over one window.
+
+    Renders from HistoryCache data only, and only when that data changed (a new
+    bucket closed) or the page is entered, so showing it costs nothing between
+    cache refreshes.
+    """
+
+    def __init__(self, cache, window):
+        self.cache = cache
+        self.source = cache
+        self.window = window
+        self.background = Image.open('./img/lcdbg.png').convert("RGBA")
+        self.Font3 = ImageFont.truetype(FONT_PATH, 20)
+        self.Font4 = ImageFont.truetype(FONT_PATH, 15)
+
+    def current(self):
+        """
+        Returns:
+            tuple: (version, HistoryData or None), the version changes with the data.
+        """
+        data = self.cache.get(self.window)
+        return (data.version if data is not None else 0), data
+
+    def render(self, data):
+        image = self.background.copy()
+        draw = ImageDraw.Draw(image)
+        draw.text((120, 14), f'HISTORY {self.window.upper()}', fill=C_T2, font=self.Font3, anchor="mm")
+        if data is None:
+            draw.text((120, 140), 'waiting for data', fill=C_T2, font=self.Font4, anchor="mm")
+            return image
+
+        times, values = data.series['block']
+        label = 'BLOCK'
+        if len(values) >= 2 and times[-1] > times[0]:
+            label += f' +{(values[-1] - values[0]) / (times[-1] - times[0]) * 60:.1f}/min'
+        self.panel(draw, label, self.latest(values, '{:,.0f}'), BLOCK_PLOT)
+        self.plot(draw, data, [('block', C_BLOCK)], BLOCK_PLOT)
+
+        _, values = data.series['peers']
+        self.panel(draw, 'PEERS', self.latest(values, '{:.0f}'), PEERS_PLOT)
+        self.plot(draw, data, [('peers', C_PEERS)], PEERS_PLOT, low=0)
+
+        self.panel(draw, 'EXEC NODE CONS', '', STATUS_PLOT)
+        for x, color in ((8, C_EXEC), (53, C_NODE), (98, C_CONS)):
+            draw.line([(x, STATUS_PLOT[0] - 8), (x + 36, STATUS_PLOT[0] - 8)], fill=color, width=2)
+        self.plot(draw, data, [('exec', C_EXEC), ('node', C_NODE), ('cons', C_CONS)], STATUS_PLOT, low=0, high=100)
+        return image
+
+    @staticmethod
+    def latest(values, fmt):
+        return fmt.format(values[-1]) if len(values) else '-'
+
+    def panel(self, draw, label, value, plot):
+        top = plot[0] - 24
+        draw.text((6, top), label, fill=C_T2, font=self.Font4, anchor="la")
+        draw.text((234, top), value, fill=C_T1, font=self.Font4, anchor="ra")
+        draw.line([(0, plot[1] + 1), (240, plot[1] + 1)], fill=C_GRID, width=1)
+
+    @staticmethod
+    def plot(draw, data, names, area, low=None, high=None):
+        """Draws the series as polylines, one point per bucket, broken where buckets are missing"""
+        top, bottom = area
+        series = [(data.series[name], color) for name, color in names]
+        everything = [values for (_, values), _ in series if len(values)]
+        if not everything:
+            return
+        joined = np.concatenate(everything)
+        low = joined.min() if low is None else low
+        high = joined.max() if high is None else high
+        span = high - low or 1
+
+        for index, ((times, values), color) in enumerate(series):
+            if not len(values):
+                continue
+            columns = (times - data.start) // data.bucket
+            # Overlapping series (e.g. all clients at 100%) stay visible 2 px apart
+            ys = bottom - (values - low) / span * (bottom - top - 2 * index) - 2 * index
+            # Split into runs of consecutive buckets
+            breaks = np.nonzero(np.diff(columns) != 1)[0] + 1
+            for run_x, run_y in zip(np.split(columns, breaks), np.split(ys, breaks)):
+                points = list(zip(run_x.tolist(), run_y.tolist()))
+                if len(points) == 1:
+                    points.append((points[0][0] + 1, points[0][1]))
+                draw.line(points, fill=color, width=1)
@@ -0,0 +1,67 @@
+from PIL import Image, ImageDraw, ImageFont
+from ui.dashboard import FONT_PATH, C_T1, C_T2
+
+C_GRID = '#334155'
+C_CORE_BAR = '#14532D'
+C_CORE_HOT = '#7F1D1D'
+
+CORES_AREA = (30, 162)  # (top, bottom) of the per-core rows
+IO_TOP = 170
+ROW_HEIGHT = 24
+
+
+class LoadPage:
+    """
+    A page with the load of every CPU core and the disk and network throughput.
+
+    Renders from LoadSampler results only, once per sample or when the page is
+    entered.
+    """
+
+    def __init__(self, sampler):
+        self.sampler = sampler
+        self.source = sampler
+        self.background = Image.open('./img/lcdbg.png').convert("RGBA")
+        self.Font3 = ImageFont.truetype(FONT_PATH, 20)
+        self.Font4 = ImageFont.truetype(FONT_PATH, 15)
+
+    def current(self):
+        """
+        Returns:
+            tuple: (version, LoadSample or None), the version changes with every sample.
+        """
+        sample = self.sampler.get()
+        return (sample.version if sample is not None else 0), sample
+
+    def render(self, sample):
+        image = self.background.copy()
+        draw = ImageDraw.Draw(image)
+        draw.text((120, 14), 'LOAD', fill=C_T2, font=self.Font3, anchor="mm")
+        if sample is None:
+            draw.text((120, 140), 'sampling', fill=C_T2, font=self.Font4, anchor="mm")
+            return image
+
+        top, bottom = CORES_AREA
+        row = min(ROW_HEIGHT, (bottom - top) // max(1, len(sample.per_core)))
+        for core, percent in enumerate(sample.per_core):
+            y = top + core * row
+            color = C_CORE_HOT if percent >= 90 else C_CORE_BAR
+            if percent > 0:
+                draw.rectangle([(0, y), (max(1, int(240 * percent / 100)), y + row - 3)], fill=color)
+            draw.text((6, y), f'CPU{core}', fill=C_T1, font=self.Font4, anchor="la")
+            draw.text((234, y), f'{percent:.0f}%', fill=C_T1, font=self.Font4, anchor="ra")
+        draw.line([(0, IO_TOP - 4), (240, IO_TOP - 4)], fill=C_GRID, width=1)
+
+        rows = (('DISK READ', sample.disk_read), ('DISK WRITE', sample.disk_write),
+                ('NET IN', sample.net_recv), ('NET OUT', sample.net_sent))
+        for index, (label, rate) in enumerate(rows):
+            y = IO_TOP + index * ROW_HEIGHT
+            draw.text((6, y), label, fill=C_T2, font=self.Font4, anchor="la")
+            draw.text((234, y), self.rate(rate), fill=C_T1, font=self.Font4, anchor="ra")
+        return image
+
+    @staticmethod
+    def rate(value):
+        if value >= 1024 ** 2:
+            return f'{value / 1024 ** 2:.1f} MB/s'
+        return f'{value / 1024:.0f} kB/s'
@@ -0,0 +1,240 @@
+import io
+import time
+import socket
+import logging
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import numpy as np
+from ui.framebuffer import unpack_rgb565
+
+BOUNDARY = b'w3pframe'
+PAGE = b"""<!DOCTYPE html>
+<html><head><title>Web3 Pi Dashboard</title></head>
+<body style="margin:0;background:#111;display:flex;justify-content:center;align-items:center;height:100vh">
+<img src="stream.mjpg" width="240" height="280" alt="dashboard">
+</body></html>
+"""
+
+
+class FrameMirror:
+    """
+    Serves the frame shown on the LCD over HTTP, as a PNG snapshot and an MJPEG stream.
+
+    The render thread only copies the RGB565 frame (no encoding) and only while
+    somebody is watching. A single encoder thread converts frames that actually
+    changed to JPEG once and publishes the bytes to all viewers. Each viewer
+    always gets the newest frame when its socket is ready again, a slow viewer
+    skips frames instead of queueing them. PNG snapshots are encoded on request,
+    at most once per frame.
+
+    Args:
+        port (int): TCP port.
+        host (str): Address to bind, '127.0.0.1' for this machine only, '0.0.0.0' for all interfaces.
+        fps (float): Upper limit of the frame rate sent to viewers.
+        source (callable): Returns the current RGB565 frame, polled by the encoder
+            thread (the shared framebuffer of the render process). Without it
+            frames are pushed with submit().
+    """
+
+    def __init__(self, port=8080, host='127.0.0.1', fps=10, width=240, height=280, quality=80, source=None):
+        self.address = (host, port)
+        self.interval = 1 / fps
+        self.quality = quality
+        self.source = source
+
+        self.viewers = 0
+        self.pending = np.zeros((height, width), dtype='>u2')
+        self.pending_version = 0
+        self.work = np.zeros((height, width), dtype='>u2')
+        self.shown = np.zeros((height, width), dtype='>u2')
+        self.lock = threading.Lock()
+        self.submitted = threading.Event()
+
+        # Published frame, guarded by `published`
+        self.published = threading.Condition()
+        self.version = 0
+        self.image = None
+        self.jpeg = None
+        self.png = None
+        self.png_version = -1
+
+        self.encoded = 0
+        self.skipped = 0
+        self.stopped = False
+        self.server = None
+
+    def start(self):
+        handler = type('MirrorHandler', (MirrorHandler,), {'mirror': self})
+        self.server = ThreadingHTTPServer(self.address, handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, name='mirror-http', daemon=True).start()
+        threading.Thread(target=self._encode_loop, name='mirror-encoder', daemon=True).start()
+        logging.info(f"Mirror: Serving http://{self.address[0]}:{self.address[1]}/")
+
+    def stop(self):
+        self.stopped = True
+        self.submitted.set()
+        with self.published:
+            self.published.notify_all()
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+
+    def submit(self, rgb565):
+        """Offers the frame just sent to the LCD, called from the render thread"""
+        if self.viewers == 0:
+            return
+        with self.lock:
+            np.copyto(self.pending, rgb565)
+            self.pending_version += 1
+        self.submitted.set()
+
+    def _take(self, seen):
+        """Copies the newest frame into self.work, returns its version (unchanged if there is none)"""
+        if self.source is not None:
+            frame = self.source()
+            if frame is None:
+                return seen
+            np.copyto(self.work, frame)
+            return seen + 1
+        self.submitted.wait(self.interval)
+        self.submitted.clear()
+        with self.lock:
+            if self.pending_version == seen:
+                return seen
+            np.copyto(self.work, self.pending)
+            return self.pending_version
+
+    def _encode_loop(self):
+        seen = 0
+        idle = True
+        while not self.stopped:
+            if self.viewers == 0:
+                # Frames submitted before the last viewer left are stale by the time the next one arrives
+                idle = True
+                seen = self.pending_version
+                time.sleep(self.interval)
+                continue
+            start = time.perf_counter()
+            version = self._take(seen)
+            if version != seen:
+                seen = version
+                # After an idle period the first frame is always published, even if unchanged
+                if not idle and np.array_equal(self.work, self.shown):
+                    self.skipped += 1
+                else:
+                    idle = False
+                    self.work, self.shown = self.shown, self.work
+                    self._publish(self.shown)
+            time.sleep(max(0, self.interval - (time.perf_counter() - start)))
+
+    def _publish(self, rgb565):
+        image = unpack_rgb565(rgb565)
+        buffer = io.BytesIO()
+        image.save(buffer, 'JPEG', quality=self.quality)
+        with self.published:
+            self.image = image
+            self.jpeg = buffer.getvalue()
+            self.version += 1
+            self.published.notify_all()
+        self.encoded += 1
+
+    def wait_frame(self, seen, timeout=5):
+        """
+        Waits for a frame newer than version `seen`.
+
+        Returns:
+            tuple: (version, jpeg bytes), the same `seen` version on timeout.
+        """
+        with self.published:
+            self.published.wait_for(lambda: self.version != seen or self.stopped, timeout)
+            return self.version, self.jpeg
+
+    def snapshot_png(self):
+        """PNG of the newest frame, encoded once per frame however many clients ask"""
+        with self.published:
+            if self.png_version != self.version:
+                buffer = io.BytesIO()
+                self.image.save(buffer, 'PNG')
+                self.png = buffer.getvalue()
+                self.png_version = self.version
+            return self.png
+
+    def watching(self, delta):
+        """
+        Registers (+1) or unregisters (-1) a viewer.
+
+        Returns:
+            int: Version of the newest frame, it is stale if there were no viewers before.
+        """
+        with self.published:
+            version = self.version if self.viewers else -1
+            self.viewers += delta
+            return version
+
+
+class MirrorHandler(BaseHTTPRequestHandler):
+    mirror = None
+
+    def log_message(self, format, *args):
+        logging.debug("Mirror: " + format % args)
+
+    def setup(self):
+        super().setup()
+        # Keep the kernel from buffering many frames for a slow viewer
+        self.connection.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 64 * 1024)
+        self.connection.settimeout(10)
+
+    def do_GET(self):
+        path = self.path.split('?')[0]
+        if path in ('/', '/index.html'):
+            self._send(200, 'text/html', PAGE)
+        elif path == '/frame.png':
+            self._snapshot()
+        elif path == '/stream.mjpg':
+            self._stream()
+        else:
+            self._send(404, 'text/plain', b'Not found')
+
+    def _send(self, code, content_type, body):
+        self.send_response(code)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _snapshot(self):
+        mirror = self.mirror
+        seen = mirror.watching(1)
+        try:
+            if seen == -1:
+                # The encoder was idle, wait for it to publish the current frame
+                seen, _ = mirror.wait_frame(mirror.version, timeout=2)
+        finally:
+            mirror.watching(-1)
+        if seen == 0:
+            self._send(503, 'text/plain', b'No frame yet')
+            return
+        self._send(200, 'image/png', mirror.snapshot_png())
+
+    def _stream(self):
+        mirror = self.mirror
+        self.send_response(200)
+        self.send_header('Content-Type', 'multipart/x-mixed-replace; boundary=' + BOUNDARY.decode())
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        mirror.watching(1)
+        try:
+            seen = 0
+            while not mirror.stopped:
+                version, jpeg = mirror.wait_frame(seen)
+                if version == seen:
+                    continue
+                seen = version
+                self.wfile.write(b'--' + BOUNDARY + b'\r\nContent-Type: image/jpeg\r\nContent-Length: '
+                                 + str(len(jpeg)).encode() + b'\r\n\r\n' + jpeg + b'\r\n')
+        except (OSError, ValueError):
+            pass  # Viewer went away or stalled past the socket timeout
+        finally:
+            mirror.watching(-1)
@@ -0,0 +1,187 @@
+import numpy as np
+from PIL import Image, ImageDraw, ImageColor
+from ui.framebuffer import pack_rgb565
+
+# Vertical anchor -> probe anchor used to measure its offset from the baseline
+VERTICAL_ANCHORS = {'a': 'la', 't': 'lt', 'm': 'lm', 's': 'ls', 'b': 'lb', 'd': 'ld'}
+
+
+class GlyphAtlas:
+    """
+    Pre-rasterized glyphs of one font as 8-bit coverage masks.
+
+    Each glyph is rendered once by PIL at its baseline origin, strings are then
+    assembled by placing glyphs at integer pen positions. For the monospaced
+    JetBrains Mono this matches PIL's own text rendering pixel for pixel.
+    """
+
+    def __init__(self, font):
+        self.font = font
+        self.glyphs = {}
+        self.vertical = {}
+
+    def glyph(self, ch):
+        glyph = self.glyphs.get(ch)
+        if glyph is None:
+            left, top, right, bottom = self.font.getbbox(ch, anchor='ls')
+            mask = Image.new('L', (max(1, right - left), max(1, bottom - top)), 0)
+            ImageDraw.Draw(mask).text((-left, -top), ch, fill=255, font=self.font, anchor='ls')
+            glyph = (np.asarray(mask).astype(np.uint32), left, top, int(self.font.getlength(ch)))
+            self.glyphs[ch] = glyph
+        return glyph
+
+    def origin(self, text, xy, anchor):
+        """Baseline origin of `text` drawn at `xy` with a PIL text anchor"""
+        x, y = int(xy[0]), int(xy[1])
+        horizontal, vertical = anchor[0], anchor[1]
+        if horizontal != 'l':
+            width = sum(self.glyph(ch)[3] for ch in text)
+            x += -(width // 2) - (width % 2) if horizontal == 'm' else -width
+        if vertical != 's':
+            shift = self.vertical.get(vertical)
+            if shift is None:
+                probe = VERTICAL_ANCHORS[vertical]
+                shift = self.font.getbbox('0', anchor=probe)[1] - self.font.getbbox('0', anchor='ls')[1]
+                self.vertical[vertical] = shift
+            y += shift
+        return x, y
+
+
+class ArrayDraw:
+    """
+    The subset of ImageDraw the dashboard uses (text and lines), drawing into a numpy array.
+
+    The target is either an (height, width, 3) uint8 RGB array, where text is
+    alpha blended exactly like PIL does, or an (height, width) RGB565 array for
+    solid lines. Lines are assembled from per-segment pixel patterns that PIL
+    rasterizes once per (dx, dy, width), so they match PIL's wide lines exactly.
+    """
+
+    atlases = {}
+    segments = {}
+    colors = {}
+
+    def __init__(self, target):
+        self.target = target
+        self.rgb565 = target.ndim == 2
+        self.height, self.width = target.shape[:2]
+
+    def _color(self, fill):
+        color = self.colors.get(fill)
+        if color is None:
+            rgb = ImageColor.getrgb(fill) if isinstance(fill, str) else fill
+            r, g, b = rgb[:3]
+            color = ((r, g, b), ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3))
+            self.colors[fill] = color
+        return color
+
+    def text(self, xy, text, fill=None, font=None, anchor='la'):
+        if self.rgb565:
+            raise TypeError("text() needs an (height, width, 3) RGB target for blending, not an RGB565 one")
+        atlas = self.atlases.get(font)
+        if atlas is None:
+            atlas = self.atlases[font] = GlyphAtlas(font)
+        ink = np.array(self._color(fill)[0], dtype=np.uint32)
+        pen, baseline = atlas.origin(text, xy, anchor)
+
+        for ch in text:
+            mask, left, top, advance = atlas.glyph(ch)
+            x0, y0 = pen + left, baseline + top
+            pen += advance
+            x1, y1 = x0 + mask.shape[1], y0 + mask.shape[0]
+            cx0, cy0, cx1, cy1 = max(x0, 0), max(y0, 0), min(x1, self.width), min(y1, self.height)
+            if cx0 >= cx1 or cy0 >= cy1:
+                continue
+            m = mask[cy0 - y0:cy1 - y0, cx0 - x0:cx1 - x0, None]
+            region = self.target[cy0:cy1, cx0:cx1]
+            # PIL's BLEND: (in1 * (255 - m) + in2 * m + 128) / 255 with rounding
+            tmp = region * (255 - m) + ink * m + 128
+            region[...] = ((tmp >> 8) + tmp) >> 8
+
+    def _segment(self, dx, dy, width):
+        key = (dx, dy, width)
+        offsets = self.segments.get(key)
+        if offsets is None:
+            pad = width + 2
+            ox, oy = pad + max(0, -dx), pad + max(0, -dy)
+            scratch = Image.new('1', (abs(dx) + 2 * pad + 1, abs(dy) + 2 * pad + 1), 0)
+            ImageDraw.Draw(scratch).line([(ox, oy), (ox + dx, oy + dy)], fill=1, width=width)
+            ys, xs = np.nonzero(np.asarray(scratch))
+            offsets = self.segments[key] = (ys - oy, xs - ox)
+        return offsets
+
+    def line(self, xy, fill=None, width=0, joint=None):
+        points = np.asarray(xy, dtype=np.float64).astype(np.int64)  # truncation, like PIL
+        starts = points[:-1]
+        deltas = points[1:] - starts
+        color = self._color(fill)
+        value = color[1] if self.rgb565 else color[0]
+
+        # Segments of the same shape share one pattern, draw them together
+        codes = deltas[:, 0] * 65536 + deltas[:, 1]
+        for code in np.unique(codes):
+            selected = starts[codes == code]
+            dx, dy = deltas[codes == code][0]
+            oy, ox = self._segment(int(dx), int(dy), width)
+            ys = (selected[:, 1, None] + oy).reshape(-1)
+            xs = (selected[:, 0, None] + ox).reshape(-1)
+            inside = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+            self.target[ys[inside], xs[inside]] = value
+
+
+class Rgb565Frames:
+    """
+    Drop-in replacement for FramePool that never touches PIL per frame.
+
+    The static layer is composed in an RGB888 array (exact text blending) and
+    packed to RGB565 once when it changes. Every frame copies the packed layer
+    into the (height, width) big-endian canvas and draws the animation straight
+    into it, so convert() has nothing left to do.
+    """
+
+    def __init__(self, width=240, height=280, rgb565=None):
+        self.width = width
+        self.height = height
+
+        self.static_rgb = np.zeros((height, width, 3), dtype=np.uint8)
+        self.static_draw = ArrayDraw(self.static_rgb)
+        self.static565 = np.zeros((height, width), dtype='>u2')
+        self._static_dirty = False
+
+        if rgb565 is None:
+            rgb565 = np.zeros((height, width), dtype='>u2')
+        self.rgb565 = rgb565
+        self.frame_draw = ArrayDraw(self.rgb565)
+        self._word = np.zeros((height, width), dtype=np.uint16)
+        self._part = np.zeros((height, width), dtype=np.uint16)
+        self._backgrounds = {}
+
+    def _rgb(self, image):
+        """RGB array of a background image, converted only the first time it is seen"""
+        entry = self._backgrounds.get(id(image))
+        if entry is None or entry[0] is not image:
+            entry = self._backgrounds[id(image)] = (image, np.array(image.convert('RGB')))
+        return entry[1]
+
+    def begin_static(self, background):
+        np.copyto(self.static_rgb, self._rgb(background))
+        self._static_dirty = True
+        return self.static_draw
+
+    def begin_frame(self, base=None):
+        if isinstance(base, np.ndarray):
+            # Full RGB frames (install screen), a few per second at most
+            pack_rgb565(base, self.rgb565, self._word, self._part)
+            return self.frame_draw
+        if base is not None:
+            # Full frames rendered by PIL (pages)
+            pack_rgb565(np.asarray(base.convert('RGB')), self.rgb565, self._word, self._part)
+            return self.frame_draw
+        if self._static_dirty:
+            pack_rgb565(self.static_rgb, self.static565, self._word, self._part)
+            self._static_dirty = False
+        np.copyto(self.rgb565, self.static565)
+        return self.frame_draw
+
+    def convert(self):
+        return self.rgb565
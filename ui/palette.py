@@ -0,0 +1,111 @@
+import numpy as np
+
+# Themes only describe colors, the lookup tables are derived from them once in set_theme()
+DEFAULT_THEME = {
+    # Color of out-of-range gradient values, same as the LCD background
+    'background': (0x00, 0x12, 0x9A),
+    # CPU usage gradient: green -> yellow (half of the range) -> red
+    'cpu_gradient': ((0, 255, 0), (255, 255, 0), (255, 0, 0)),
+    # Client status bands (active_percent) as (name, lowest, highest, color)
+    'status': (
+        ('inactive', 0, 25, (255, 0, 0)),
+        ('waiting', 26, 45, (255, 255, 0)),
+        ('syncing', 46, 76, (255, 165, 0)),
+        ('synced', 77, 100, (0, 255, 0)),
+    ),
+    'status_unknown': ('unknown', (255, 255, 255)),
+}
+
+
+def rgb_to_rgb565(r, g, b):
+    """Packs an RGB888 color into an RGB565 word, the same way LCD_1inch69.ShowImage does"""
+    return ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
+
+
+class ColorTable:
+    """
+    Color lookup table for integer values 0..size-1.
+
+    `rgb` holds tuples ready for PIL, `rgb565` the same colors as panel words
+    for drawing straight into a framebuffer. Values outside the table map to
+    the fallback color.
+    """
+
+    def __init__(self, colors, fallback):
+        self.rgb = list(colors)
+        self.rgb565 = np.array([rgb_to_rgb565(*c) for c in self.rgb], dtype=np.uint16)
+        self.fallback = fallback
+        self.fallback565 = rgb_to_rgb565(*fallback)
+        self.size = len(self.rgb)
+
+    def color(self, value):
+        if 0 <= value < self.size:
+            return self.rgb[int(value)]
+        return self.fallback
+
+    def color565(self, value):
+        if 0 <= value < self.size:
+            return int(self.rgb565[int(value)])
+        return self.fallback565
+
+
+class StatusTable(ColorTable):
+    """ColorTable for client status values that also resolves the status name"""
+
+    def __init__(self, bands, unknown):
+        names = []
+        colors = []
+        for name, low, high, color in bands:
+            names.extend([name] * (high - low + 1))
+            colors.extend([color] * (high - low + 1))
+        super().__init__(colors, unknown[1])
+        self.names = names
+        self.unknown = unknown[0]
+
+    def name(self, value):
+        if 0 <= value < self.size:
+            return self.names[int(value)]
+        return self.unknown
+
+
+def build_gradient(size, stops):
+    """
+    Interpolates a three stop gradient over 0..size-1, the midpoint is the middle stop.
+    Mirrors the integer truncation of the original hex color helpers.
+    """
+    start, middle, end = stops
+    half = (size - 1) / 2
+    colors = []
+    for value in range(size):
+        if value <= half:
+            ratio = value / half
+            low, high = start, middle
+        else:
+            ratio = (value - half) / half
+            low, high = middle, end
+        colors.append(tuple(int(low[i] + ratio * (high[i] - low[i])) for i in range(3)))
+    return colors
+
+
+class Palette:
+    """All lookup tables of one theme"""
+
+    def __init__(self, theme):
+        self.theme = theme
+        self.background = theme['background']
+        self.cpu_100 = ColorTable(build_gradient(101, theme['cpu_gradient']), theme['background'])
+        self.cpu_400 = ColorTable(build_gradient(401, theme['cpu_gradient']), theme['background'])
+        self.status = StatusTable(theme['status'], theme['status_unknown'])
+
+
+active = Palette(DEFAULT_THEME)
+
+
+def set_theme(theme):
+    """
+    Builds the tables of a new theme and swaps them in with a single assignment,
+    renderers always read `palette.active` so they never see a half built theme.
+    """
+    global active
+    active = Palette(theme)
+    return active
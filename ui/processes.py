@@ -0,0 +1,70 @@
+from PIL import Image, ImageDraw, ImageFont
+from ui.dashboard import FONT_PATH, C_T1, C_T2
+
+C_GRID = '#334155'
+C_CPU_BAR = '#14532D'
+C_RSS_BAR = '#1E3A8A'
+
+ROW_HEIGHT = 20
+CPU_TOP = 30
+RSS_TOP = 152
+
+
+class ProcessesPage:
+    """
+    A page with the top processes by CPU and by resident memory.
+
+    Renders from ProcessTable results only, once per scan or when the page is
+    entered; the scanning itself happens in the table's thread.
+    """
+
+    def __init__(self, table):
+        self.table = table
+        self.source = table
+        self.background = Image.open('./img/lcdbg.png').convert("RGBA")
+        self.Font3 = ImageFont.truetype(FONT_PATH, 20)
+        self.Font4 = ImageFont.truetype(FONT_PATH, 15)
+
+    def current(self):
+        """
+        Returns:
+            tuple: (version, ProcessTop or None), the version changes with every scan.
+        """
+        top = self.table.get()
+        return (top.version if top is not None else 0), top
+
+    def render(self, top):
+        image = self.background.copy()
+        draw = ImageDraw.Draw(image)
+        draw.text((120, 14), 'TOP PROCESSES', fill=C_T2, font=self.Font3, anchor="mm")
+        if top is None:
+            draw.text((120, 140), 'scanning', fill=C_T2, font=self.Font4, anchor="mm")
+            return image
+
+        self.section(draw, f'CPU  ({top.count} processes)', CPU_TOP)
+        # Bars are relative to one core, a busy multi-threaded client fills its bar
+        for row, process in enumerate(top.by_cpu):
+            self.row(draw, row, CPU_TOP, process.name, f'{process.cpu:.0f}%', min(process.cpu / 100, 1), C_CPU_BAR)
+
+        self.section(draw, 'MEMORY', RSS_TOP)
+        largest = top.by_rss[0].rss if top.by_rss and top.by_rss[0].rss else 1
+        for row, process in enumerate(top.by_rss):
+            self.row(draw, row, RSS_TOP, process.name, self.size(process.rss), process.rss / largest, C_RSS_BAR)
+        return image
+
+    @staticmethod
+    def size(rss):
+        if rss >= 1024 ** 3:
+            return f'{rss / 1024 ** 3:.1f}G'
+        return f'{rss / 1024 ** 2:.0f}M'
+
+    def section(self, draw, label, top):
+        draw.text((6, top), label, fill=C_T2, font=self.Font4, anchor="la")
+        draw.line([(0, top + 18), (240, top + 18)], fill=C_GRID, width=1)
+
+    def row(self, draw, row, top, name, value, fraction, color):
+        y = top + 20 + row * ROW_HEIGHT
+        if fraction > 0:
+            draw.rectangle([(0, y), (max(1, int(240 * fraction)), y + ROW_HEIGHT - 3)], fill=color)
+        draw.text((6, y), name[:18], fill=C_T1, font=self.Font4, anchor="la")
+        draw.text((234, y), value, fill=C_T1, font=self.Font4, anchor="ra")
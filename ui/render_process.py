@@ -0,0 +1,198 @@
+import os
+import time
+import signal
+import logging
+import importlib
+import multiprocessing
+from multiprocessing import shared_memory
+import numpy as np
+from monitor.snapshot import SharedSnapshot
+
+DISPLAY = 'lcd.LCD_1inch69:LCD_1inch69'
+
+
+def load_class(spec):
+    """Resolves a 'package.module:Class' string, so the spawned process can build its own objects"""
+    module_name, class_name = spec.split(':')
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def apply_scheduling(name, cpus=None, nice=None):
+    """
+    Pins the calling process to `cpus` and sets its absolute nice value.
+    Failures (no permission, unknown core) are logged and ignored.
+    """
+    if cpus:
+        try:
+            os.sched_setaffinity(0, cpus)
+        except (OSError, AttributeError) as e:
+            logging.warning(f"{name}: Cannot pin to CPUs {sorted(cpus)}: {e}")
+    if nice is not None:
+        try:
+            os.setpriority(os.PRIO_PROCESS, 0, nice)
+        except OSError as e:
+            logging.warning(f"{name}: Cannot set nice {nice}: {e}")
+
+
+class RenderProcess:
+    """
+    Runs rendering and SPI transmission in a dedicated process.
+
+    The collector process publishes Snapshots into a SharedSnapshot block, the
+    render process reads them lock-free and writes every frame as big-endian
+    RGB565 into a shared framebuffer before sending it to the panel. JSON
+    decoding, reconnects and psutil sampling in the collector process no longer
+    compete with frame composition for the same GIL.
+    """
+
+    def __init__(self, width=240, height=280, fps=10, show_per_core=False, power_config=None,
+                 cpus=None, nice=None, display=DISPLAY, opening=True, native=True):
+        self.width = width
+        self.height = height
+        self.metrics = SharedSnapshot()
+        self.framebuffer = shared_memory.SharedMemory(create=True, size=width * height * 2)
+        self.frame = np.ndarray((height, width), dtype='>u2', buffer=self.framebuffer.buf)
+
+        context = multiprocessing.get_context('spawn')
+        self.stop_event = context.Event()
+        self.results = context.Queue()
+        # Frame rate and animation, lowered by the governor in the collector process
+        self.fps = context.Value('d', fps, lock=False)
+        self.animate = context.Value('b', 1, lock=False)
+        self.process = context.Process(
+            target=render_main, name='render',
+            args=(self.metrics.name, self.framebuffer.name, width, height, fps, show_per_core, power_config,
+                  cpus, nice, display, opening, native, self.stop_event, self.results, self.fps, self.animate),
+            daemon=True)
+
+    def start(self):
+        self.process.start()
+
+    def publish(self, snapshot):
+        self.metrics.write(snapshot)
+
+    def set_fidelity(self, fps, animate):
+        """Changes the frame rate (at most the initial one) and turns the dashboard animation on or off"""
+        self.fps.value = fps
+        self.animate.value = 1 if animate else 0
+
+    def stop(self, timeout=10):
+        """
+        Stops the render process, it shows the final screen before exiting.
+
+        Returns:
+            dict: Frame statistics reported by the render process, or None.
+        """
+        self.stop_event.set()
+        stats = None
+        try:
+            stats = self.results.get(timeout=timeout)
+        except Exception:
+            logging.warning("Render process: No statistics received")
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.frame = None
+        self.metrics.close(unlink=True)
+        self.framebuffer.close()
+        self.framebuffer.unlink()
+        return stats
+
+
+def render_main(metrics_name, framebuffer_name, width, height, fps, show_per_core, power_config, cpus, nice,
+                display, opening, native, stop_event, results, fps_value=None, animate_value=None):
+    """Entry point of the render process"""
+    # The parent decides when to stop, Ctrl+C reaches the whole process group
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop_event.set())
+    logging.basicConfig(format='%(asctime)s %(levelname)-8s %(message)s', level=logging.INFO,
+                        datefmt='%Y-%m-%d %H:%M:%S')
+    apply_scheduling('Render process', cpus, nice)
+
+    from PIL import Image
+    from lcd.power import PowerManager
+    from ui.dashboard import DashboardRenderer
+    from ui.framebuffer import FramePool
+    from ui.framestats import FrameStats
+    from ui.native import Rgb565Frames
+    from ui import screens
+
+    disp = load_class(display)()
+    disp.Init()
+    if opening:
+        disp.clear()
+    # Without the opening the panel memory (kept over the reset) shows the boot frame until the first real one
+    power = None
+    if power_config:
+        power = PowerManager(disp, frame_interval=1 / fps, **power_config)
+    else:
+        disp.bl_DutyCycle(100)
+
+    metrics = SharedSnapshot(metrics_name)
+    framebuffer = shared_memory.SharedMemory(name=framebuffer_name)
+    rgb565 = np.ndarray((height, width), dtype='>u2', buffer=framebuffer.buf)
+    frames = (Rgb565Frames if native else FramePool)(width, height, rgb565=rgb565)
+    renderer = DashboardRenderer(show_per_core)
+    background = Image.open('./img/lcdbg.png').convert("RGBA")
+    stats = FrameStats('Render process', 1 / fps)
+    max_fps = fps
+
+    logging.info(f"Render process: Started (pid {os.getpid()})")
+    if opening:
+        screens.show_opening(disp=disp)
+
+    last_sequence = None
+    last_stage = None
+    tick = 0
+    phase = 0
+    while not stop_event.is_set():
+        loop_start = time.perf_counter()
+        fps = min(max_fps, fps_value.value) if fps_value is not None else max_fps
+        animate = animate_value is None or animate_value.value
+        interval = 1 / fps
+        try:
+            sequence, snap = metrics.read()
+            if sequence == 0:
+                time.sleep(interval)
+                continue
+
+            if last_stage == 2 and snap.install_stage == 100:
+                if power is not None:
+                    power.wake(wait=True)
+                screens.show_animation_sequence(disp=disp)
+            last_stage = snap.install_stage
+
+            # The install screen animates at 2 Hz, the dashboard at the full frame rate
+            # (without animation only when the values change)
+            phase += max(1, round(max_fps / fps))
+            changed = sequence != last_sequence
+            if snap.install_stage == 100 and (animate or changed) or \
+                    snap.install_stage != 100 and tick % max(1, round(0.5 * fps)) == 0:
+                stats.tick(loop_start)
+                key = renderer.compose(frames, background, snap, phase, changed)
+                last_sequence = sequence
+                if power is None:
+                    disp.ShowBuffer(frames.convert())
+                else:
+                    power.present(frames, key)
+
+            tick += 1
+            if tick % (60 * max_fps) == 0:
+                stats.log()
+        except Exception as error:
+            logging.error("Render process: An exception occurred: " + type(error).__name__)
+            time.sleep(1)
+
+        time.sleep(max(0, interval - (time.perf_counter() - loop_start)))
+
+    results.put(stats.summary())
+    try:
+        if power is not None:
+            power.wake(wait=True)
+        screens.show_final_screen(disp)
+    except Exception as e:
+        logging.error(f"Render process: Display final screen error: {e}")
+    frames = rgb565 = None
+    metrics.close()
+    framebuffer.close()
+    logging.info("Render process: Stopped")
@@ -0,0 +1,38 @@
+import os
+import time
+from PIL import Image, ImageOps, ImageEnhance
+
+
+def show_final_screen(disp):
+    # Open image -> invert colours -> convert to grayscale -> dim to 15% brightness
+    img = ImageEnhance.Brightness(
+        ImageOps.invert(
+            Image.open('./img/Web3Pi_logo_0.png').convert('RGB')
+        ).convert('L')
+    ).enhance(0.15).convert('RGB')
+
+    disp.ShowImage(img)
+
+
+def show_opening(disp=None):
+    if os.path.exists("/root/opening.flag"):
+        show_animation_sequence(disp=disp)
+    else:
+        open("/root/opening.flag", "w").close()
+
+
+def show_animation_sequence(folder_path="./img/3D/", frame_count=240, fps=30, disp=None):
+    delay = 1.0 / fps
+
+    image_files = sorted([
+        f for f in os.listdir(folder_path)
+        if f.lower().endswith('.png')
+    ])
+
+    for filename in image_files:
+        image_path = os.path.join(folder_path, filename)
+        image = Image.open(image_path)
+        if disp:
+            disp.ShowImage(image)
+        time.sleep(delay)
+    time.sleep(1)